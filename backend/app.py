@@ -1,39 +1,670 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify
 from flask_cors import CORS
-import requests
-from sentence_transformers import SentenceTransformer
-import json
-import msgpack
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+import os
+import atexit
+import hmac
+import logging
+import threading
+import time
+from embedding_cache import EmbeddingCache, normalize_query
+from encoders import ENCODER_BACKEND, PendingEncoder, load_encoder
+from encode_batcher import EncodeBatcher
+from endee_client import EndeeClient, EndeeError, SearchHit, build_filter_conditions, has_range
+from similar_products import NeighborTable, SIMILAR_PRODUCTS_PATH
+from embedding_store import EMBEDDING_IDS_PATH
+from local_search import LocalVectorIndex
+from lexical_index import LexicalIndex, reciprocal_rank_fusion
+from suggest_index import PrefixIndex, QueryLog, catalog_phrases
+from cursor_store import CursorStore, make_cursor, parse_cursor
+from catalog import CATALOG_SNAPSHOT_PATH, ProductCatalog
+from payloads import raw_list, render_json, with_score
+from result_cache import ResultCache, SharedCursorStore, SharedResultCache, result_cache_key, search_context
+from semantic_cache import SemanticCache
+from metrics import REGISTRY, stage
+
+STARTUP_STARTED = time.perf_counter()
+
+# Logging: INFO logs one line per request, DEBUG adds per-step details
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+logging.basicConfig(level=LOG_LEVEL, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+logger = logging.getLogger('api')
 
 app = Flask(__name__)
 CORS(app)
 
 # Configuration
-ENDEE_BASE_URL = "http://localhost:8080/api/v1"
+ENDEE_BASE_URL = os.getenv('ENDEE_BASE_URL', 'http://localhost:8080/api/v1')
 INDEX_NAME = "ecommerce_products"
+PRODUCTS_PATH = '../data/products.json'
+
+# Catalog hot reload: seconds between checks of the data files (0 disables the
+# watcher), and the token POST /api/admin/reload requires (unset disables it)
+CATALOG_WATCH_INTERVAL = float(os.getenv('CATALOG_WATCH_INTERVAL', 5))
+ADMIN_TOKEN = os.getenv('ADMIN_TOKEN', '')
+
+# Endee HTTP client settings (timeouts in seconds)
+ENDEE_CONNECT_TIMEOUT = float(os.getenv('ENDEE_CONNECT_TIMEOUT', 2))
+ENDEE_READ_TIMEOUT = float(os.getenv('ENDEE_READ_TIMEOUT', 10))
+ENDEE_MAX_RETRIES = int(os.getenv('ENDEE_MAX_RETRIES', 2))
+ENDEE_POOL_SIZE = int(os.getenv('ENDEE_POOL_SIZE', 20))
+
+# Search backend: "endee" or "local" (exact NumPy search over the indexer's
+# embedding store). With LOCAL_SEARCH_FALLBACK the local index also answers
+# when Endee is unreachable.
+SEARCH_BACKEND = os.getenv('SEARCH_BACKEND', 'endee').lower()
+LOCAL_SEARCH_FALLBACK = os.getenv('LOCAL_SEARCH_FALLBACK', '1') == '1'
+
+# Search filtering: push price/rating ranges to Endee, and over-fetch up to
+# SEARCH_MAX_CANDIDATES when too few hits pass the filters
+ENDEE_RANGE_FILTERS = os.getenv('ENDEE_RANGE_FILTERS', '1') == '1'
+SEARCH_MAX_CANDIDATES = int(os.getenv('SEARCH_MAX_CANDIDATES', 400))
+
+# Hybrid retrieval: fuse BM25 results over title/brand/description with the
+# vector results (reciprocal rank fusion), and answer queries that name at most
+# LEXICAL_FAST_PATH_MAX_MATCHES products from the lexical index alone
+HYBRID_SEARCH = os.getenv('HYBRID_SEARCH', '1') == '1'
+HYBRID_RRF_K = int(os.getenv('HYBRID_RRF_K', 60))
+LEXICAL_FAST_PATH = os.getenv('LEXICAL_FAST_PATH', '1') == '1'
+LEXICAL_FAST_PATH_MAX_MATCHES = int(os.getenv('LEXICAL_FAST_PATH_MAX_MATCHES', 10))
+
+# Typeahead (/api/suggest): max suggestions, and how many distinct clients
+# must have searched a query (and got results) before it is suggested
+# (SUGGEST_QUERY_LOG_SIZE=0 disables query suggestions)
+SUGGEST_LIMIT = int(os.getenv('SUGGEST_LIMIT', 10))
+SUGGEST_QUERY_LOG_SIZE = int(os.getenv('SUGGEST_QUERY_LOG_SIZE', 5000))
+SUGGEST_QUERY_MIN_COUNT = int(os.getenv('SUGGEST_QUERY_MIN_COUNT', 5))
+# Header naming the client behind a load balancer or proxy (e.g. X-Forwarded-For
+# or a session header); without it clients are told apart by remote address
+SUGGEST_CLIENT_HEADER = os.getenv('SUGGEST_CLIENT_HEADER', '')
+
+# Paginated search ("page_size" in /api/search): candidates retrieved on the
+# first page, and how long / how many sessions are kept for later pages
+SEARCH_PAGE_CANDIDATES = int(os.getenv('SEARCH_PAGE_CANDIDATES', 200))
+SEARCH_CURSOR_TTL = float(os.getenv('SEARCH_CURSOR_TTL', 600)) or None
+SEARCH_CURSOR_SESSIONS = int(os.getenv('SEARCH_CURSOR_SESSIONS', 2000))
+
+# Facets ("facets": true in /api/search) are counted over this many top
+# candidates for the query, before filters are applied
+SEARCH_FACET_CANDIDATES = int(os.getenv('SEARCH_FACET_CANDIDATES', 200))
 
-# Load embedding model once at startup
-print("Loading embedding model...")
-embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
-print("Model loaded!")
+# Batch search: max queries per request and concurrent Endee searches
+SEARCH_BATCH_MAX_QUERIES = int(os.getenv('SEARCH_BATCH_MAX_QUERIES', 100))
+SEARCH_BATCH_WORKERS = int(os.getenv('SEARCH_BATCH_WORKERS', 8))
+
+# Query embedding cache (set EMBEDDING_CACHE_SIZE=0 to disable)
+EMBEDDING_CACHE_SIZE = int(os.getenv('EMBEDDING_CACHE_SIZE', 5000))
+EMBEDDING_CACHE_TTL = float(os.getenv('EMBEDDING_CACHE_TTL', 24 * 3600)) or None
+EMBEDDING_CACHE_PATH = os.getenv('EMBEDDING_CACHE_PATH', '')  # empty = don't persist
+# Seconds between saves to EMBEDDING_CACHE_PATH (0 = only on a clean shutdown),
+# so a killed worker loses at most this much of the cache
+EMBEDDING_CACHE_SAVE_INTERVAL = float(os.getenv('EMBEDDING_CACHE_SAVE_INTERVAL', 300))
+
+# Whole /api/search responses (set RESULT_CACHE_SIZE=0 to disable). With
+# RESULT_CACHE_ADDRESS, workers share the cache served by result_cache.py
+RESULT_CACHE_SIZE = int(os.getenv('RESULT_CACHE_SIZE', 1000))
+RESULT_CACHE_MAX_MB = float(os.getenv('RESULT_CACHE_MAX_MB', 64))
+RESULT_CACHE_TTL = float(os.getenv('RESULT_CACHE_TTL', 300)) or None
+RESULT_CACHE_ADDRESS = os.getenv('RESULT_CACHE_ADDRESS', '')
+
+# Near-duplicate queries: serve the response of a recent query whose embedding
+# is at least this cosine-similar (set SEMANTIC_CACHE_SIZE=0 to disable)
+SEMANTIC_CACHE_SIZE = int(os.getenv('SEMANTIC_CACHE_SIZE', 512))
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv('SEMANTIC_CACHE_THRESHOLD', 0.95))
+
+# Micro-batching of concurrent query encodes (set ENCODE_BATCHING=0 to disable)
+ENCODE_BATCHING = os.getenv('ENCODE_BATCHING', '1') == '1'
+ENCODE_BATCH_MAX_SIZE = int(os.getenv('ENCODE_BATCH_MAX_SIZE', 32))
+ENCODE_BATCH_MAX_WAIT_MS = float(os.getenv('ENCODE_BATCH_MAX_WAIT_MS', 2))
+
+# Startup phase timings, and whether /api/health reports ready yet
+startup_state = {"ready": False, "phases": {}, "endee": None, "error": None}
+
+def record_phase(name, started):
+    startup_state["phases"][name] = round(time.perf_counter() - started, 3)
+
+# The model is loaded by warm_up() in the background (see below); encodes
+# issued before it is ready wait for it
+embedding_model = PendingEncoder()
+
+# Concurrent requests share batched encode calls instead of competing for cores
+encode_batcher = None
+if ENCODE_BATCHING:
+    encode_batcher = EncodeBatcher(
+        lambda texts: embedding_model.encode(texts, batch_size=ENCODE_BATCH_MAX_SIZE),
+        max_batch_size=ENCODE_BATCH_MAX_SIZE,
+        max_wait_ms=ENCODE_BATCH_MAX_WAIT_MS
+    )
+
+embedding_cache = EmbeddingCache(max_size=EMBEDDING_CACHE_SIZE, ttl=EMBEDDING_CACHE_TTL)
+if EMBEDDING_CACHE_PATH:
+    try:
+        logger.info("Loaded %d cached query embeddings", embedding_cache.load(EMBEDDING_CACHE_PATH))
+    except Exception as e:
+        logger.warning("Could not load embedding cache: %s", e)
+    
+    def save_embedding_cache():
+        try:
+            saved = embedding_cache.save(EMBEDDING_CACHE_PATH)
+            logger.info("Saved %d cached query embeddings to %s", saved, EMBEDDING_CACHE_PATH)
+        except Exception as e:
+            logger.warning("Could not save embedding cache: %s", e)
+    
+    def save_embedding_cache_periodically():
+        saved_misses = embedding_cache.misses
+        while True:
+            time.sleep(EMBEDDING_CACHE_SAVE_INTERVAL)
+            # Every miss adds an entry; skip the write if there were none
+            if embedding_cache.misses != saved_misses:
+                saved_misses = embedding_cache.misses
+                save_embedding_cache()
+    
+    # atexit only runs on a clean exit, not when the worker is killed
+    atexit.register(save_embedding_cache)
+    if EMBEDDING_CACHE_SAVE_INTERVAL > 0:
+        threading.Thread(target=save_embedding_cache_periodically, name='embedding-cache-saver', daemon=True).start()
+
+result_cache = ResultCache(max_size=RESULT_CACHE_SIZE, max_bytes=int(RESULT_CACHE_MAX_MB * 1024 * 1024),
+                           ttl=RESULT_CACHE_TTL)
+if RESULT_CACHE_ADDRESS and RESULT_CACHE_SIZE > 0:
+    try:
+        result_cache = SharedResultCache(RESULT_CACHE_ADDRESS, local=result_cache)
+    except ValueError as e:
+        logger.error("Not using the shared result cache: %s", e)
+semantic_cache = SemanticCache(max_size=SEMANTIC_CACHE_SIZE, threshold=SEMANTIC_CACHE_THRESHOLD,
+                               ttl=RESULT_CACHE_TTL)
+
+def encode_query(query):
+    """Return the embedding for a search query, using the query embedding cache"""
+    key = normalize_query(query)
+    embedding = embedding_cache.get(key)
+    if embedding is None:
+        with stage('encode'):
+            if encode_batcher is not None:
+                embedding = encode_batcher.encode(key)
+            else:
+                embedding = embedding_model.encode(key)
+        embedding_cache.put(key, embedding)
+    return embedding
+
+def encode_queries(queries):
+    """Embed many queries, encoding all cache misses in a single batched model call"""
+    keys = [normalize_query(q) for q in queries]
+    embeddings = {}
+    for key in keys:
+        if key not in embeddings:
+            embeddings[key] = embedding_cache.get(key)
+    
+    misses = [key for key, embedding in embeddings.items() if embedding is None]
+    if misses:
+        with stage('encode'):
+            vectors = embedding_model.encode(misses, batch_size=32)
+        for key, embedding in zip(misses, vectors):
+            embeddings[key] = embedding
+            embedding_cache.put(key, embedding)
+    
+    return [embeddings[key] for key in keys]
+
+# Shared keep-alive connection pool to Endee
+endee_client = EndeeClient(
+    ENDEE_BASE_URL, INDEX_NAME,
+    connect_timeout=ENDEE_CONNECT_TIMEOUT,
+    read_timeout=ENDEE_READ_TIMEOUT,
+    max_retries=ENDEE_MAX_RETRIES,
+    pool_size=ENDEE_POOL_SIZE
+)
+
+cursor_store = CursorStore(max_size=SEARCH_CURSOR_SESSIONS, ttl=SEARCH_CURSOR_TTL)
+if RESULT_CACHE_ADDRESS:
+    # Cursors must reach the worker holding their session; sharing them through
+    # the result cache server means the load balancer needn't route stickily
+    try:
+        cursor_store = SharedCursorStore(RESULT_CACHE_ADDRESS, local=cursor_store)
+    except ValueError as e:
+        logger.error("Not sharing search cursors between workers: %s", e)
+
+# Fans out the Endee searches of /api/search/batch
+search_executor = ThreadPoolExecutor(max_workers=SEARCH_BATCH_WORKERS, thread_name_prefix='endee-search')
+
+def load_catalog():
+    """Load the catalog from the indexer's snapshot if it is current, else from products.json"""
+    try:
+        catalog = ProductCatalog.load_snapshot(CATALOG_SNAPSHOT_PATH, source_path=PRODUCTS_PATH)
+        if catalog is not None:
+            return catalog, "snapshot"
+    except Exception as e:
+        logger.warning("Could not read %s: %s", CATALOG_SNAPSHOT_PATH, e)
+    return ProductCatalog.from_json(PRODUCTS_PATH), "products.json"
 
 # Load product data for enrichment (Endee doesn't store metadata)
-print("Loading product data...")
-PRODUCTS_DB = {}
+logger.info("Loading product data...")
+started = time.perf_counter()
 try:
-    with open('../data/products.json', 'r', encoding='utf-8') as f:
-        products_list = json.load(f)
-        for product in products_list:
-            PRODUCTS_DB[product['id']] = product
-    print(f"✅ Loaded {len(PRODUCTS_DB)} products into memory")
+    CATALOG, catalog_source = load_catalog()
+    logger.info("Loaded %d products into memory from %s", len(CATALOG), catalog_source)
 except Exception as e:
-    print(f"⚠️  Warning: Could not load products.json: {e}")
-    PRODUCTS_DB = {}
+    logger.warning("Could not load products.json: %s", e)
+    CATALOG = ProductCatalog([])
+record_phase("catalog", started)
+
+def enrich(hits, exclude_id=None, limit=None):
+    """
+    Turn search hits into pre-serialized API results.
+    
+    This is the single enrichment path for search, batch search, similar
+    products and product details; hits without product data are skipped.
+    """
+    results = []
+    with stage('enrich'):
+        for hit in hits:
+            payload = CATALOG.payload(hit.id)
+            if payload is None or hit.id == exclude_id:
+                continue
+            results.append(with_score(hit.score, payload, getattr(hit, 'lexical_score', None)))
+            if limit is not None and len(results) == limit:
+                break
+    return results
+
+def json_response(fields, status=200):
+    """Flask response for a dict that may contain pre-serialized RawJSON values"""
+    with stage('serialize'):
+        body = render_json(fields)
+    return Response(body, status=status, mimetype='application/json')
+
+def parse_int(value, name):
+    """(value as an int, None), or (None, error message) if a request field isn't an integer"""
+    if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+        return None, f"{name} must be an integer"
+    try:
+        return int(value), None
+    except (TypeError, ValueError):
+        return None, f"{name} must be an integer"
+
+def k_error(k):
+    """Error message for a k Endee shouldn't be asked for, or None"""
+    if not 1 <= k <= SEARCH_MAX_CANDIDATES:
+        return f"k must be between 1 and {SEARCH_MAX_CANDIDATES}"
+    return None
+
+def collect_matches(hits, k, filters):
+    """Keep the first k hits whose products pass the filters"""
+    with stage('filter'):
+        passes = CATALOG.filter_rows(CATALOG.rows(hit.id for hit in hits), filters)
+        return [hit for hit, ok in zip(hits, passes) if ok][:k]
+
+def search_endee(query_embedding, k, filters):
+    """
+    Return up to k hits that pass the filters, searching Endee.
+    
+    Filters are sent to Endee so it can return k matches directly. The same
+    filters are re-checked here, and if too few hits survive (e.g. Endee
+    ignored a range), k is grown geometrically up to SEARCH_MAX_CANDIDATES.
+    """
+    global ENDEE_RANGE_FILTERS
+    
+    fetch_k = k
+    while True:
+        conditions = build_filter_conditions(filters, include_ranges=ENDEE_RANGE_FILTERS)
+        try:
+            with stage('endee'):
+                hits = endee_client.search(query_embedding, fetch_k, filter=conditions)
+        except EndeeError as e:
+            # Older Endee builds reject $range; fall back to over-fetching. Other
+            # 400s say nothing about range support, so they don't disable it
+            if ENDEE_RANGE_FILTERS and e.status_code == 400 and has_range(conditions):
+                logger.warning("Endee rejected range filters, filtering locally instead: %s", e)
+                ENDEE_RANGE_FILTERS = False
+                continue
+            raise
+        
+        matches = collect_matches(hits, k, filters)
+        
+        # Stop once we have k matches, Endee has nothing more, or we hit the cap
+        if len(matches) >= k or len(hits) < fetch_k or fetch_k >= SEARCH_MAX_CANDIDATES:
+            logger.debug("Fetched %d candidates from Endee (k=%d), %d matched", len(hits), fetch_k, len(matches))
+            return matches
+        fetch_k = min(fetch_k * 2, SEARCH_MAX_CANDIDATES)
+
+def search_local(query_embedding, k, filters):
+    """Return up to k hits that pass the filters, searching the local index"""
+    with stage('local_search'):
+        hits = local_index.search(query_embedding, k, filters)
+    logger.debug("Searched %d local vectors, %d matched", len(local_index), len(hits))
+    return hits
+
+def search_products(query_embedding, k, filters):
+    """Return up to k hits that pass the filters, using the configured backend"""
+    if SEARCH_BACKEND == 'local' and local_index is not None:
+        return search_local(query_embedding, k, filters)
+    try:
+        return search_endee(query_embedding, k, filters)
+    except EndeeError as e:
+        # Keep search up while Endee is restarting
+        if local_index is None or not LOCAL_SEARCH_FALLBACK:
+            raise
+        logger.warning("Endee unavailable (%s), answering from the local index", e)
+        return search_local(query_embedding, k, filters)
+
+def lexical_fast_path(query, k, filters):
+    """
+    Results for a query that names at most LEXICAL_FAST_PATH_MAX_MATCHES
+    products (all query tokens in their title or brand), or None to run the
+    full search. The named products come first, ranked by BM25, and the
+    remaining slots go to the query's other BM25 matches.
+    """
+    if lexical_index is None or not LEXICAL_FAST_PATH:
+        return None
+    with stage('lexical'):
+        matches = lexical_index.name_matches(query)
+        if not 0 < len(matches) <= LEXICAL_FAST_PATH_MAX_MATCHES:
+            return None
+        named = lexical_index.search(query, k, filters, rows=matches)
+        if not named:
+            return None
+        named_ids = {hit.id for hit in named}
+        others = [hit for hit in lexical_index.search(query, k, filters) if hit.id not in named_ids]
+        return (named + others)[:k]
+
+def fuse_lexical(query, hits, k, filters):
+    """Merge vector hits with the BM25 hits for the query"""
+    if lexical_index is None or not HYBRID_SEARCH:
+        return hits
+    with stage('lexical'):
+        return reciprocal_rank_fusion(hits, lexical_index.search(query, k, filters), k, HYBRID_RRF_K)
+
+def search_client(headers, remote_addr):
+    """Who to count as the searcher of a query in the suggestion log"""
+    if SUGGEST_CLIENT_HEADER:
+        # X-Forwarded-For style lists put the original client first
+        client = headers.get(SUGGEST_CLIENT_HEADER, '').split(',')[0].strip()
+        if client:
+            return client
+    return remote_addr
+
+def suggest(prefix, limit):
+    """Popular past queries first, then catalog titles, brands and categories"""
+    suggestions = []
+    seen = set()
+    popular = query_log.index()
+    for index in (popular, suggest_index):
+        if index is None:
+            continue
+        for text, kind, _ in index.suggest(prefix, limit):
+            key = normalize_query(text)
+            if key not in seen and len(suggestions) < limit:
+                seen.add(key)
+                suggestions.append({"text": text, "type": kind})
+    return suggestions
+
+def page_fields(session_id, session, offset):
+    """Response fields of one page of a paginated search"""
+    hits, next_offset = cursor_store.page(session, offset)
+    results = enrich(hits)
+    return {
+        "query": session.query,
+        "results": raw_list(results),
+        "count": len(results),
+        "total": len(session.ids),
+        "next_cursor": None if next_offset is None else make_cursor(session_id, next_offset)
+    }
+
+def first_page(query, page_size, hits):
+    """Keep all candidates under a new cursor and return the first page"""
+    session_id, session = cursor_store.create(query, page_size, hits)
+    return page_fields(session_id, session, 0)
+
+def next_page(cursor):
+    """The page a cursor points at, or None if the cursor is invalid or has expired"""
+    parsed = parse_cursor(cursor)
+    session = cursor_store.get(parsed[0]) if parsed else None
+    if session is None:
+        return None
+    return page_fields(parsed[0], session, parsed[1])
+
+def search_facets(query_embedding):
+    """Facet counts over the query's top SEARCH_FACET_CANDIDATES unfiltered candidates"""
+    hits = search_products(query_embedding, SEARCH_FACET_CANDIDATES, {})
+    with stage('facets'):
+        return CATALOG.facets(CATALOG.rows(hit.id for hit in hits))
+
+def load_local_index(catalog):
+    """In-process search over the embeddings written by create_embeddings.py"""
+    if SEARCH_BACKEND != 'local' and not LOCAL_SEARCH_FALLBACK:
+        return None
+    index = None
+    try:
+        index = LocalVectorIndex.load(catalog)
+        if index is not None:
+            logger.info("Loaded local vector index with %d vectors", len(index))
+    except Exception as e:
+        logger.warning("Could not load local vector index: %s", e)
+    if index is None and SEARCH_BACKEND == 'local':
+        logger.warning("SEARCH_BACKEND=local but no embedding store found, using Endee")
+    return index
+
+def load_lexical_index(catalog):
+    """BM25 index over the catalog's titles, brands and descriptions"""
+    if not HYBRID_SEARCH and not LEXICAL_FAST_PATH:
+        return None
+    started = time.perf_counter()
+    index = LexicalIndex(catalog)
+    logger.info("Built lexical index with %d terms in %.2fs", len(index), time.perf_counter() - started)
+    return index
+
+def load_suggest_index(catalog):
+    """Typeahead over product titles, brands and categories"""
+    return PrefixIndex(catalog_phrases(catalog), limit=SUGGEST_LIMIT)
+
+def load_similar_products():
+    """Similar products precomputed by create_embeddings.py (falls back to Endee if missing)"""
+    try:
+        table = NeighborTable.load(SIMILAR_PRODUCTS_PATH)
+        if table is not None:
+            logger.info("Loaded %d similar products for %d products", table.top_n, len(table))
+        return table
+    except Exception as e:
+        logger.warning("Could not load %s: %s", SIMILAR_PRODUCTS_PATH, e)
+        return None
+
+started = time.perf_counter()
+local_index = load_local_index(CATALOG)
+record_phase("local_index", started)
+started = time.perf_counter()
+lexical_index = load_lexical_index(CATALOG)
+record_phase("lexical_index", started)
+started = time.perf_counter()
+suggest_index = load_suggest_index(CATALOG)
+query_log = QueryLog(max_queries=SUGGEST_QUERY_LOG_SIZE, min_count=SUGGEST_QUERY_MIN_COUNT)
+record_phase("suggest_index", started)
+started = time.perf_counter()
+similar_products_table = load_similar_products()
+record_phase("similar_products", started)
+
+# Files whose changes trigger a reload: the catalog and the indexer's outputs
+WATCHED_PATHS = [PRODUCTS_PATH, EMBEDDING_IDS_PATH, SIMILAR_PRODUCTS_PATH]
+
+def data_mtimes():
+    return tuple(os.path.getmtime(path) if os.path.exists(path) else None for path in WATCHED_PATHS)
+
+def data_version(mtimes):
+    """Tag for cached search results; the same in every worker that loaded the same files"""
+    return repr(mtimes)
+
+reload_lock = threading.Lock()
+catalog_state = {
+    "version": 1,
+    "loaded_at": datetime.now(timezone.utc).isoformat(),
+    "mtimes": data_mtimes(),
+    "reloads": 0,
+    "last_error": None
+}
+
+def reload_catalog():
+    """
+    Rebuild the catalog, the local, lexical and typeahead indexes and the
+    similar products table from disk, then swap them in.
+    
+    Everything is built off to the side while requests keep using the old
+    objects; the swap is a plain rebinding of module globals. On error the
+    old data stays in place.
+    """
+    global CATALOG, local_index, lexical_index, suggest_index, similar_products_table
+    with reload_lock:
+        started = time.perf_counter()
+        mtimes = data_mtimes()
+        try:
+            catalog, _ = load_catalog()
+            index = load_local_index(catalog)
+            lexical = load_lexical_index(catalog)
+            suggestions = load_suggest_index(catalog)
+            table = load_similar_products()
+        except Exception as e:
+            catalog_state["last_error"] = str(e)
+            raise
+        
+        CATALOG, local_index, lexical_index, suggest_index, similar_products_table = (
+            catalog, index, lexical, suggestions, table)
+        catalog_state.update(
+            version=catalog_state["version"] + 1,
+            loaded_at=datetime.now(timezone.utc).isoformat(),
+            mtimes=mtimes,
+            reloads=catalog_state["reloads"] + 1,
+            last_error=None
+        )
+        logger.info("Reloaded %d products in %.2fs", len(catalog), time.perf_counter() - started)
+        return catalog
+
+def check_data_files(previous, failed):
+    """
+    One check of the watcher: reload if the data files changed and have
+    settled. Takes and returns (mtimes seen last time, mtimes that failed to load).
+    """
+    mtimes = data_mtimes()
+    # Only reload once the files have stopped changing for a full interval,
+    # so a running indexer isn't caught halfway through writing them
+    settled = mtimes == previous
+    if not settled or mtimes == catalog_state["mtimes"] or mtimes == failed:
+        return mtimes, failed
+    try:
+        reload_catalog()
+    except Exception as e:
+        # catalog_state["mtimes"] keeps describing the data being served, so
+        # the caches tagged with its version stay valid; retry once the files change again
+        logger.warning("Catalog reload failed, keeping the current data: %s", e)
+        failed = mtimes
+    return mtimes, failed
+
+def watch_data_files():
+    """Reload the catalog whenever products.json or the indexer's outputs change"""
+    previous, failed = catalog_state["mtimes"], None
+    while True:
+        time.sleep(CATALOG_WATCH_INTERVAL)
+        previous, failed = check_data_files(previous, failed)
+
+if CATALOG_WATCH_INTERVAL > 0:
+    threading.Thread(target=watch_data_files, name='catalog-watcher', daemon=True).start()
+
+# Queries of different lengths, so the first real requests don't pay for lazy initialization
+WARMUP_QUERIES = ["shoes", "wireless noise cancelling headphones", "cozy winter sweater for cold evenings"]
+
+def warm_up():
+    """Load the model, run warm-up encodes and ping Endee, then report ready"""
+    started = time.perf_counter()
+    logger.info("Loading embedding model (%s)...", ENCODER_BACKEND)
+    try:
+        embedding_model.set(load_encoder())
+    except Exception as e:
+        logger.error("Could not load the embedding model: %s", e)
+        startup_state["error"] = str(e)
+        embedding_model.fail(e)
+        return
+    record_phase("model", started)
+    
+    started = time.perf_counter()
+    vector = embedding_model.encode(WARMUP_QUERIES, batch_size=ENCODE_BATCH_MAX_SIZE)[0]
+    embedding_model.encode(WARMUP_QUERIES[0])
+    record_phase("warmup_encode", started)
+    
+    # A real search opens the pooled connection and warms Endee's search path
+    started = time.perf_counter()
+    while True:
+        try:
+            endee_client.search(vector.tolist(), 1)
+            startup_state["endee"] = "ok"
+            break
+        except EndeeError as e:
+            if local_index is not None and LOCAL_SEARCH_FALLBACK:
+                logger.warning("Endee not reachable (%s), serving from the local index", e)
+                startup_state["endee"] = "unreachable"
+                break
+            # Nothing could answer searches yet, so keep reporting "starting"
+            time.sleep(2)
+    record_phase("endee_ping", started)
+    
+    startup_state["ready"] = True
+    phases = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in startup_state["phases"].items())
+    logger.info("Ready in %.2fs (%s)", time.perf_counter() - STARTUP_STARTED, phases)
+
+threading.Thread(target=warm_up, name='warm-up', daemon=True).start()
+
+# Request metrics, exposed with the stage and Endee timings at /api/metrics
+REQUEST_SECONDS = REGISTRY.histogram(
+    'api_request_seconds', "End-to-end request latency by route", ['route', 'method'])
+REQUESTS = REGISTRY.counter(
+    'api_requests_total', "Requests by route and status", ['route', 'method', 'status'])
+SIMILAR_REQUESTS = REGISTRY.counter(
+    'api_similar_requests_total', "Similar-product lookups by source", ['source'])
+REGISTRY.callback('embedding_cache_hits_total', "Query embedding cache hits",
+                  lambda: embedding_cache.stats()['hits'], type='counter')
+REGISTRY.callback('embedding_cache_misses_total', "Query embedding cache misses",
+                  lambda: embedding_cache.stats()['misses'], type='counter')
+REGISTRY.callback('embedding_cache_hit_ratio', "Query embedding cache hit rate",
+                  lambda: embedding_cache.stats()['hit_rate'])
+REGISTRY.callback('embedding_cache_size', "Cached query embeddings",
+                  lambda: embedding_cache.stats()['size'])
+REGISTRY.callback('result_cache_hits_total', "Search result cache hits",
+                  lambda: result_cache.stats()['hits'], type='counter')
+REGISTRY.callback('result_cache_misses_total', "Search result cache misses",
+                  lambda: result_cache.stats()['misses'], type='counter')
+REGISTRY.callback('result_cache_size', "Cached search responses",
+                  lambda: result_cache.stats()['size'])
+REGISTRY.callback('semantic_cache_hits_total', "Queries answered with a near-duplicate query's results",
+                  lambda: semantic_cache.stats()['hits'], type='counter')
+REGISTRY.callback('semantic_cache_misses_total', "Queries with no near-duplicate in the semantic cache",
+                  lambda: semantic_cache.stats()['misses'], type='counter')
+REGISTRY.callback('encode_batches_total', "Batched model calls made by the encode batcher",
+                  lambda: encode_batcher.stats()['batches'] if encode_batcher else None, type='counter')
+REGISTRY.callback('encode_batch_items_total', "Queries encoded by the encode batcher",
+                  lambda: encode_batcher.stats()['items'] if encode_batcher else None, type='counter')
+REGISTRY.callback('catalog_products', "Products in the loaded catalog", lambda: len(CATALOG))
+REGISTRY.callback('catalog_version', "Incremented on every catalog reload", lambda: catalog_state["version"])
+REGISTRY.callback('api_ready', "1 once startup has finished", lambda: int(startup_state["ready"]))
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request(response):
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    started = g.get('request_started')
+    if started is not None:
+        REQUEST_SECONDS.observe(time.perf_counter() - started, route=route, method=request.method)
+    REQUESTS.inc(route=route, method=request.method, status=response.status_code)
+    return response
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
-    """Health check endpoint"""
-    return jsonify({"status": "healthy", "service": "E-commerce Discovery API"})
+    """Health check endpoint (503 until the model is warm and Endee has answered)"""
+    startup = {
+        "phases": startup_state["phases"],
+        "endee": startup_state["endee"],
+        "error": startup_state["error"]
+    }
+    if not startup_state["ready"]:
+        return jsonify({"status": "starting", "service": "E-commerce Discovery API", "startup": startup}), 503
+    return jsonify({"status": "healthy", "service": "E-commerce Discovery API", "startup": startup})
 
 @app.route('/api/search', methods=['POST'])
 def semantic_search():
@@ -47,158 +678,171 @@ def semantic_search():
             "max_price": 1000,
             "category": "Fashion",
             "min_rating": 0
-        }
+        },
+        "facets": true
     }
+    With "facets", the response also has category/brand counts and
+    price/rating histograms for the query, ignoring the filters.
+    
+    Paginated: {"query": ..., "page_size": 20, "filters": {...}} returns the
+    first page and a "next_cursor"; {"cursor": "..."} returns the next page
+    from the stored candidates without searching again.
     """
     try:
-        data = request.json
-        query = data.get('query', '')
-        k = data.get('k', 10)
-        filters = data.get('filters', {})
+        with stage('parse'):
+            data = request.json
+            query = data.get('query', '')
+            k, k_message = parse_int(data.get('k', 10), 'k')
+            filters = data.get('filters') or {}
+            want_facets = bool(data.get('facets'))
+            cursor = data.get('cursor')
+            page_size = data.get('page_size')
+            searcher = search_client(request.headers, request.remote_addr)
         
-        print(f"\n🔍 Search Request:")
-        print(f"  Query: {query}")
-        print(f"  K: {k}")
-        print(f"  Filters: {filters}")
+        if cursor:
+            fields = next_page(cursor)
+            if fields is None:
+                return jsonify({"error": "Cursor is invalid or has expired, start a new search"}), 410
+            return json_response(fields)
         
         if not query:
             return jsonify({"error": "Query is required"}), 400
+        error = k_message or k_error(k)
+        if error:
+            return jsonify({"error": error}), 400
         
-        # Generate embedding for query
-        print("  Generating embedding...")
-        query_embedding = embedding_model.encode(query).tolist()
-        print(f"  Embedding generated: {len(query_embedding)} dimensions")
+        # Infinite scroll: retrieve the candidates once, then page through them
+        if page_size is not None:
+            page_size, error = parse_int(page_size, 'page_size')
+            if error:
+                return jsonify({"error": error}), 400
+            page_size = max(1, min(page_size, SEARCH_PAGE_CANDIDATES))
+            query_embedding = encode_query(query)
+            try:
+                hits = search_products(query_embedding, SEARCH_PAGE_CANDIDATES, filters)
+            except EndeeError as e:
+                logger.error("search failed query=%r error=%s", query, e)
+                return jsonify({"error": str(e)}), 500
+            hits = fuse_lexical(query, hits, SEARCH_PAGE_CANDIDATES, filters)
+            logger.info("search query=%r page_size=%d filters=%s candidates=%d", query, page_size, filters, len(hits))
+            query_log.record(query, searcher, len(hits))
+            return json_response(first_page(query, page_size, hits))
         
-        # Build filter conditions for Endee
-        # NOTE: Simplified to avoid filter issues - search without filters first
-        filter_conditions = []
+        # Head queries are answered straight from the result cache
+        cache_key = result_cache_key(query, k, filters, want_facets)
+        version = data_version(catalog_state["mtimes"])
+        cached = result_cache.get(cache_key, version)
+        if cached is not None:
+            logger.info("search query=%r k=%d filters=%s cached=1 results=%d", query, k, filters, cached["count"])
+            query_log.record(query, searcher, cached["count"])
+            return json_response({"query": query, **cached})
         
-        # Only add category filter if specified and not "All"
-        if filters.get('category') and filters['category'] != 'All':
-            filter_conditions.append({
-                "category": {
-                    "$eq": filters['category']
-                }
-            })
+        # Navigational queries ("iPhone 9") skip the model and Endee
+        hits = None if want_facets else lexical_fast_path(query, k, filters)
+        if hits is not None:
+            results = enrich(hits)
+            fields = {"results": raw_list(results), "count": len(results)}
+            result_cache.put(cache_key, version, fields)
+            logger.info("search query=%r k=%d filters=%s backend=lexical results=%d", query, k, filters, len(results))
+            query_log.record(query, searcher, len(results))
+            return json_response({"query": query, **fields})
         
-        # Search in Endee
-        search_payload = {
-            "vector": query_embedding,
-            "k": k,
-            "include_vectors": False
-        }
+        # Generate embedding for query
+        query_embedding = encode_query(query)
         
-        if filter_conditions:
-            search_payload["filter"] = filter_conditions
+        # Paraphrases of a recent query reuse its results
+        context = search_context(k, filters, want_facets)
+        near = semantic_cache.get(query_embedding, context, version)
+        if near is not None:
+            cached, similarity = near
+            result_cache.put(cache_key, version, cached)
+            logger.info("search query=%r k=%d filters=%s semantic_cache=%.3f results=%d",
+                        query, k, filters, similarity, cached["count"])
+            query_log.record(query, searcher, cached["count"])
+            return json_response({"query": query, **cached})
         
-        print(f"  Sending to Endee: {ENDEE_BASE_URL}/index/{INDEX_NAME}/search")
-        print(f"  Payload keys: {search_payload.keys()}")
+        # Search (in Endee, filters are pushed down with adaptive over-fetch)
+        try:
+            # Facets need their own unfiltered search, so run it alongside
+            facets_future = search_executor.submit(search_facets, query_embedding) if want_facets else None
+            hits = fuse_lexical(query, search_products(query_embedding, k, filters), k, filters)
+            facets = facets_future.result() if facets_future else None
+        except EndeeError as e:
+            logger.error("search failed query=%r error=%s", query, e)
+            return jsonify({"error": str(e)}), 500
         
-        # Add headers to ensure JSON response
-        headers = {
-            'Content-Type': 'application/json',
-            'Accept': 'application/json'
+        # Enrich matching hits with product data
+        filtered_results = enrich(hits)
+        
+        logger.info("search query=%r k=%d filters=%s backend=%s results=%d",
+                    query, k, filters, SEARCH_BACKEND, len(filtered_results))
+        
+        fields = {
+            "results": raw_list(filtered_results),
+            "count": len(filtered_results)
         }
+        if facets is not None:
+            fields["facets"] = facets
+        result_cache.put(cache_key, version, fields)
+        semantic_cache.put(query_embedding, context, version, fields)
+        query_log.record(query, searcher, len(filtered_results))
+        return json_response({"query": query, **fields})
+    
+    except Exception as e:
+        logger.exception("search failed")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/search/batch', methods=['POST'])
+def batch_search():
+    """
+    Run many searches in one request
+    Body: {
+        "queries": [
+            {"query": "wireless headphones", "k": 10, "filters": {...}},
+            {"query": "running shoes", "k": 5}
+        ]
+    }
+    Results are returned in the same order as the queries.
+    """
+    try:
+        data = request.json or {}
+        items = data.get('queries') or []
         
-        response = requests.post(
-            f"{ENDEE_BASE_URL}/index/{INDEX_NAME}/search",
-            json=search_payload,
-            headers=headers
-        )
+        if not items:
+            return jsonify({"error": "queries is required"}), 400
+        if len(items) > SEARCH_BATCH_MAX_QUERIES:
+            return jsonify({"error": f"At most {SEARCH_BATCH_MAX_QUERIES} queries per batch"}), 400
+        if any(not isinstance(item, dict) or not item.get('query') for item in items):
+            return jsonify({"error": "Every item needs a query"}), 400
+        ks = [parse_int(item.get('k', 10), 'k') for item in items]
+        errors = [error or k_error(k) for k, error in ks]
+        if any(errors):
+            return jsonify({"error": next(error for error in errors if error)}), 400
         
-        print(f"  Endee Response Status: {response.status_code}")
-        print(f"  Response Text: {response.text[:200] if response.text else 'EMPTY'}")
+        logger.info("batch search queries=%d", len(items))
         
-        if response.status_code == 200:
-            # Check if response has content
-            if not response.text or response.text.strip() == '':
-                print("  ⚠️ Endee returned empty response")
-                return jsonify({
-                    "query": query,
-                    "results": [],
-                    "count": 0,
-                    "warning": "Endee returned empty response - index may be empty or query failed"
-                })
-            
+        # One batched model call for every query that isn't cached yet
+        query_embeddings = encode_queries([item['query'] for item in items])
+        
+        def run(item, query_embedding, k):
+            # A failing query gets an error entry; the rest of the batch still answers
             try:
-                # Decode MessagePack binary response
-                results = msgpack.unpackb(response.content, raw=False)
-                print(f"  Decoded MessagePack data type: {type(results)}")
-            except Exception as decode_error:
-                print(f"  ❌ MessagePack Decode Error: {decode_error}")
-                print(f"  Raw response (first 200 bytes): {response.content[:200]}")
-                return jsonify({
-                    "error": f"Failed to decode Endee response: {str(decode_error)}",
-                    "raw_response": str(response.content[:500])
-                }), 500
-            
-            print(f"  ✅ Found {len(results)} results")
-            print(f"  First result structure: {results[0] if results else 'N/A'}")
-            
-            # Parse Endee's list-based response format and enrich with product data
-            # Each result is a list: [score, id, metadata, filter, ?, vectors]
-            parsed_results = []
-            for result in results:
-                if isinstance(result, list) and len(result) >= 2:
-                    score = result[0]
-                    product_id = result[1]
-                    
-                    # Get product data from our database
-                    product = PRODUCTS_DB.get(product_id, {})
-                    
-                    if product:
-                        parsed_results.append({
-                            'score': score,
-                            'id': product_id,
-                            'meta': {
-                                'title': product.get('title', 'Untitled Product'),
-                                'description': product.get('description', 'No description available'),
-                                'image': product.get('image', ''),
-                                'brand': product.get('brand', ''),
-                                'category': product.get('category', 'Product')
-                            },
-                            'filter': {
-                                'price': float(product.get('price', 0)),
-                                'rating': float(product.get('rating', 0)),
-                                'stock': int(product.get('stock', 0)),
-                                'category': product.get('category', 'Product')
-                            }
-                        })
-            
-            print(f"  Enriched {len(parsed_results)} results with product data")
-            
-            # Apply client-side filtering for price and rating
-            min_price = filters.get('min_price', 0)
-            max_price = filters.get('max_price', 10000)
-            min_rating = filters.get('min_rating', 0)
-            
-            filtered_results = []
-            for result in parsed_results:
-                filter_data = result.get('filter', {})
-                price = filter_data.get('price', 0)
-                rating = filter_data.get('rating', 0)
-                
-                if min_price <= price <= max_price and rating >= min_rating:
-                    filtered_results.append(result)
-            
-            print(f"  After client-side filtering: {len(filtered_results)} results")
-            
-            return jsonify({
-                "query": query,
-                "results": filtered_results,
-                "count": len(filtered_results)
-            })
-        else:
-            error_msg = f"Endee search failed: {response.text}"
-            print(f"  ❌ Error: {error_msg}")
-            return jsonify({"error": error_msg}), 500
-            
+                filters = item.get('filters') or {}
+                hits = fuse_lexical(item['query'], search_products(query_embedding, k, filters), k, filters)
+                results = enrich(hits)
+            except Exception as e:
+                logger.error("batch search failed query=%r error=%s", item['query'], e)
+                return render_json({"query": item['query'], "error": str(e)})
+            return render_json({"query": item['query'], "results": raw_list(results), "count": len(results)})
+        
+        # Endee searches are I/O bound, so fan them out and keep the input order
+        responses = list(search_executor.map(run, items, query_embeddings, [k for k, _ in ks]))
+        
+        return json_response({"results": raw_list(responses), "count": len(responses)})
+    
     except Exception as e:
-        error_msg = str(e)
-        print(f"  ❌ Exception: {error_msg}")
-        import traceback
-        traceback.print_exc()
-        return jsonify({"error": error_msg}), 500
+        logger.exception("search failed")
+        return jsonify({"error": str(e)}), 500
 
 @app.route('/api/similar/<product_id>', methods=['GET'])
 def find_similar(product_id):
@@ -208,179 +852,123 @@ def find_similar(product_id):
     try:
         k = request.args.get('k', 5, type=int)
         
-        # Get the product vector from Endee
-        get_payload = {"id": product_id}
-        response = requests.post(
-            f"{ENDEE_BASE_URL}/index/{INDEX_NAME}/vector/get",
-            json=get_payload
-        )
-        
-        if response.status_code != 200:
-            return jsonify({"error": "Product not found"}), 404
-        
-        # Decode MessagePack response
-        # vector/get returns a list: [id, metadata, filter, vector, ?]
-        product_data = msgpack.unpackb(response.content, raw=False)
-        
-        if isinstance(product_data, list) and len(product_data) >= 4:
-            product_vector = product_data[3]  # Vector is at index 3
+        # Serve from the table precomputed by the indexer when it covers this product and k
+        neighbors = similar_products_table.get(product_id, k) if similar_products_table else None
+        if neighbors is not None:
+            source = "precomputed"
+            hits = [SearchHit(score, neighbor_id, None, None) for score, neighbor_id in neighbors]
         else:
-            return jsonify({"error": "Invalid product data format"}), 500
-        
-        if not product_vector:
-            return jsonify({"error": "Product vector not found"}), 404
-        
-        # Search for similar products
-        search_payload = {
-            "vector": product_vector,
-            "k": k + 1,  # +1 to exclude the product itself
-            "include_vectors": False
-        }
-        
-        headers = {
-            'Content-Type': 'application/json',
-            'Accept': 'application/json'
-        }
-        
-        search_response = requests.post(
-            f"{ENDEE_BASE_URL}/index/{INDEX_NAME}/search",
-            json=search_payload,
-            headers=headers
-        )
-        
-        if search_response.status_code == 200:
-            # Decode MessagePack response
-            results = msgpack.unpackb(search_response.content, raw=False)
+            source = "endee"
             
-            # Parse list-based results and enrich with product data
-            parsed_results = []
-            for result in results:
-                if isinstance(result, list) and len(result) >= 2:
-                    score = result[0]
-                    result_id = result[1]
-                    
-                    # Get product data from our database
-                    product = PRODUCTS_DB.get(result_id, {})
-                    
-                    if product:
-                        parsed_results.append({
-                            'score': score,
-                            'id': result_id,
-                            'meta': {
-                                'title': product.get('title', 'Untitled Product'),
-                                'description': product.get('description', 'No description available'),
-                                'image': product.get('image', ''),
-                                'brand': product.get('brand', ''),
-                                'category': product.get('category', 'Product')
-                            },
-                            'filter': {
-                                'price': float(product.get('price', 0)),
-                                'rating': float(product.get('rating', 0)),
-                                'stock': int(product.get('stock', 0)),
-                                'category': product.get('category', 'Product')
-                            }
-                        })
+            # Get the product vector from Endee
+            record = endee_client.get_vector(product_id)
             
-            # Filter out the original product
-            similar_products = [r for r in parsed_results if r.get('id') != product_id][:k]
+            if record is None:
+                return jsonify({"error": "Product not found"}), 404
             
-            return jsonify({
-                "product_id": product_id,
-                "similar_products": similar_products,
-                "count": len(similar_products)
-            })
-        else:
-            return jsonify({"error": "Search failed"}), 500
+            if not record.vector:
+                return jsonify({"error": "Product vector not found"}), 404
             
+            # Search for similar products (+1 to exclude the product itself)
+            try:
+                hits = endee_client.search(record.vector, k + 1)
+            except EndeeError:
+                return jsonify({"error": "Search failed"}), 500
+        
+        # Enrich hits with product data, leaving out the original product
+        similar_products = enrich(hits, exclude_id=product_id, limit=k)
+        SIMILAR_REQUESTS.inc(source=source)
+        
+        return json_response({
+            "product_id": product_id,
+            "similar_products": raw_list(similar_products),
+            "count": len(similar_products),
+            "source": source
+        })
+    
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/suggest', methods=['GET'])
+def get_suggestions():
+    """Typeahead: /api/suggest?q=mas&limit=5"""
+    prefix = request.args.get('q', '')
+    limit = min(request.args.get('limit', SUGGEST_LIMIT, type=int), SUGGEST_LIMIT)
+    return json_response({"query": prefix, "suggestions": suggest(prefix, limit)})
+
 @app.route('/api/categories', methods=['GET'])
 def get_categories():
-    """Get all unique categories"""
-    # For now, return hardcoded categories
-    # In production, you might want to query Endee or maintain a separate list
-    categories = [
-        "All",
-        "Electronics",
-        "Fashion", 
-        "Home",
-        "Sports",
-        "Books",
-        "beauty",
-        "fragrances",
-        "furniture",
-        "groceries",
-        "home-decoration",
-        "kitchen-accessories",
-        "laptops",
-        "mens-shirts",
-        "mens-shoes",
-        "mens-watches",
-        "mobile-accessories",
-        "motorcycle",
-        "skin-care",
-        "smartphones",
-        "sports-accessories",
-        "sunglasses",
-        "tablets",
-        "tops",
-        "vehicle",
-        "womens-bags",
-        "womens-dresses",
-        "womens-jewellery",
-        "womens-shoes",
-        "womens-watches",
-        "jewelery",
-        "men's clothing",
-        "women's clothing",
-        "electronics"
-    ]
-    return jsonify({"categories": sorted(set(categories))})
+    """Get the categories present in the catalog, with product counts"""
+    body, etag = CATALOG.categories_json
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'  # revalidate, usually a 304
+    return response.make_conditional(request)
 
 @app.route('/api/product/<product_id>', methods=['GET'])
 def get_product(product_id):
     """Get product details by ID"""
     try:
-        # Get product from our database
-        product = PRODUCTS_DB.get(product_id)
+        # Get the pre-serialized product
+        payload = CATALOG.payload(product_id)
         
-        if product:
-            return jsonify({
-                'id': product_id,
-                'meta': {
-                    'title': product.get('title', 'Untitled Product'),
-                    'description': product.get('description', 'No description available'),
-                    'image': product.get('image', ''),
-                    'brand': product.get('brand', ''),
-                    'category': product.get('category', 'Product')
-                },
-                'filter': {
-                    'price': float(product.get('price', 0)),
-                    'rating': float(product.get('rating', 0)),
-                    'stock': int(product.get('stock', 0)),
-                    'category': product.get('category', 'Product')
-                }
-            })
+        if payload is not None:
+            return Response(payload, mimetype='application/json')
         else:
             return jsonify({"error": "Product not found"}), 404
-            
+    
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/admin/reload', methods=['POST'])
+def admin_reload():
+    """Reload products.json and the indexer's outputs without restarting"""
+    if not ADMIN_TOKEN:
+        return jsonify({"error": "Reload endpoint is disabled (set ADMIN_TOKEN)"}), 403
+    # Constant-time comparison, so response timing doesn't reveal the token
+    if not hmac.compare_digest(request.headers.get('X-Admin-Token', '').encode('utf-8'), ADMIN_TOKEN.encode('utf-8')):
+        return jsonify({"error": "Invalid admin token"}), 403
+    
+    try:
+        catalog = reload_catalog()
+    except Exception as e:
+        return jsonify({"error": f"Reload failed, keeping the current data: {e}"}), 500
+    
+    return jsonify({
+        "status": "reloaded",
+        "products": len(catalog),
+        "version": catalog_state["version"]
+    })
+
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Prometheus metrics: per-stage and per-route latency histograms, cache and Endee counters"""
+    return Response(REGISTRY.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
 @app.route('/api/stats', methods=['GET'])
 def get_stats():
     """Get index statistics"""
     try:
         # Return stats from our product database
         return jsonify({
-            "vector_count": len(PRODUCTS_DB),
-            "total_elements": len(PRODUCTS_DB),
+            "vector_count": len(CATALOG),
+            "total_elements": len(CATALOG),
             "dim": 384,
-            "space_type": "cosine"
+            "space_type": "cosine",
+            "embedding_cache": embedding_cache.stats(),
+            "result_cache": result_cache.stats(),
+            "semantic_cache": semantic_cache.stats(),
+            "search_cursors": cursor_store.stats(),
+            "encode_batcher": encode_batcher.stats() if encode_batcher else None,
+            "catalog": {
+                "version": catalog_state["version"],
+                "loaded_at": catalog_state["loaded_at"],
+                "reloads": catalog_state["reloads"],
+                "last_error": catalog_state["last_error"]
+            }
         })
     except Exception as e:
-        return jsonify({"error": str(e), "vector_count": len(PRODUCTS_DB)}), 200
+        return jsonify({"error": str(e), "vector_count": len(CATALOG)}), 200
 
 if __name__ == '__main__':
     print("🚀 Starting E-commerce Discovery API...")
@@ -0,0 +1,367 @@
+"""
+Async serving mode for the E-commerce Discovery API.
+
+Run `python async_app.py` instead of `python app.py`. /api/search,
+/api/similar/<id>, /api/product/<id> and /api/suggest are served on an
+asyncio event loop:
+Endee calls go through a shared aiohttp connection pool and query encoding is
+handed to the encode batcher (or a small thread pool), so in-flight requests
+don't each hold a thread. Every other route is forwarded to the Flask app in
+a worker thread, so the two modes expose the same API.
+"""
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from aiohttp import web
+from werkzeug.test import EnvironBuilder, run_wsgi_app
+
+import app as api
+from embedding_cache import normalize_query
+from endee_client import AsyncEndeeClient, EndeeError, SearchHit, has_range
+from metrics import stage
+from payloads import raw_list, render_json
+from result_cache import SharedCursorStore, SharedResultCache, result_cache_key, search_context
+
+ASYNC_PORT = int(os.getenv('ASYNC_PORT', 5000))
+ASYNC_ENDEE_POOL_SIZE = int(os.getenv('ASYNC_ENDEE_POOL_SIZE', 100))
+ASYNC_CPU_WORKERS = int(os.getenv('ASYNC_CPU_WORKERS', 4))
+ASYNC_WSGI_WORKERS = int(os.getenv('ASYNC_WSGI_WORKERS', 8))
+
+# CPU-bound work (unbatched encodes, local vector search) and forwarded Flask routes
+cpu_executor = ThreadPoolExecutor(max_workers=ASYNC_CPU_WORKERS, thread_name_prefix='async-cpu')
+wsgi_executor = ThreadPoolExecutor(max_workers=ASYNC_WSGI_WORKERS, thread_name_prefix='async-wsgi')
+
+# Calls to the shared result cache are blocking socket round trips
+cache_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='async-cache')
+
+ENDEE_CLIENT = web.AppKey('endee_client', AsyncEndeeClient)
+
+logger = logging.getLogger('api.async')
+
+
+def json_response(fields):
+    """aiohttp response for a dict that may contain pre-serialized RawJSON values"""
+    with stage('serialize'):
+        body = render_json(fields)
+    return web.Response(body=body, content_type='application/json')
+
+
+async def run_cpu(fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(cpu_executor, fn, *args)
+
+
+async def cache_get(key, version):
+    """result_cache.get that never blocks the event loop on the shared cache"""
+    cache = api.result_cache
+    if isinstance(cache, SharedResultCache):
+        return await asyncio.get_running_loop().run_in_executor(cache_executor, cache.get, key, version)
+    return cache.get(key, version)
+
+
+def cache_put(key, version, fields):
+    """result_cache.put; stores into the shared cache in the background"""
+    cache = api.result_cache
+    if isinstance(cache, SharedResultCache):
+        asyncio.get_running_loop().run_in_executor(cache_executor, cache.put, key, version, fields)
+    else:
+        cache.put(key, version, fields)
+
+
+async def paginate(fn, *args):
+    """api.first_page / api.next_page, off the event loop when cursors are shared"""
+    if isinstance(api.cursor_store, SharedCursorStore):
+        return await asyncio.get_running_loop().run_in_executor(cache_executor, fn, *args)
+    return fn(*args)
+
+
+async def encode_query(query):
+    """Async version of app.encode_query that never blocks the event loop"""
+    key = normalize_query(query)
+    embedding = api.embedding_cache.get(key)
+    if embedding is None:
+        with stage('encode'):
+            if api.encode_batcher is not None:
+                embedding = await asyncio.wrap_future(api.encode_batcher.submit(key))
+            else:
+                embedding = await run_cpu(api.embedding_model.encode, key)
+        api.embedding_cache.put(key, embedding)
+    return embedding
+
+
+async def search_endee(client, query_embedding, k, filters):
+    """Async version of app.search_endee (same pushdown and adaptive over-fetch)"""
+    fetch_k = k
+    while True:
+        conditions = api.build_filter_conditions(filters, include_ranges=api.ENDEE_RANGE_FILTERS)
+        try:
+            with stage('endee'):
+                hits = await client.search(query_embedding, fetch_k, filter=conditions)
+        except EndeeError as e:
+            if api.ENDEE_RANGE_FILTERS and e.status_code == 400 and has_range(conditions):
+                logger.warning("Endee rejected range filters, filtering locally instead: %s", e)
+                api.ENDEE_RANGE_FILTERS = False
+                continue
+            raise
+
+        matches = api.collect_matches(hits, k, filters)
+        if len(matches) >= k or len(hits) < fetch_k or fetch_k >= api.SEARCH_MAX_CANDIDATES:
+            return matches
+        fetch_k = min(fetch_k * 2, api.SEARCH_MAX_CANDIDATES)
+
+
+async def search_products(client, query_embedding, k, filters):
+    """Async version of app.search_products"""
+    if api.SEARCH_BACKEND == 'local' and api.local_index is not None:
+        return await run_cpu(api.search_local, query_embedding, k, filters)
+    try:
+        return await search_endee(client, query_embedding, k, filters)
+    except EndeeError as e:
+        if api.local_index is None or not api.LOCAL_SEARCH_FALLBACK:
+            raise
+        logger.warning("Endee unavailable (%s), answering from the local index", e)
+        return await run_cpu(api.search_local, query_embedding, k, filters)
+
+
+async def semantic_search(request):
+    """Async /api/search (same request and response format as app.semantic_search)"""
+    try:
+        with stage('parse'):
+            data = await request.json()
+            query = data.get('query', '')
+            k, k_message = api.parse_int(data.get('k', 10), 'k')
+            filters = data.get('filters') or {}
+            want_facets = bool(data.get('facets'))
+            cursor = data.get('cursor')
+            page_size = data.get('page_size')
+            searcher = api.search_client(request.headers, request.remote)
+    except Exception:
+        return web.json_response({"error": "Invalid JSON body"}, status=400)
+
+    if cursor:
+        fields = await paginate(api.next_page, cursor)
+        if fields is None:
+            return web.json_response({"error": "Cursor is invalid or has expired, start a new search"}, status=410)
+        return json_response(fields)
+
+    if not query:
+        return web.json_response({"error": "Query is required"}, status=400)
+    error = k_message or api.k_error(k)
+    if error:
+        return web.json_response({"error": error}, status=400)
+
+    if page_size is not None:
+        page_size, error = api.parse_int(page_size, 'page_size')
+        if error:
+            return web.json_response({"error": error}, status=400)
+        try:
+            page_size = max(1, min(page_size, api.SEARCH_PAGE_CANDIDATES))
+            query_embedding = await encode_query(query)
+            hits = await search_products(request.app[ENDEE_CLIENT], query_embedding, api.SEARCH_PAGE_CANDIDATES, filters)
+        except Exception as e:
+            logger.exception("search failed")
+            return web.json_response({"error": str(e)}, status=500)
+        hits = api.fuse_lexical(query, hits, api.SEARCH_PAGE_CANDIDATES, filters)
+        api.query_log.record(query, searcher, len(hits))
+        return json_response(await paginate(api.first_page, query, page_size, hits))
+    cache_key = result_cache_key(query, k, filters, want_facets)
+    version = api.data_version(api.catalog_state["mtimes"])
+    cached = await cache_get(cache_key, version)
+    if cached is not None:
+        api.query_log.record(query, searcher, cached["count"])
+        return json_response({"query": query, **cached})
+
+    hits = None if want_facets else api.lexical_fast_path(query, k, filters)
+    if hits is not None:
+        results = api.enrich(hits)
+        fields = {"results": raw_list(results), "count": len(results)}
+        cache_put(cache_key, version, fields)
+        api.query_log.record(query, searcher, len(results))
+        return json_response({"query": query, **fields})
+
+    try:
+        query_embedding = await encode_query(query)
+        context = search_context(k, filters, want_facets)
+        near = api.semantic_cache.get(query_embedding, context, version)
+        if near is not None:
+            cache_put(cache_key, version, near[0])
+            api.query_log.record(query, searcher, near[0]["count"])
+            return json_response({"query": query, **near[0]})
+        client = request.app[ENDEE_CLIENT]
+        if want_facets:
+            hits, candidates = await asyncio.gather(
+                search_products(client, query_embedding, k, filters),
+                search_products(client, query_embedding, api.SEARCH_FACET_CANDIDATES, {})
+            )
+        else:
+            hits = await search_products(client, query_embedding, k, filters)
+        hits = api.fuse_lexical(query, hits, k, filters)
+    except Exception as e:
+        logger.exception("search failed")
+        return web.json_response({"error": str(e)}, status=500)
+
+    results = api.enrich(hits)
+    logger.info("search query=%r k=%d filters=%s backend=%s results=%d",
+                query, k, filters, api.SEARCH_BACKEND, len(results))
+    fields = {
+        "results": raw_list(results),
+        "count": len(results)
+    }
+    if want_facets:
+        with stage('facets'):
+            fields["facets"] = api.CATALOG.facets(api.CATALOG.rows(hit.id for hit in candidates))
+    cache_put(cache_key, version, fields)
+    api.semantic_cache.put(query_embedding, context, version, fields)
+    api.query_log.record(query, searcher, len(results))
+    return json_response({"query": query, **fields})
+
+
+async def find_similar(request):
+    """Async /api/similar/<product_id>"""
+    product_id = request.match_info['product_id']
+    try:
+        k = int(request.query.get('k', 5))
+    except ValueError:
+        k = 5
+
+    try:
+        table = api.similar_products_table
+        neighbors = table.get(product_id, k) if table else None
+        if neighbors is not None:
+            source = "precomputed"
+            hits = [SearchHit(score, neighbor_id, None, None) for score, neighbor_id in neighbors]
+        else:
+            source = "endee"
+            client = request.app[ENDEE_CLIENT]
+            record = await client.get_vector(product_id)
+            if record is None:
+                return web.json_response({"error": "Product not found"}, status=404)
+            if not record.vector:
+                return web.json_response({"error": "Product vector not found"}, status=404)
+            try:
+                hits = await client.search(record.vector, k + 1)
+            except EndeeError:
+                return web.json_response({"error": "Search failed"}, status=500)
+    except Exception as e:
+        return web.json_response({"error": str(e)}, status=500)
+
+    similar_products = api.enrich(hits, exclude_id=product_id, limit=k)
+    api.SIMILAR_REQUESTS.inc(source=source)
+    return json_response({
+        "product_id": product_id,
+        "similar_products": raw_list(similar_products),
+        "count": len(similar_products),
+        "source": source
+    })
+
+
+async def get_product(request):
+    """Async /api/product/<product_id>"""
+    product_id = request.match_info['product_id']
+    payload = api.CATALOG.payload(product_id)
+    if payload is None:
+        return web.json_response({"error": "Product not found"}, status=404)
+    return web.Response(body=payload, content_type='application/json')
+
+
+async def get_suggestions(request):
+    """Async /api/suggest"""
+    prefix = request.query.get('q', '')
+    try:
+        limit = min(int(request.query.get('limit', api.SUGGEST_LIMIT)), api.SUGGEST_LIMIT)
+    except ValueError:
+        limit = api.SUGGEST_LIMIT
+    return json_response({"query": prefix, "suggestions": api.suggest(prefix, limit)})
+
+
+async def forward_to_flask(request):
+    """Serve any other route with the Flask app, in a worker thread"""
+    body = await request.read()
+    builder = EnvironBuilder(
+        path=request.path,
+        method=request.method,
+        headers=list(request.headers.items()),
+        data=body,
+        query_string=request.query_string
+    )
+    environ = builder.get_environ()
+    builder.close()
+
+    def call():
+        app_iter, status, headers = run_wsgi_app(api.app, environ, buffered=True)
+        return status, headers, b''.join(app_iter)
+
+    status, headers, payload = await asyncio.get_running_loop().run_in_executor(wsgi_executor, call)
+    headers = [(name, value) for name, value in headers.items()
+               if name.lower() not in ('content-length', 'transfer-encoding')]
+    return web.Response(status=int(status.split()[0]), headers=headers, body=payload)
+
+
+@web.middleware
+async def metrics_middleware(request, handler):
+    """Request metrics for the natively served routes (forwarded ones are counted by Flask)"""
+    route = request.match_info.route.resource.canonical if request.match_info.route.resource else 'unmatched'
+    if route == '/{tail}':
+        return await handler(request)
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await handler(request)
+        status = response.status
+        return response
+    except web.HTTPException as e:
+        status = e.status
+        raise
+    finally:
+        api.REQUEST_SECONDS.observe(time.perf_counter() - started, route=route, method=request.method)
+        api.REQUESTS.inc(route=route, method=request.method, status=status)
+
+
+@web.middleware
+async def cors_middleware(request, handler):
+    """Mirror flask-cors for the natively served routes"""
+    if request.method == 'OPTIONS':
+        response = web.Response()
+        response.headers['Access-Control-Allow-Methods'] = 'GET, POST, OPTIONS'
+        response.headers['Access-Control-Allow-Headers'] = request.headers.get(
+            'Access-Control-Request-Headers', 'Content-Type')
+    else:
+        response = await handler(request)
+    response.headers.setdefault('Access-Control-Allow-Origin', '*')
+    return response
+
+
+async def start_endee_client(application):
+    application[ENDEE_CLIENT] = AsyncEndeeClient(
+        api.ENDEE_BASE_URL, api.INDEX_NAME,
+        connect_timeout=api.ENDEE_CONNECT_TIMEOUT,
+        read_timeout=api.ENDEE_READ_TIMEOUT,
+        max_retries=api.ENDEE_MAX_RETRIES,
+        pool_size=ASYNC_ENDEE_POOL_SIZE
+    )
+
+
+async def close_endee_client(application):
+    await application[ENDEE_CLIENT].close()
+
+
+def create_app():
+    application = web.Application(middlewares=[cors_middleware, metrics_middleware])
+    application.on_startup.append(start_endee_client)
+    application.on_cleanup.append(close_endee_client)
+    application.router.add_post('/api/search', semantic_search)
+    application.router.add_get('/api/similar/{product_id}', find_similar)
+    application.router.add_get('/api/product/{product_id}', get_product)
+    application.router.add_get('/api/suggest', get_suggestions)
+    application.router.add_route('*', '/{tail:.*}', forward_to_flask)
+    return application
+
+
+if __name__ == '__main__':
+    print("🚀 Starting E-commerce Discovery API (async mode)...")
+    print(f"📊 Endee URL: {api.ENDEE_BASE_URL}")
+    print(f"📦 Index: {api.INDEX_NAME}")
+    print(f"🌐 Server running on http://localhost:{ASYNC_PORT}")
+    web.run_app(create_app(), port=ASYNC_PORT, print=None)
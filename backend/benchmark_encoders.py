@@ -0,0 +1,106 @@
+"""
+Parity check and benchmark of the ONNX encoders against the PyTorch model.
+
+For every ONNX model found in ONNX_MODEL_DIR, reports the cosine agreement
+with the SentenceTransformer embeddings of the catalog, single-query encode
+latency and batch throughput. Exits non-zero if any model's worst-case
+cosine is below --min-cosine.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from create_embeddings import product_text
+from encoders import MODEL_NAME, ONNX_MODEL_DIR, OnnxEncoder
+
+SAMPLE_QUERIES = [
+    "cozy winter sweater",
+    "wireless headphones",
+    "running shoes for men",
+    "gift for a coffee lover",
+    "waterproof hiking backpack",
+    "red lipstick",
+    "minimalist desk lamp",
+    "smartphone with a good camera"
+]
+
+
+def percentile(values, q):
+    return float(np.percentile(values, q)) if values else 0.0
+
+
+def benchmark(encoder, texts, queries, runs, batch_size):
+    """Return (embeddings, latency stats) for one encoder"""
+    encoder.encode(queries[0])  # warm-up
+
+    latencies = []
+    for _ in range(runs):
+        for query in queries:
+            start = time.perf_counter()
+            encoder.encode(query)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    embeddings = np.asarray(encoder.encode(texts, batch_size=batch_size), dtype=np.float32)
+    elapsed = time.perf_counter() - start
+
+    return embeddings, {
+        "query_p50_ms": percentile(latencies, 50),
+        "query_p95_ms": percentile(latencies, 95),
+        "batch_texts_per_s": len(texts) / elapsed if elapsed else 0.0
+    }
+
+
+def cosine_rows(a, b):
+    a = a / np.clip(np.linalg.norm(a, axis=1, keepdims=True), 1e-12, None)
+    b = b / np.clip(np.linalg.norm(b, axis=1, keepdims=True), 1e-12, None)
+    return (a * b).sum(axis=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare ONNX encoders with the PyTorch model")
+    parser.add_argument('--model-dir', default=ONNX_MODEL_DIR)
+    parser.add_argument('--products', default='../data/products.json')
+    parser.add_argument('--samples', type=int, default=256, help="Catalog texts used for parity and throughput")
+    parser.add_argument('--runs', type=int, default=20, help="Passes over the sample queries for latency")
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--min-cosine', type=float, default=0.98)
+    args = parser.parse_args()
+
+    with open(args.products, 'r', encoding='utf-8') as f:
+        texts = [product_text(p) for p in json.load(f)[:args.samples]]
+
+    from sentence_transformers import SentenceTransformer
+    print(f"Loading reference model {MODEL_NAME} (torch)...")
+    candidates = [("torch", SentenceTransformer(MODEL_NAME, device='cpu'))]
+    for model_file in ("model.onnx", "model_quantized.onnx"):
+        if os.path.exists(os.path.join(args.model_dir, model_file)):
+            candidates.append((f"onnx:{model_file}", OnnxEncoder(args.model_dir, model_file)))
+    if len(candidates) == 1:
+        print(f"❌ No ONNX models in {args.model_dir}. Run export_onnx.py first.")
+        sys.exit(1)
+
+    print(f"\n{'encoder':<28}{'cos mean':>10}{'cos min':>10}{'p50 ms':>9}{'p95 ms':>9}{'texts/s':>10}")
+    reference = None
+    failed = False
+    for name, encoder in candidates:
+        embeddings, stats = benchmark(encoder, texts, SAMPLE_QUERIES, args.runs, args.batch_size)
+        if reference is None:
+            reference = embeddings
+        cosines = cosine_rows(embeddings, reference)
+        failed |= float(cosines.min()) < args.min_cosine
+        print(f"{name:<28}{cosines.mean():>10.4f}{cosines.min():>10.4f}"
+              f"{stats['query_p50_ms']:>9.2f}{stats['query_p95_ms']:>9.2f}{stats['batch_texts_per_s']:>10.1f}")
+
+    if failed:
+        print(f"\n❌ At least one ONNX model is below the parity threshold (cosine {args.min_cosine})")
+        sys.exit(1)
+    print(f"\n✅ All ONNX models agree with the reference (cosine >= {args.min_cosine})")
+
+
+if __name__ == "__main__":
+    main()
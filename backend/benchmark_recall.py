@@ -0,0 +1,198 @@
+"""
+Recall-vs-latency benchmark of Endee against exact brute-force search.
+
+Ground truth is exact cosine top-k over the embedding store written by
+create_embeddings.py (the same LocalVectorIndex the API uses for
+SEARCH_BACKEND=local). The same queries are sent to Endee's /search, or to
+test/mock_endee.py as a stand-in, and recall@k, latency percentiles and QPS
+are reported for every k and filter selectivity in the sweep.
+
+Selectivity is swept with a max_price filter set at that quantile of catalog
+prices, so 0.1 keeps roughly the cheapest 10% of products. Filters are pushed
+to Endee the way the API does, and hits are re-checked against the catalog.
+
+    python benchmark_recall.py --k 1,10,50 --selectivity 1,0.5,0.1,0.01
+    python benchmark_recall.py --product-queries 200 --concurrency 8 --output recall.json
+
+Exits non-zero if any recall@k is below --min-recall.
+"""
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from catalog import CATALOG_SNAPSHOT_PATH, ProductCatalog
+from create_embeddings import ENDEE_BASE_URL, INDEX_NAME, PRODUCTS_PATH
+from embedding_store import load_embeddings
+from endee_client import EndeeClient, EndeeError, build_filter_conditions
+from local_search import LocalVectorIndex
+
+SAMPLE_QUERIES = [
+    "cozy winter sweater",
+    "wireless headphones",
+    "running shoes for men",
+    "gift for a coffee lover",
+    "waterproof hiking backpack",
+    "red lipstick",
+    "minimalist desk lamp",
+    "smartphone with a good camera",
+    "leather wallet",
+    "summer dress",
+    "kitchen knife set",
+    "smart watch"
+]
+
+
+def percentile(values, q):
+    return float(np.percentile(values, q)) if values else 0.0
+
+
+def parse_list(value, cast):
+    return [cast(item) for item in value.split(',') if item.strip()]
+
+
+def load_catalog(products_path):
+    catalog = ProductCatalog.load_snapshot(CATALOG_SNAPSHOT_PATH, source_path=products_path)
+    return catalog if catalog is not None else ProductCatalog.from_json(products_path)
+
+
+def load_queries(args, ids, matrix):
+    """Return (labels, L2-normalized query matrix)"""
+    if args.product_queries:
+        # Stored product embeddings as queries: no model needed, and the
+        # distribution matches what /api/similar sends
+        rng = np.random.default_rng(args.seed)
+        rows = rng.choice(len(ids), size=min(args.product_queries, len(ids)), replace=False)
+        return [f"product:{ids[row]}" for row in rows], np.asarray(matrix[rows], dtype=np.float32)
+
+    texts = SAMPLE_QUERIES
+    if args.queries:
+        with open(args.queries, 'r', encoding='utf-8') as f:
+            if args.queries.endswith('.json'):
+                texts = json.load(f)
+            else:
+                texts = [line.strip() for line in f if line.strip()]
+
+    from encoders import ENCODER_BACKEND, load_encoder
+    print(f"Encoding {len(texts)} queries ({ENCODER_BACKEND})...")
+    vectors = np.asarray(load_encoder().encode(texts, batch_size=32), dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return texts, vectors / norms
+
+
+def selectivity_filters(catalog, selectivity):
+    """API filters keeping about `selectivity` of the catalog (by price quantile)"""
+    if selectivity >= 1:
+        return {}
+    return {"min_price": 0, "max_price": float(np.quantile(catalog.price, selectivity))}
+
+
+def endee_top_k(client, catalog, vector, k, filters):
+    """(ids, seconds) of Endee's top-k for one query, re-checked against the filters"""
+    conditions = build_filter_conditions(filters)
+    started = time.perf_counter()
+    hits = client.search(vector, k, filter=conditions)
+    elapsed = time.perf_counter() - started
+    passes = catalog.filter_rows(catalog.rows(hit.id for hit in hits), filters)
+    return [hit.id for hit, ok in zip(hits, passes) if ok][:k], elapsed
+
+
+def run_case(client, index, catalog, queries, k, filters, concurrency):
+    """Recall, latency and throughput of one (k, filters) combination"""
+    exact_latencies = []
+    truth = []
+    for vector in queries:
+        started = time.perf_counter()
+        hits = index.search(vector, k, filters)
+        exact_latencies.append(time.perf_counter() - started)
+        truth.append({hit.id for hit in hits})
+
+    vectors = [vector.tolist() for vector in queries]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        answers = list(executor.map(lambda v: endee_top_k(client, catalog, v, k, filters), vectors))
+    wall = time.perf_counter() - started
+
+    recalls = [
+        len(expected.intersection(ids)) / len(expected)
+        for expected, (ids, _) in zip(truth, answers)
+        if expected
+    ]
+    latencies = [seconds * 1000 for _, seconds in answers]
+    return {
+        "k": k,
+        "filters": filters,
+        "selectivity": float(index.mask(filters).sum() / max(int(index.valid.sum()), 1)),
+        "queries": len(queries),
+        "recall_mean": float(np.mean(recalls)) if recalls else 1.0,
+        "recall_min": float(np.min(recalls)) if recalls else 1.0,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "qps": len(queries) / wall if wall else 0.0,
+        "exact_p50_ms": percentile([seconds * 1000 for seconds in exact_latencies], 50)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recall and latency of Endee against exact search")
+    parser.add_argument('--endee-url', default=ENDEE_BASE_URL, help="Endee, or test/mock_endee.py as a stand-in")
+    parser.add_argument('--index', default=INDEX_NAME)
+    parser.add_argument('--products', default=PRODUCTS_PATH)
+    parser.add_argument('--queries', help="query file: a JSON list (.json) or one query per line")
+    parser.add_argument('--product-queries', type=int, default=0,
+                        help="use N random stored product embeddings as queries instead of text")
+    parser.add_argument('--k', default='1,10,50', help="comma-separated k values")
+    parser.add_argument('--selectivity', default='1,0.5,0.1,0.01',
+                        help="comma-separated fractions of the catalog the filter keeps")
+    parser.add_argument('--concurrency', type=int, default=1, help="concurrent Endee searches")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--min-recall', type=float, default=0.0)
+    parser.add_argument('--output', help="write the results as JSON")
+    args = parser.parse_args()
+
+    catalog = load_catalog(args.products)
+    ids, matrix = load_embeddings(mmap=False)
+    if ids is None:
+        print("❌ No embedding store found. Run create_embeddings.py first.")
+        sys.exit(1)
+    index = LocalVectorIndex(ids, matrix, catalog)
+    labels, queries = load_queries(args, ids, matrix)
+    print(f"Ground truth: exact search over {int(index.valid.sum())} vectors, {len(labels)} queries")
+
+    client = EndeeClient(args.endee_url, args.index, pool_size=max(args.concurrency, 1))
+    results = []
+    print(f"\n{'select':>8}{'k':>6}{'recall':>9}{'min':>7}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+          f"{'qps':>9}{'exact ms':>10}")
+    try:
+        for selectivity in parse_list(args.selectivity, float):
+            filters = selectivity_filters(catalog, selectivity)
+            for k in parse_list(args.k, int):
+                row = run_case(client, index, catalog, queries, k, filters, args.concurrency)
+                results.append(row)
+                print(f"{row['selectivity']:>8.3f}{k:>6}{row['recall_mean']:>9.4f}{row['recall_min']:>7.2f}"
+                      f"{row['p50_ms']:>9.2f}{row['p95_ms']:>9.2f}{row['p99_ms']:>9.2f}"
+                      f"{row['qps']:>9.1f}{row['exact_p50_ms']:>10.2f}")
+    except EndeeError as e:
+        print(f"\n❌ Endee search failed: {e}")
+        sys.exit(1)
+    finally:
+        client.close()
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({"queries": labels, "results": results}, f, indent=2)
+
+    worst = min(row['recall_mean'] for row in results) if results else 1.0
+    if worst < args.min_recall:
+        print(f"\n❌ Recall {worst:.4f} is below --min-recall {args.min_recall}")
+        sys.exit(1)
+    print(f"\n✅ Lowest mean recall {worst:.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+import hashlib
+import json
+import os
+from functools import cached_property
+
+import numpy as np
+
+from payloads import dumps
+
+# Binary snapshot of the catalog, written by create_embeddings.py
+CATALOG_SNAPSHOT_PATH = '../data/catalog_snapshot.npz'
+SNAPSHOT_FORMAT = 2
+
+# Bucket edges of the price and rating facets; the last bucket is open-ended
+PRICE_FACET_EDGES = np.array([0, 25, 50, 100, 250, 500, 1000], dtype=np.float32)
+RATING_FACET_EDGES = np.array([0, 1, 2, 3, 3.5, 4, 4.5], dtype=np.float32)
+
+
+def canonical_category(name):
+    """
+    One spelling per category, whatever the source used: "electronics" and
+    "Electronics" are both "Electronics", "kitchen-accessories" is
+    "Kitchen Accessories".
+    """
+    words = str(name or '').replace('-', ' ').split()
+    return ' '.join(word[:1].upper() + word[1:] for word in words) or 'Product'
+
+
+class StringColumn:
+    """
+    Immutable list of strings stored as one UTF-8 buffer plus offsets.
+
+    from_bytes() packs values that are already bytes; raw() reads them back
+    without decoding.
+    """
+
+    def __init__(self, values):
+        self._pack([value.encode('utf-8') for value in values])
+
+    @classmethod
+    def from_bytes(cls, values):
+        column = cls.__new__(cls)
+        column._pack(list(values))
+        return column
+
+    def _pack(self, encoded):
+        self.offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in encoded], out=self.offsets[1:])
+        self.buffer = b''.join(encoded)
+
+    @classmethod
+    def from_buffer(cls, buffer, offsets):
+        column = cls.__new__(cls)
+        column.buffer = buffer
+        column.offsets = offsets
+        return column
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def raw(self, row):
+        return self.buffer[self.offsets[row]:self.offsets[row + 1]]
+
+    def __getitem__(self, row):
+        return self.raw(row).decode('utf-8')
+
+    def __iter__(self):
+        return (self[row] for row in range(len(self)))
+
+
+def intern_column(values):
+    """Return (sorted unique values, int32 code per row)"""
+    uniques, codes = np.unique(np.array(values, dtype=str), return_inverse=True)
+    return [str(value) for value in uniques], codes.astype(np.int32)
+
+
+def source_signature(path):
+    """(mtime_ns, size) of the file a snapshot was built from"""
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def histogram(values, edges):
+    """Count values per [edges[i], edges[i + 1]) bucket in one vectorized pass"""
+    buckets = np.searchsorted(edges, values, side='right') - 1
+    counts = np.bincount(buckets[buckets >= 0], minlength=len(edges))
+    bounds = [float(edge) for edge in edges] + [None]
+    return [
+        {"min": bounds[i], "max": bounds[i + 1], "count": int(count)}
+        for i, count in enumerate(counts)
+    ]
+
+
+def product_details(product_id, product):
+    """Build the API representation of a product"""
+    category = canonical_category(product.get('category'))
+    return {
+        'id': product_id,
+        'meta': {
+            'title': product.get('title', 'Untitled Product'),
+            'description': product.get('description', 'No description available'),
+            'image': product.get('image', ''),
+            'brand': product.get('brand', ''),
+            'category': category
+        },
+        'filter': {
+            'price': float(product.get('price', 0)),
+            'rating': float(product.get('rating', 0)),
+            'stock': int(product.get('stock', 0)),
+            'category': category
+        }
+    }
+
+
+class ProductCatalog:
+    """
+    Columnar, read-only product store.
+
+    Numeric fields live in NumPy arrays, category and brand are interned to
+    int32 codes, text fields are packed into StringColumns, and ids map to
+    row numbers. Each product's API payload is serialized once at build
+    time. Filters are evaluated as vectorized masks over the columns.
+    """
+
+    def __init__(self, products):
+        self.ids = [product['id'] for product in products]
+
+        self.price = np.array([float(p.get('price', 0)) for p in products], dtype=np.float32)
+        self.rating = np.array([float(p.get('rating', 0)) for p in products], dtype=np.float32)
+        self.stock = np.array([int(p.get('stock', 0)) for p in products], dtype=np.int32)
+
+        self.categories, self.category_codes = intern_column([canonical_category(p.get('category')) for p in products])
+        self.brands, self.brand_codes = intern_column([p.get('brand', '') for p in products])
+
+        self.titles = StringColumn([p.get('title', 'Untitled Product') for p in products])
+        self.descriptions = StringColumn([p.get('description', 'No description available') for p in products])
+        self.images = StringColumn([p.get('image', '') for p in products])
+
+        # JSON bytes of product_details(), reused by every response; packed
+        # like the other text columns rather than kept as one object per product
+        self.payloads = StringColumn.from_bytes(dumps(product_details(p['id'], p)) for p in products)
+        self._build_lookups()
+
+    def _build_lookups(self):
+        self.row_of = {product_id: row for row, product_id in enumerate(self.ids)}
+        self.category_index = {category: code for code, category in enumerate(self.categories)}
+        self.category_counts = np.bincount(self.category_codes, minlength=len(self.categories))
+
+    @classmethod
+    def from_json(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def save(self, path=CATALOG_SNAPSHOT_PATH, source_path=None):
+        """
+        Write a snapshot that load_snapshot() can read without parsing JSON.
+
+        Every column is stored as a flat array (strings as a UTF-8 buffer plus
+        offsets), so loading is a handful of array reads. source_path records
+        which products.json the snapshot was built from.
+        """
+        arrays = {
+            "format": np.array(SNAPSHOT_FORMAT),
+            "price": self.price,
+            "rating": self.rating,
+            "stock": self.stock,
+            "category_codes": self.category_codes,
+            "brand_codes": self.brand_codes
+        }
+        columns = {
+            "ids": StringColumn(self.ids),
+            "categories": StringColumn(self.categories),
+            "brands": StringColumn(self.brands),
+            "titles": self.titles,
+            "descriptions": self.descriptions,
+            "images": self.images,
+            "payloads": self.payloads
+        }
+        for name, column in columns.items():
+            arrays[f"{name}_buffer"] = np.frombuffer(column.buffer, dtype=np.uint8)
+            arrays[f"{name}_offsets"] = column.offsets
+        if source_path is not None:
+            arrays["source"] = np.array(source_signature(source_path), dtype=np.int64)
+
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(tmp_path, **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load_snapshot(cls, path=CATALOG_SNAPSHOT_PATH, source_path=None):
+        """
+        Load a snapshot written by save(), or return None if there isn't one,
+        it has an older format, or source_path has changed since it was built.
+        """
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            if int(data["format"]) != SNAPSHOT_FORMAT:
+                return None
+            if source_path is not None and (
+                    "source" not in data.files or data["source"].tolist() != source_signature(source_path)):
+                return None
+
+            def column(name):
+                return StringColumn.from_buffer(data[f"{name}_buffer"].tobytes(), data[f"{name}_offsets"])
+
+            catalog = cls.__new__(cls)
+            catalog.ids = list(column("ids"))
+            catalog.price = data["price"]
+            catalog.rating = data["rating"]
+            catalog.stock = data["stock"]
+            catalog.categories = list(column("categories"))
+            catalog.category_codes = data["category_codes"]
+            catalog.brands = list(column("brands"))
+            catalog.brand_codes = data["brand_codes"]
+            catalog.titles = column("titles")
+            catalog.descriptions = column("descriptions")
+            catalog.images = column("images")
+            catalog.payloads = column("payloads")
+
+        catalog._build_lookups()
+        return catalog
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, product_id):
+        return product_id in self.row_of
+
+    def payload(self, product_id):
+        """Pre-serialized API representation of a product, or None"""
+        row = self.row_of.get(product_id)
+        return None if row is None else self.payloads.raw(row)
+
+    @cached_property
+    def categories_json(self):
+        """
+        (JSON bytes, ETag) of the /api/categories response.
+
+        Built on first use and kept for the life of the catalog; a reloaded
+        catalog is a new object, so the cache is invalidated with it.
+        """
+        body = dumps({
+            "categories": ["All"] + self.categories,
+            "counts": {category: int(count) for category, count in zip(self.categories, self.category_counts)},
+            "total": len(self)
+        })
+        return body, hashlib.sha1(body).hexdigest()[:16]
+
+    def get(self, product_id, default=None):
+        """Reconstruct a product dict (slow path; prefer the columns)"""
+        row = self.row_of.get(product_id)
+        if row is None:
+            return default
+        return {
+            'id': product_id,
+            'title': self.titles[row],
+            'description': self.descriptions[row],
+            'image': self.images[row],
+            'brand': self.brands[self.brand_codes[row]],
+            'category': self.categories[self.category_codes[row]],
+            'price': float(self.price[row]),
+            'rating': float(self.rating[row]),
+            'stock': int(self.stock[row])
+        }
+
+    def rows(self, product_ids):
+        """Row numbers of the given ids, with -1 for unknown ids"""
+        return np.array([self.row_of.get(product_id, -1) for product_id in product_ids], dtype=np.int64)
+
+    def filter_rows(self, rows, filters):
+        """Boolean array telling which of `rows` pass the category/price/rating filters"""
+        rows = np.asarray(rows, dtype=np.int64)
+        mask = rows >= 0
+        rows = np.where(mask, rows, 0)
+
+        category = filters.get('category')
+        if category and category != 'All':
+            code = self.category_index.get(canonical_category(category))
+            if code is None:
+                return np.zeros(len(rows), dtype=bool)
+            mask &= self.category_codes[rows] == code
+
+        price = self.price[rows]
+        mask &= price >= float(filters.get('min_price', 0))
+        mask &= price <= float(filters.get('max_price', 10000))
+        if filters.get('min_rating'):
+            mask &= self.rating[rows] >= float(filters['min_rating'])
+        return mask
+
+    def facets(self, rows, max_brands=20):
+        """Category and brand counts plus price/rating histograms over the given rows"""
+        rows = np.asarray(rows, dtype=np.int64)
+        rows = rows[rows >= 0]
+        category_counts = np.bincount(self.category_codes[rows], minlength=len(self.categories))
+        brand_counts = np.bincount(self.brand_codes[rows], minlength=len(self.brands))
+        top_brands = np.argsort(-brand_counts, kind='stable')[:max_brands]
+        return {
+            "candidates": len(rows),
+            "category": {self.categories[code]: int(category_counts[code]) for code in np.flatnonzero(category_counts)},
+            "brand": {self.brands[code]: int(brand_counts[code]) for code in top_brands
+                      if brand_counts[code] and self.brands[code]},
+            "price": histogram(self.price[rows], PRICE_FACET_EDGES),
+            "rating": histogram(self.rating[rows], RATING_FACET_EDGES)
+        }
+
+    def mask(self, filters):
+        """Boolean mask over all rows of the products passing the filters"""
+        return self.filter_rows(np.arange(len(self)), filters)
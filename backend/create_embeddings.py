@@ -1,149 +1,390 @@
+import argparse
+import hashlib
 import json
-import requests
-from sentence_transformers import SentenceTransformer
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
+from encoders import ENCODER_BACKEND, MODEL_NAME, load_encoder
+from endee_client import EndeeClient, EndeeError
+from embedding_store import EmbeddingStoreWriter, load_embeddings
+from similar_products import SIMILAR_PRODUCTS_PATH, compute_neighbors, save_neighbors
+from catalog import CATALOG_SNAPSHOT_PATH, ProductCatalog, canonical_category
 
-ENDEE_BASE_URL = "http://localhost:8080/api/v1"
+ENDEE_BASE_URL = os.getenv('ENDEE_BASE_URL', 'http://localhost:8080/api/v1')
 INDEX_NAME = "ecommerce_products"
+PRODUCTS_PATH = '../data/products.json'
+
+# Records what is currently indexed so re-runs only touch changed products
+MANIFEST_PATH = '../data/index_manifest.json'
+
+# Insert batches that still fail after retries are appended here (JSON lines)
+DEAD_LETTER_PATH = '../data/failed_batches.jsonl'
+dead_letter_lock = threading.Lock()
+
+# Inserts are large, so allow a longer read timeout than the API server uses.
+# The client's retries (set from --retries) are the only retry layer
+endee_client = EndeeClient(ENDEE_BASE_URL, INDEX_NAME, read_timeout=60, max_retries=2)
 
 def load_products():
     """Load products from JSON file"""
     print("Loading products...")
-    with open('../data/products.json', 'r', encoding='utf-8') as f:
+    with open(PRODUCTS_PATH, 'r', encoding='utf-8') as f:
         return json.load(f)
 
+def product_text(product):
+    """Text that gets embedded for a product"""
+    # Combine title, description, category, and brand for rich semantic search
+    return f"{product['title']}. {product['description']} Category: {product['category']}. Brand: {product.get('brand', '')}"
+
+def product_meta(product):
+    """Metadata stored alongside the vector in Endee"""
+    return {
+        "title": product['title'],
+        "description": product['description'],
+        "image": product.get('image', ''),
+        "brand": product.get('brand', ''),
+        "category": canonical_category(product['category'])
+    }
+
+def product_filter(product):
+    """Filterable fields stored alongside the vector in Endee"""
+    return {
+        "price": float(product['price']),
+        "rating": float(product['rating']),
+        "stock": int(product['stock']),
+        # Canonical, so the API's category filter matches however products.json spells it
+        "category": canonical_category(product['category'])
+    }
+
+def vector_payload(product, vector):
+    """Build the Endee insert payload for one product"""
+    return {
+        "id": product['id'],
+        "vector": vector,
+        "meta": json.dumps(product_meta(product)),  # Serialize as JSON string
+        "filter": json.dumps(product_filter(product))  # Serialize as JSON string
+    }
+
+def content_hash(value):
+    """Stable short hash of a string or JSON-serializable value"""
+    if not isinstance(value, str):
+        value = json.dumps(value, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(value.encode('utf-8')).hexdigest()
+
+def product_hashes(product):
+    return {
+        "text": content_hash(product_text(product)),
+        "meta": content_hash(product_meta(product)),
+        "filter": content_hash(product_filter(product))
+    }
+
+def load_manifest():
+    """Load the manifest of the last run, or None if it's missing or for another index/model"""
+    if not os.path.exists(MANIFEST_PATH):
+        return None
+    try:
+        with open(MANIFEST_PATH, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except Exception as e:
+        print(f"⚠️  Ignoring unreadable manifest: {e}")
+        return None
+    if manifest.get('index_name') != INDEX_NAME or manifest.get('model') != MODEL_NAME:
+        print("ℹ️  Manifest was written for a different index or model, doing a full reindex")
+        return None
+    return manifest
+
+def save_manifest(entries):
+    tmp_path = f"{MANIFEST_PATH}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"index_name": INDEX_NAME, "model": MODEL_NAME, "products": entries}, f)
+    os.replace(tmp_path, MANIFEST_PATH)
+
+def plan_changes(products, manifest_entries, full=False):
+    """
+    Diff the catalog against the manifest.
+    
+    Returns (to_embed, to_update, to_delete): products whose embedded text is
+    new or changed, products where only metadata/filter fields changed, and
+    ids that are no longer in the catalog. With full=True every product is
+    re-embedded.
+    """
+    to_embed, to_update = [], []
+    for product in products:
+        old = manifest_entries.get(product['id'])
+        new = product_hashes(product)
+        if full or old is None or old.get('text') != new['text']:
+            to_embed.append(product)
+        elif old != new:
+            to_update.append(product)
+    
+    current_ids = {product['id'] for product in products}
+    to_delete = [product_id for product_id in manifest_entries if product_id not in current_ids]
+    return to_embed, to_update, to_delete
+
 def create_index():
     """Create Endee vector index"""
     print(f"Creating or verifying index '{INDEX_NAME}'...")
     
-    url = f"{ENDEE_BASE_URL}/index/create"
-    payload = {
-        "index_name": INDEX_NAME,
-        "dim": 384,  # all-MiniLM-L6-v2 embedding dimension
-        "space_type": "cosine"
-    }
-    
     try:
-        response = requests.post(url, json=payload)
-        if response.status_code in [200, 201]:
+        # 384 = all-MiniLM-L6-v2 embedding dimension
+        if endee_client.create_index(dim=384, space_type="cosine"):
             print("✅ Index created successfully!")
-            return True
-        elif "already exists" in response.text.lower():
-            print("ℹ️  Index already exists, proceeding to insert vectors...")
-            return True
         else:
-            print(f"⚠️  Response: {response.text}")
-            return True  # Proceed anyway as it might exist
+            print("ℹ️  Index already exists, proceeding to insert vectors...")
+        return True
+    except EndeeError as e:
+        print(f"⚠️  Response: {e}")
+        return True  # Proceed anyway as it might exist
     except Exception as e:
         print(f"❌ Error creating/checking index: {e}")
         return True # Proceed anyway
 
-def generate_embeddings(products):
+def load_model():
+    """Load the encoder used for product embeddings (ENCODER_BACKEND)"""
+    print(f"Loading embedding model ({ENCODER_BACKEND}, this may take a moment)...")
+    return load_encoder()
+
+def generate_embeddings(model, products):
     """Generate embeddings for products using sentence transformers"""
-    print("Loading embedding model (this may take a moment)...")
-    model = SentenceTransformer('all-MiniLM-L6-v2')
-    
-    print(f"Generating embeddings for {len(products)} products...")
-    
     # Create text representations for embedding
-    texts = []
-    for p in products:
-        # Combine title, description, category, and brand for rich semantic search
-        text = f"{p['title']}. {p['description']} Category: {p['category']}. Brand: {p.get('brand', '')}"
-        texts.append(text)
+    texts = [product_text(p) for p in products]
     
     # Generate embeddings in batches
-    embeddings = model.encode(texts, show_progress_bar=True, batch_size=32)
-    
-    return embeddings
-
-def insert_vectors(products, embeddings):
-    """Insert product vectors into Endee"""
-    print(f"Inserting {len(products)} vectors into Endee...")
-    
-    url = f"{ENDEE_BASE_URL}/index/{INDEX_NAME}/vector/insert"
-    
-    # Prepare vectors for insertion
-    vectors = []
-    for i, (product, embedding) in enumerate(zip(products, embeddings)):
-        # Prepare metadata and filter as JSON strings
-        meta_dict = {
-            "title": product['title'],
-            "description": product['description'],
-            "image": product.get('image', ''),
-            "brand": product.get('brand', ''),
-            "category": product['category']
-        }
-        
-        filter_dict = {
-            "price": float(product['price']),
-            "rating": float(product['rating']),
-            "stock": int(product['stock']),
-            "category": product['category']
-        }
-        
-        vector_data = {
-            "id": product['id'],
-            "vector": embedding.tolist(),
-            "meta": json.dumps(meta_dict),  # Serialize as JSON string
-            "filter": json.dumps(filter_dict)  # Serialize as JSON string
-        }
-        vectors.append(vector_data)
-    
-    # Insert in batches of 50
-    batch_size = 50
-    for i in range(0, len(vectors), batch_size):
-        batch = vectors[i:i+batch_size]
-        try:
-            response = requests.post(url, json=batch)
-            if response.status_code in [200, 201]:
-                print(f"  ✅ Inserted batch {i//batch_size + 1}/{(len(vectors)-1)//batch_size + 1}")
+    return model.encode(texts, batch_size=32)
+
+def write_dead_letter(batch_no, vectors, error):
+    """Append a failed insert batch to the dead-letter file so it can be inspected or replayed"""
+    with dead_letter_lock:
+        with open(DEAD_LETTER_PATH, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({
+                "batch": batch_no,
+                "error": str(error),
+                "failed_at": time.strftime('%Y-%m-%dT%H:%M:%S'),
+                "vectors": vectors
+            }) + '\n')
+
+def insert_batch(batch_no, vectors):
+    """Insert one batch (the client retries transient errors); returns (batch_no, ids, error)"""
+    ids = [vector['id'] for vector in vectors]
+    try:
+        endee_client.insert(vectors)
+        return batch_no, ids, None
+    except Exception as e:
+        write_dead_letter(batch_no, vectors, e)
+        return batch_no, ids, e
+
+def insert_vectors(products, model, batch_size=50, workers=4, store=None):
+    """
+    Embed and insert products into Endee as a streaming pipeline.
+    
+    The main thread encodes one batch at a time while up to `workers` insert
+    requests are in flight, so encoding overlaps with network round trips. At
+    most 2 * workers encoded batches exist at once, which keeps memory flat
+    regardless of catalog size. Embeddings are also written to `store` (an
+    EmbeddingStoreWriter) when given. Returns the ids of products that failed.
+    """
+    total = len(products)
+    num_batches = (total - 1) // batch_size + 1 if total else 0
+    print(f"Embedding and inserting {total} vectors into Endee "
+          f"({num_batches} batches of {batch_size}, {workers} workers)...")
+    
+    failed_ids = []
+    progress = {"done": 0, "batches": 0}
+    progress_lock = threading.Lock()
+    in_flight = threading.BoundedSemaphore(workers * 2)
+    started = time.perf_counter()
+    
+    def on_done(future):
+        in_flight.release()
+        batch_no, ids, error = future.result()
+        with progress_lock:
+            progress["batches"] += 1
+            if error is None:
+                progress["done"] += len(ids)
+                rate = progress["done"] / (time.perf_counter() - started)
+                print(f"  ✅ Inserted batch {batch_no}/{num_batches} "
+                      f"({progress['done']}/{total} vectors, {rate:.0f} vectors/s)")
             else:
-                print(f"  ⚠️  Batch {i//batch_size + 1} response: {response.text}")
-        except Exception as e:
-            print(f"  ❌ Error inserting batch {i//batch_size + 1}: {e}")
+                failed_ids.extend(ids)
+                print(f"  ❌ Batch {batch_no} failed, written to {DEAD_LETTER_PATH}: {error}")
+    
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='endee-insert') as executor:
+        for i in range(0, total, batch_size):
+            batch = products[i:i+batch_size]
+            embeddings = generate_embeddings(model, batch)
+            if store is not None:
+                store.write([product['id'] for product in batch], embeddings)
+            vectors = [vector_payload(product, embedding.tolist()) for product, embedding in zip(batch, embeddings)]
+            
+            # Block here when enough batches are queued, instead of buffering the whole catalog
+            in_flight.acquire()
+            executor.submit(insert_batch, i // batch_size + 1, vectors).add_done_callback(on_done)
+    
+    elapsed = time.perf_counter() - started
+    print(f"✅ Inserted {progress['done']}/{total} vectors in {elapsed:.1f}s "
+          f"({progress['done'] / elapsed if elapsed else 0:.0f} vectors/s)")
+    return failed_ids
+
+def update_payloads(products, manifest_entries):
+    """Push metadata/filter changes for products whose embedded text is unchanged; returns failed ids"""
+    print(f"Updating {len(products)} products without re-embedding...")
     
-    print("✅ All vectors inserted!")
+    # Filter-only changes (price, stock, ...) can be applied in place
+    filter_only, reinsert = [], []
+    for product in products:
+        if manifest_entries[product['id']]['meta'] == product_hashes(product)['meta']:
+            filter_only.append(product)
+        else:
+            reinsert.append(product)
+    
+    if filter_only:
+        try:
+            endee_client.update_filters([{"id": p['id'], "filter": json.dumps(product_filter(p))} for p in filter_only])
+            print(f"  ✅ Updated filters of {len(filter_only)} products")
+        except EndeeError as e:
+            print(f"  ⚠️  Filter update not available ({e}), re-inserting with stored vectors instead")
+            reinsert.extend(filter_only)
+    
+    # Anything else is re-inserted with the vector Endee already has, which
+    # avoids paying for a new embedding
+    failed_ids = []
+    for product in reinsert:
+        try:
+            record = endee_client.get_vector(product['id'])
+            if record is None:
+                failed_ids.append(product['id'])
+                continue
+            endee_client.insert([vector_payload(product, record.vector)])
+        except EndeeError as e:
+            print(f"  ❌ Error updating {product['id']}: {e}")
+            failed_ids.append(product['id'])
+    
+    return failed_ids
+
+def delete_vectors(product_ids):
+    """Delete vectors of products that left the catalog; returns failed ids"""
+    print(f"Deleting {len(product_ids)} removed products from Endee...")
+    failed_ids = []
+    for product_id in product_ids:
+        try:
+            endee_client.delete_vector(product_id)
+        except EndeeError as e:
+            print(f"  ❌ Error deleting {product_id}: {e}")
+            failed_ids.append(product_id)
+    return failed_ids
+
+def build_similar_products(top_n):
+    """Precompute the top-N most similar products of every product for /api/similar"""
+    print(f"\nPrecomputing {top_n} similar products per product...")
+    started = time.perf_counter()
+    ids, matrix = load_embeddings()
+    neighbors, scores = compute_neighbors(matrix, top_n=top_n)
+    save_neighbors(ids, neighbors, scores)
+    print(f"✅ Saved similar products of {len(ids)} products to {SIMILAR_PRODUCTS_PATH} "
+          f"in {time.perf_counter() - started:.1f}s")
 
 def verify_index():
     """Verify the index was created successfully"""
     print("\nVerifying index...")
     
-    url = f"{ENDEE_BASE_URL}/index/{INDEX_NAME}/info"
     try:
-        response = requests.get(url)
-        if response.status_code == 200:
-            info = response.json()
-            print(f"✅ Index verified!")
-            print(f"   Vectors: {info.get('vector_count', 'N/A')}")
-            print(f"   Dimensions: {info.get('dim', 'N/A')}")
-            return True
-        else:
-            print(f"⚠️  Could not verify: {response.text}")
-            return False
+        info = endee_client.info()
+        print(f"✅ Index verified!")
+        print(f"   Vectors: {info.get('vector_count', 'N/A')}")
+        print(f"   Dimensions: {info.get('dim', 'N/A')}")
+        return True
+    except EndeeError as e:
+        print(f"⚠️  Could not verify: {e}")
+        return False
     except Exception as e:
         print(f"❌ Error verifying: {e}")
         return False
 
 def main():
     """Main function to create embeddings and load into Endee"""
+    parser = argparse.ArgumentParser(description="Index products.json into Endee")
+    parser.add_argument('--full', action='store_true', help="re-embed and re-insert every product")
+    parser.add_argument('--batch-size', type=int, default=50, help="vectors per insert request")
+    parser.add_argument('--workers', type=int, default=4, help="concurrent insert requests")
+    parser.add_argument('--retries', type=int, default=2,
+                        help="retries per Endee request on connection errors, timeouts and 502/503/504")
+    parser.add_argument('--neighbors', type=int, default=20,
+                        help="similar products to precompute per product (0 to skip)")
+    args = parser.parse_args()
+    endee_client.max_retries = args.retries
+    
     print("🚀 Starting Endee Product Indexing...\n")
     
     # Load products
     products = load_products()
     print(f"Loaded {len(products)} products\n")
     
+    # Binary catalog the API loads at startup instead of parsing products.json
+    ProductCatalog(products).save(CATALOG_SNAPSHOT_PATH, source_path=PRODUCTS_PATH)
+    print(f"💾 Wrote catalog snapshot to {CATALOG_SNAPSHOT_PATH}\n")
+    
     # Create index
     if not create_index():
         print("Failed to create index. Exiting.")
         return
     
-    # Generate embeddings
-    embeddings = generate_embeddings(products)
-    print(f"Generated {len(embeddings)} embeddings\n")
+    # Work out what changed since the last run
+    manifest = load_manifest()
+    manifest_entries = manifest['products'] if manifest else {}
+    to_embed, to_update, to_delete = plan_changes(products, manifest_entries, full=args.full)
+    print(f"\n📋 {len(to_embed)} to embed, {len(to_update)} to update, "
+          f"{len(to_delete)} to delete, {len(products) - len(to_embed) - len(to_update)} unchanged\n")
+    
+    # Every product's embedding is also kept on disk for the similar-products
+    # table; products that aren't re-embedded reuse their row from the last run
+    try:
+        old_ids, old_matrix = load_embeddings()
+    except Exception as e:
+        print(f"⚠️  Ignoring unreadable embedding store: {e}")
+        old_ids, old_matrix = None, None
+    store = EmbeddingStoreWriter([p['id'] for p in products], dim=384)
+    embed_ids = {p['id'] for p in to_embed}
+    missing = set(store.copy_from(old_ids, old_matrix, [p['id'] for p in products if p['id'] not in embed_ids]))
+    old_matrix = None  # release the old file before it gets replaced
+    if missing:
+        print(f"ℹ️  {len(missing)} products have no stored embedding yet and will be re-embedded\n")
+        to_embed += [p for p in products if p['id'] in missing]
+        to_update = [p for p in to_update if p['id'] not in missing]
+    
+    failed_ids = set()
+    
+    if to_embed:
+        # Embed and insert vectors
+        model = load_model()
+        failed_ids.update(insert_vectors(to_embed, model, batch_size=args.batch_size,
+                                         workers=args.workers, store=store))
+    
+    if to_update:
+        failed_ids.update(update_payloads(to_update, manifest_entries))
+    
+    if to_delete:
+        failed_ids.update(delete_vectors(to_delete))
+    
+    # Only record what actually made it into Endee, so failures are retried next run
+    entries = dict(manifest_entries)
+    for product in products:
+        if product['id'] not in failed_ids:
+            entries[product['id']] = product_hashes(product)
+    for product_id in to_delete:
+        if product_id not in failed_ids:
+            entries.pop(product_id, None)
+    # The store goes first: if replacing it fails, the manifest must not
+    # claim these products are done, or their stale rows would be kept forever
+    store.commit()
+    save_manifest(entries)
+    
+    if args.neighbors > 0:
+        build_similar_products(args.neighbors)
     
-    # Insert vectors
-    insert_vectors(products, embeddings)
+    if failed_ids:
+        print(f"\n⚠️  {len(failed_ids)} products failed and will be retried on the next run")
     
     # Verify
     verify_index()
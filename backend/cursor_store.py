@@ -0,0 +1,116 @@
+import math
+import secrets
+import threading
+import time
+from array import array
+from collections import OrderedDict, namedtuple
+
+from lexical_index import HybridHit
+
+# Candidates retrieved for a paginated search, kept while the user pages through
+# them. Missing scores (e.g. lexical-only hits have no cosine score) are NaN.
+SearchSession = namedtuple('SearchSession', ['query', 'page_size', 'ids', 'scores', 'lexical_scores', 'created_at'])
+
+
+def score_array(values):
+    return array('f', (math.nan if value is None else value for value in values))
+
+
+def optional(value):
+    return None if math.isnan(value) else float(value)
+
+
+def new_session(query, page_size, hits):
+    return SearchSession(query, page_size, [hit.id for hit in hits],
+                         score_array(hit.score for hit in hits),
+                         score_array(getattr(hit, 'lexical_score', None) for hit in hits),
+                         time.time())
+
+
+def make_cursor(session_id, offset):
+    return f"{session_id}.{offset}"
+
+
+def parse_cursor(cursor):
+    """Return (session id, offset), or None for a malformed cursor"""
+    session_id, _, offset = str(cursor).rpartition('.')
+    if not session_id or not offset.isdigit():
+        return None
+    return session_id, int(offset)
+
+
+class CursorStore:
+    """
+    Bounded LRU store of paginated search sessions with a TTL.
+
+    The first page of a paginated search stores its whole candidate list
+    here; later pages are slices of it, so paging never touches the model or
+    Endee again. Scores are kept in compact float arrays, ids as references
+    to the catalog's strings. Sessions live in one process; behind a load
+    balancer use SharedCursorStore (result_cache.py) so any worker can serve
+    the next page.
+    """
+
+    def __init__(self, max_size=2000, ttl=600):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._sessions = OrderedDict()  # session id -> SearchSession
+        self._lock = threading.Lock()
+        self.created = 0
+        self.pages = 0
+        self.expired = 0
+        self.evictions = 0
+
+    def create(self, query, page_size, hits):
+        """Store the candidates of a new search; returns (session id, SearchSession)"""
+        session = new_session(query, page_size, hits)
+        return self.add(session), session
+
+    def add(self, session):
+        """Store a SearchSession under a new id and return the id"""
+        session_id = secrets.token_urlsafe(12)
+        with self._lock:
+            self._sessions[session_id] = session
+            self.created += 1
+            while len(self._sessions) > self.max_size:
+                self._sessions.popitem(last=False)
+                self.evictions += 1
+        return session_id
+
+    def get(self, session_id):
+        """Return the SearchSession, or None if it is unknown or has expired"""
+        now = time.time()
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            if self.ttl is not None and now - session.created_at > self.ttl:
+                del self._sessions[session_id]
+                self.expired += 1
+                return None
+            self._sessions.move_to_end(session_id)
+            self.pages += 1
+            return session
+
+    def page(self, session, offset):
+        """(hits on the page starting at offset, offset of the next page or None)"""
+        end = offset + session.page_size
+        hits = [HybridHit(optional(score), product_id, None, None, optional(lexical_score))
+                for product_id, score, lexical_score in zip(session.ids[offset:end], session.scores[offset:end],
+                                                            session.lexical_scores[offset:end])]
+        return hits, (end if end < len(session.ids) else None)
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "created": self.created,
+                "pages": self.pages,
+                "expired": self.expired,
+                "evictions": self.evictions
+            }
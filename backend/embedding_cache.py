@@ -0,0 +1,127 @@
+import os
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+import numpy as np
+
+
+def normalize_query(query):
+    """Normalize a search query so trivially different spellings share a cache key"""
+    # NFKC folds unicode compatibility forms (full-width letters, ligatures, etc.),
+    # casefold handles case, and split/join collapses all runs of whitespace
+    return ' '.join(unicodedata.normalize('NFKC', query).casefold().split())
+
+
+class EmbeddingCache:
+    """
+    Bounded LRU cache of query embeddings with an optional TTL.
+
+    Keys are normalized queries, values are float32 embedding arrays
+    (1.5 KB for a 384-dim model, against ~12 KB as a list). Entries older than
+    `ttl` seconds are treated as misses; when the cache is full the least
+    recently used entry is evicted.
+    """
+
+    def __init__(self, max_size=5000, ttl=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (created_at, embedding)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _expired(self, created_at, now):
+        return self.ttl is not None and now - created_at > self.ttl
+
+    def get(self, key):
+        """Return the cached embedding for `key`, or None on a miss"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            created_at, embedding = entry
+            if self._expired(created_at, now):
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return embedding
+
+    def put(self, key, embedding, created_at=None):
+        """Store an embedding, evicting the least recently used entries if full"""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            if created_at is None:
+                created_at = time.time()
+            self._entries[key] = (created_at, np.array(embedding, dtype=np.float32))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """Hit/miss/eviction counters for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+    def save(self, path):
+        """Persist live entries to disk (oldest first, so load() keeps LRU order)"""
+        now = time.time()
+        with self._lock:
+            entries = [
+                (key, created_at, embedding)
+                for key, (created_at, embedding) in self._entries.items()
+                if not self._expired(created_at, now)
+            ]
+        keys = [key for key, _, _ in entries]
+        # Per-process name, so workers saving to the same path don't clobber each other's file
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f,
+                     version=np.array(2),
+                     keys=np.array(keys, dtype=str),
+                     created_at=np.array([created_at for _, created_at, _ in entries], dtype=np.float64),
+                     embeddings=np.stack([embedding for _, _, embedding in entries]) if entries
+                     else np.zeros((0, 0), dtype=np.float32))
+        os.replace(tmp_path, path)
+        return len(entries)
+
+    def load(self, path):
+        """Load entries written by save(); expired entries are skipped"""
+        if not os.path.exists(path):
+            return 0
+        with np.load(path) as data:
+            keys, created_at, embeddings = data['keys'], data['created_at'], data['embeddings']
+        now = time.time()
+        loaded = 0
+        for key, created, embedding in zip(keys.tolist(), created_at.tolist(), embeddings):
+            if not self._expired(created, now):
+                self.put(key, embedding, created_at=created)
+                loaded += 1
+        return loaded
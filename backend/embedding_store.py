@@ -0,0 +1,66 @@
+import json
+import os
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+# Written by create_embeddings.py: one L2-normalized float32 row per product,
+# in the order of the ids file
+EMBEDDINGS_PATH = '../data/product_embeddings.npy'
+EMBEDDING_IDS_PATH = '../data/product_embedding_ids.json'
+
+
+def load_embeddings(embeddings_path=EMBEDDINGS_PATH, ids_path=EMBEDDING_IDS_PATH, mmap=True):
+    """Return (ids, matrix) for the stored product embeddings, or (None, None) if there are none"""
+    if not (os.path.exists(embeddings_path) and os.path.exists(ids_path)):
+        return None, None
+    with open(ids_path, 'r', encoding='utf-8') as f:
+        ids = json.load(f)
+    matrix = np.load(embeddings_path, mmap_mode='r' if mmap else None)
+    if matrix.shape[0] != len(ids):
+        raise ValueError(f"{embeddings_path} has {matrix.shape[0]} rows but {ids_path} has {len(ids)} ids")
+    return ids, matrix
+
+
+class EmbeddingStoreWriter:
+    """
+    Builds a new embedding store next to the old one and swaps it in on commit().
+
+    Rows are written straight into a memory-mapped file, so the full matrix
+    never has to be held in memory. Rows that are never written stay zero.
+    """
+
+    def __init__(self, ids, dim, embeddings_path=EMBEDDINGS_PATH, ids_path=EMBEDDING_IDS_PATH):
+        self.ids = list(ids)
+        self.row_of = {product_id: row for row, product_id in enumerate(self.ids)}
+        self.embeddings_path = embeddings_path
+        self.ids_path = ids_path
+        self._tmp_path = f"{embeddings_path}.tmp.npy"
+        self.matrix = open_memmap(self._tmp_path, mode='w+', dtype=np.float32, shape=(len(self.ids), dim))
+
+    def write(self, product_ids, vectors):
+        """Store L2-normalized copies of `vectors` at the rows of `product_ids`"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        rows = [self.row_of[product_id] for product_id in product_ids]
+        self.matrix[rows] = vectors / norms
+
+    def copy_from(self, old_ids, old_matrix, product_ids):
+        """Copy rows for `product_ids` from a previous store; returns the ids that weren't there"""
+        old_row_of = {product_id: row for row, product_id in enumerate(old_ids or [])}
+        missing = [product_id for product_id in product_ids if product_id not in old_row_of]
+        found = [product_id for product_id in product_ids if product_id in old_row_of]
+        if found:
+            self.matrix[[self.row_of[p] for p in found]] = old_matrix[[old_row_of[p] for p in found]]
+        return missing
+
+    def commit(self):
+        """Flush to disk and atomically replace the previous store"""
+        self.matrix.flush()
+        del self.matrix
+        os.replace(self._tmp_path, self.embeddings_path)
+        tmp_ids_path = f"{self.ids_path}.tmp"
+        with open(tmp_ids_path, 'w', encoding='utf-8') as f:
+            json.dump(self.ids, f)
+        os.replace(tmp_ids_path, self.ids_path)
@@ -0,0 +1,107 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+# Upper bounds of the batch size histogram buckets
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, float('inf'))
+
+
+class EncodeBatcher:
+    """
+    Coalesces concurrent single-text encode calls into batched model calls.
+
+    Callers block in encode() while a background thread collects requests for
+    up to `max_wait_ms` (or until `max_batch_size` are queued), runs one
+    batched encode, and hands each caller its own vector.
+    """
+
+    def __init__(self, encode_fn, max_batch_size=32, max_wait_ms=2.0):
+        self.encode_fn = encode_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+
+        self.batches = 0
+        self.items = 0
+        self.max_batch_seen = 0
+        self.batch_size_counts = {bucket: 0 for bucket in BATCH_SIZE_BUCKETS}
+        self.total_queue_wait = 0.0
+        self.max_queue_wait = 0.0
+
+        self._thread = threading.Thread(target=self._run, name='encode-batcher', daemon=True)
+        self._thread.start()
+
+    def submit(self, text):
+        """Queue one text for encoding and return a Future of its vector"""
+        future = Future()
+        self._queue.put((text, future, time.perf_counter()))
+        return future
+
+    def encode(self, text, timeout=None):
+        """Encode one text; blocks until its batch has been processed"""
+        return self.submit(text).result(timeout)
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            started = time.perf_counter()
+
+            # Identical concurrent queries only need to be encoded once
+            texts = list(dict.fromkeys(text for text, _, _ in batch))
+            try:
+                vectors = dict(zip(texts, self.encode_fn(texts)))
+            except Exception as e:
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+
+            for text, future, _ in batch:
+                future.set_result(vectors[text])
+            self._record(batch, started)
+
+    def _record(self, batch, started):
+        waits = [started - enqueued for _, _, enqueued in batch]
+        size = len(batch)
+        with self._lock:
+            self.batches += 1
+            self.items += size
+            self.max_batch_seen = max(self.max_batch_seen, size)
+            for bucket in BATCH_SIZE_BUCKETS:
+                if size <= bucket:
+                    self.batch_size_counts[bucket] += 1
+                    break
+            self.total_queue_wait += sum(waits)
+            self.max_queue_wait = max(self.max_queue_wait, max(waits))
+
+    def stats(self):
+        """Batch size and queue wait metrics"""
+        with self._lock:
+            return {
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000,
+                "batches": self.batches,
+                "items": self.items,
+                "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+                "max_batch_seen": self.max_batch_seen,
+                "batch_size_histogram": {
+                    f"le_{bucket:g}": count for bucket, count in self.batch_size_counts.items()
+                },
+                "avg_queue_wait_ms": round(self.total_queue_wait / self.items * 1000, 3) if self.items else 0.0,
+                "max_queue_wait_ms": round(self.max_queue_wait * 1000, 3),
+                "queued": self._queue.qsize()
+            }
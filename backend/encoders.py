@@ -0,0 +1,114 @@
+import os
+import threading
+
+import numpy as np
+
+MODEL_NAME = 'all-MiniLM-L6-v2'
+
+# "torch" (SentenceTransformer) or "onnx" (onnxruntime on CPU, see export_onnx.py)
+ENCODER_BACKEND = os.getenv('ENCODER_BACKEND', 'torch').lower()
+ONNX_MODEL_DIR = os.getenv('ONNX_MODEL_DIR', f'../models/{MODEL_NAME}-onnx')
+ONNX_MODEL_FILE = os.getenv('ONNX_MODEL_FILE', 'model_quantized.onnx')
+ONNX_THREADS = int(os.getenv('ONNX_THREADS', 0))  # 0 = let onnxruntime decide
+MAX_SEQ_LENGTH = 256  # same truncation as the SentenceTransformer model
+
+
+class OnnxEncoder:
+    """
+    Drop-in replacement for SentenceTransformer.encode() on an exported model.
+
+    Runs the transformer through onnxruntime, then applies the same mean
+    pooling and L2 normalization as the all-MiniLM-L6-v2 pipeline, so
+    torch doesn't have to be imported at all.
+    """
+
+    def __init__(self, model_dir=ONNX_MODEL_DIR, model_file=ONNX_MODEL_FILE, threads=ONNX_THREADS):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, 'tokenizer.json'))
+        self.tokenizer.enable_truncation(max_length=MAX_SEQ_LENGTH)
+        self.tokenizer.enable_padding(pad_id=0, pad_token='[PAD]')
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(
+            os.path.join(model_dir, model_file), options, providers=['CPUExecutionProvider'])
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+        self.model_path = os.path.join(model_dir, model_file)
+
+    def _encode_batch(self, texts):
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {
+            'input_ids': input_ids,
+            'attention_mask': attention_mask,
+            'token_type_ids': np.zeros_like(input_ids)
+        }
+        token_embeddings = self.session.run(None, {k: v for k, v in feeds.items() if k in self.input_names})[0]
+
+        # Mean pooling over real (non-padding) tokens, then L2 normalization
+        mask = attention_mask[:, :, None].astype(np.float32)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        return pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+
+    def encode(self, sentences, batch_size=32, **kwargs):
+        """Embed a string (1-D array) or a list of strings (2-D float32 array)"""
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if not texts:
+            return np.zeros((0, 384), dtype=np.float32)
+
+        # Batch texts of similar length together to keep padding short
+        order = np.argsort([-len(text) for text in texts], kind='stable')
+        sorted_texts = [texts[i] for i in order]
+        batches = [self._encode_batch(sorted_texts[i:i + batch_size]) for i in range(0, len(texts), batch_size)]
+        embeddings = np.empty((len(texts), batches[0].shape[1]), dtype=np.float32)
+        embeddings[order] = np.vstack(batches)
+        return embeddings[0] if single else embeddings
+
+
+class PendingEncoder:
+    """
+    Stand-in for an encoder that is loaded in the background.
+
+    encode() blocks until set() or fail() is called, so the server can start
+    accepting connections (and report "starting") while the model loads.
+    """
+
+    def __init__(self):
+        self._encoder = None
+        self._error = None
+        self._loaded = threading.Event()
+
+    @property
+    def ready(self):
+        return self._loaded.is_set() and self._error is None
+
+    def set(self, encoder):
+        self._encoder = encoder
+        self._loaded.set()
+
+    def fail(self, error):
+        self._error = error
+        self._loaded.set()
+
+    def encode(self, *args, **kwargs):
+        self._loaded.wait()
+        if self._error is not None:
+            raise RuntimeError(f"Embedding model failed to load: {self._error}")
+        return self._encoder.encode(*args, **kwargs)
+
+
+def load_encoder(backend=ENCODER_BACKEND):
+    """Load the query/product encoder for the configured backend"""
+    if backend == 'onnx':
+        return OnnxEncoder()
+    if backend != 'torch':
+        raise ValueError(f"Unknown ENCODER_BACKEND: {backend!r} (expected 'torch' or 'onnx')")
+    # Imported here so the ONNX backend never loads torch
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(MODEL_NAME)
@@ -0,0 +1,295 @@
+import asyncio
+import random
+import time
+from collections import namedtuple
+
+import msgpack
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+
+from catalog import canonical_category
+from metrics import REGISTRY, stage
+
+# One row of a search response: Endee returns [score, id, meta, filter, ...]
+SearchHit = namedtuple('SearchHit', ['score', 'id', 'meta', 'filter'])
+
+# vector/get returns [id, meta, filter, vector, ...]
+VectorRecord = namedtuple('VectorRecord', ['id', 'meta', 'filter', 'vector'])
+
+# Gateway-style statuses that are worth retrying on idempotent calls
+RETRY_STATUSES = (502, 503, 504)
+
+ENDEE_SECONDS = REGISTRY.histogram(
+    'endee_request_seconds', "Endee round trip per operation, including retries", ['operation'])
+ENDEE_ERRORS = REGISTRY.counter(
+    'endee_errors_total', "Failed Endee calls by operation and reason", ['operation', 'reason'])
+ENDEE_RETRIES = REGISTRY.counter(
+    'endee_retries_total', "Retried Endee calls by operation", ['operation'])
+
+
+def record_status(operation, status):
+    # 404 is an expected answer (unknown vector), not a failure
+    if status >= 400 and status != 404:
+        ENDEE_ERRORS.inc(operation=operation, reason=f"http_{status}")
+
+
+def unpack(content):
+    """Decode a MessagePack response body"""
+    try:
+        with stage('decode'):
+            return msgpack.unpackb(content, raw=False)
+    except Exception as e:
+        raise EndeeError(f"Failed to decode Endee response: {e}") from e
+
+
+def build_filter_conditions(filters, include_ranges=True):
+    """Translate API filters into an Endee filter list"""
+    conditions = []
+
+    # Only add category filter if specified and not "All"
+    if filters.get('category') and filters['category'] != 'All':
+        conditions.append({"category": {"$eq": canonical_category(filters['category'])}})
+
+    if include_ranges:
+        # price/rating are stored as numeric filter fields by create_embeddings.py
+        if 'min_price' in filters or 'max_price' in filters:
+            conditions.append({"price": {"$range": [
+                float(filters.get('min_price', 0)),
+                float(filters.get('max_price', 10000))
+            ]}})
+        if filters.get('min_rating'):
+            conditions.append({"rating": {"$range": [float(filters['min_rating']), 5.0]}})
+
+    return conditions
+
+
+def has_range(conditions):
+    """True if an Endee filter list uses $range"""
+    return any('$range' in ops for condition in conditions for ops in condition.values())
+
+
+def search_payload(vector, k, filter=None, include_vectors=False):
+    payload = {
+        # Query embeddings are float32 arrays until they go on the wire
+        "vector": vector.tolist() if isinstance(vector, np.ndarray) else vector,
+        "k": k,
+        "include_vectors": include_vectors
+    }
+    if filter:
+        payload["filter"] = filter
+    return payload
+
+
+def parse_search_rows(rows):
+    """Turn decoded search rows into SearchHit tuples"""
+    return [
+        SearchHit(row[0], row[1],
+                  row[2] if len(row) > 2 else None,
+                  row[3] if len(row) > 3 else None)
+        for row in rows
+        if isinstance(row, list) and len(row) >= 2
+    ]
+
+
+def parse_vector_row(row):
+    """Turn a decoded vector/get response into a VectorRecord"""
+    if not isinstance(row, list) or len(row) < 4:
+        raise EndeeError("Invalid vector/get response format")
+    return VectorRecord(row[0], row[1], row[2], row[3])
+
+
+def backoff_delay(backoff, attempt):
+    # Exponential backoff with a little jitter so retries don't line up
+    return backoff * (2 ** attempt) * (1 + random.random() * 0.5)
+
+
+class EndeeError(Exception):
+    """Raised when Endee can't be reached or returns an unusable response"""
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class EndeeClient:
+    """
+    Thin Endee HTTP client backed by a pooled keep-alive session.
+
+    All calls have connect/read timeouts. Idempotent calls (search, vector/get,
+    info, and upsert-style inserts) are retried with exponential backoff on
+    connection errors, timeouts and 502/503/504 responses.
+    """
+
+    def __init__(self, base_url, index_name, connect_timeout=2.0, read_timeout=10.0,
+                 max_retries=2, backoff=0.1, pool_size=20):
+        self.base_url = base_url.rstrip('/')
+        self.index_name = index_name
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def _index_url(self, path):
+        return f"{self.base_url}/index/{self.index_name}/{path}"
+
+    def _request(self, method, url, idempotent, operation='other', **kwargs):
+        attempts = 1 + (self.max_retries if idempotent else 0)
+        with ENDEE_SECONDS.time(operation=operation):
+            for attempt in range(attempts):
+                last_attempt = attempt == attempts - 1
+                try:
+                    response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    if last_attempt:
+                        ENDEE_ERRORS.inc(operation=operation, reason=type(e).__name__)
+                        raise EndeeError(f"Endee request to {url} failed: {e}") from e
+                else:
+                    if response.status_code not in RETRY_STATUSES or last_attempt:
+                        record_status(operation, response.status_code)
+                        return response
+                ENDEE_RETRIES.inc(operation=operation)
+                time.sleep(backoff_delay(self.backoff, attempt))
+
+    def search(self, vector, k, filter=None, include_vectors=False):
+        """Run a top-k search and return a list of SearchHit"""
+        payload = search_payload(vector, k, filter, include_vectors)
+        response = self._request('POST', self._index_url('search'), idempotent=True,
+                                 operation='search', json=payload)
+        if response.status_code != 200:
+            raise EndeeError(f"Endee search failed: {response.text}", response.status_code)
+        if not response.content.strip():
+            return []
+        return parse_search_rows(unpack(response.content))
+
+    def get_vector(self, vector_id):
+        """Fetch a stored vector, or None if Endee doesn't have it"""
+        response = self._request('POST', self._index_url('vector/get'), idempotent=True,
+                                 operation='vector_get', json={"id": vector_id})
+        if response.status_code != 200:
+            return None
+
+        return parse_vector_row(unpack(response.content))
+
+    def insert(self, vectors):
+        """Insert (upsert) a batch of vector dicts"""
+        # Inserts are keyed by id, so replaying a batch is safe to retry
+        response = self._request('POST', self._index_url('vector/insert'), idempotent=True,
+                                 operation='insert', json=vectors)
+        if response.status_code not in (200, 201):
+            raise EndeeError(f"Endee insert failed: {response.text}", response.status_code)
+
+    def update_filters(self, updates):
+        """Replace the filter fields of existing vectors: [{"id": ..., "filter": {...}}]"""
+        response = self._request('POST', self._index_url('filters/update'), idempotent=True,
+                                 operation='filters_update', json={"updates": updates})
+        if response.status_code not in (200, 201):
+            raise EndeeError(f"Endee filter update failed: {response.text}", response.status_code)
+
+    def delete_vector(self, vector_id):
+        """Delete a vector by id; returns False if Endee didn't have it"""
+        response = self._request('DELETE', self._index_url(f'vector/{vector_id}/delete'), idempotent=True,
+                                 operation='delete')
+        if response.status_code == 404:
+            return False
+        if response.status_code not in (200, 204):
+            raise EndeeError(f"Endee delete failed: {response.text}", response.status_code)
+        return True
+
+    def create_index(self, dim, space_type="cosine"):
+        """Create the index; returns False if it already exists"""
+        response = self._request('POST', f"{self.base_url}/index/create", idempotent=False,
+                                 operation='create_index', json={
+            "index_name": self.index_name,
+            "dim": dim,
+            "space_type": space_type
+        })
+        if response.status_code in (200, 201):
+            return True
+        if "already exists" in response.text.lower():
+            return False
+        raise EndeeError(f"Endee create index failed: {response.text}", response.status_code)
+
+    def info(self):
+        """Return index info (vector_count, dim, ...) as a dict"""
+        response = self._request('GET', self._index_url('info'), idempotent=True, operation='info')
+        if response.status_code != 200:
+            raise EndeeError(f"Endee info failed: {response.text}", response.status_code)
+        # Depending on the Endee build, info is served as JSON or MessagePack
+        try:
+            return response.json()
+        except ValueError:
+            return unpack(response.content)
+
+    def close(self):
+        self.session.close()
+
+
+class AsyncEndeeClient:
+    """
+    asyncio counterpart of EndeeClient for the read path (search and vector/get).
+
+    Uses one aiohttp session with a bounded keep-alive connection pool, so
+    thousands of in-flight requests share `pool_size` connections. Must be
+    created and used inside a running event loop.
+    """
+
+    def __init__(self, base_url, index_name, connect_timeout=2.0, read_timeout=10.0,
+                 max_retries=2, backoff=0.1, pool_size=100):
+        import aiohttp
+
+        self._aiohttp = aiohttp
+        self.base_url = base_url.rstrip('/')
+        self.index_name = index_name
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=pool_size, keepalive_timeout=30),
+            timeout=aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+        )
+
+    def _index_url(self, path):
+        return f"{self.base_url}/index/{self.index_name}/{path}"
+
+    async def _post(self, url, payload, operation):
+        """POST an idempotent request; returns (status, body bytes)"""
+        attempts = 1 + self.max_retries
+        with ENDEE_SECONDS.time(operation=operation):
+            for attempt in range(attempts):
+                last_attempt = attempt == attempts - 1
+                try:
+                    async with self.session.post(url, json=payload) as response:
+                        body = await response.read()
+                        if response.status not in RETRY_STATUSES or last_attempt:
+                            record_status(operation, response.status)
+                            return response.status, body
+                except (self._aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    if last_attempt:
+                        ENDEE_ERRORS.inc(operation=operation, reason=type(e).__name__)
+                        raise EndeeError(f"Endee request to {url} failed: {e!r}") from e
+                ENDEE_RETRIES.inc(operation=operation)
+                await asyncio.sleep(backoff_delay(self.backoff, attempt))
+
+    async def search(self, vector, k, filter=None, include_vectors=False):
+        """Run a top-k search and return a list of SearchHit"""
+        status, body = await self._post(self._index_url('search'),
+                                        search_payload(vector, k, filter, include_vectors), 'search')
+        if status != 200:
+            raise EndeeError(f"Endee search failed: {body.decode('utf-8', 'replace')}", status)
+        if not body.strip():
+            return []
+        return parse_search_rows(unpack(body))
+
+    async def get_vector(self, vector_id):
+        """Fetch a stored vector, or None if Endee doesn't have it"""
+        status, body = await self._post(self._index_url('vector/get'), {"id": vector_id}, 'vector_get')
+        if status != 200:
+            return None
+        return parse_vector_row(unpack(body))
+
+    async def close(self):
+        await self.session.close()
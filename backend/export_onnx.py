@@ -0,0 +1,70 @@
+"""
+Export all-MiniLM-L6-v2 for ENCODER_BACKEND=onnx.
+
+Writes model.onnx, an int8 dynamically quantized model_quantized.onnx and
+tokenizer.json to ONNX_MODEL_DIR. Needs torch (via sentence-transformers)
+and onnxruntime; the API itself only needs onnxruntime and tokenizers.
+Run benchmark_encoders.py afterwards to check parity and speed.
+"""
+import argparse
+import os
+
+from encoders import MODEL_NAME, ONNX_MODEL_DIR
+
+
+def export_model(model_dir, opset=14):
+    """Export the transformer of the SentenceTransformer model (pooling is done in OnnxEncoder)"""
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(MODEL_NAME, device='cpu')
+    transformer = model[0].auto_model.eval()
+    model.tokenizer.save_pretrained(model_dir)  # includes tokenizer.json
+
+    sample = model.tokenizer(["wireless noise cancelling headphones"], return_tensors='pt')
+    input_names = ['input_ids', 'attention_mask', 'token_type_ids']
+    dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in input_names + ['last_hidden_state']}
+
+    path = os.path.join(model_dir, 'model.onnx')
+    with torch.no_grad():
+        torch.onnx.export(
+            transformer,
+            tuple(sample[name] for name in input_names),
+            path,
+            input_names=input_names,
+            output_names=['last_hidden_state'],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset,
+            do_constant_folding=True
+        )
+    return path
+
+
+def quantize_model(path, quantized_path):
+    """int8 weights, activations quantized on the fly (no calibration data needed)"""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    quantize_dynamic(path, quantized_path, weight_type=QuantType.QInt8)
+    return quantized_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the embedding model to ONNX")
+    parser.add_argument('--output-dir', default=ONNX_MODEL_DIR)
+    parser.add_argument('--opset', type=int, default=14)
+    parser.add_argument('--no-quantize', action='store_true', help="Only write the fp32 model")
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    print(f"Exporting {MODEL_NAME} to {args.output_dir}...")
+    path = export_model(args.output_dir, args.opset)
+    print(f"✅ Wrote {path} ({os.path.getsize(path) / 1e6:.1f} MB)")
+
+    if not args.no_quantize:
+        quantized_path = quantize_model(path, os.path.join(args.output_dir, 'model_quantized.onnx'))
+        print(f"✅ Wrote {quantized_path} ({os.path.getsize(quantized_path) / 1e6:.1f} MB)")
+
+    print("\nNext: python benchmark_encoders.py, then run with ENCODER_BACKEND=onnx")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,84 +1,84 @@
-import json
-import random
-import os
-
-def fix_links():
-    """Replace broken via.placeholder links with real images based on verified keywords"""
-    input_file = '../data/products copy.json'
-    output_file = '../data/products.json'
-    
-    print(f"Reading from {input_file}...")
-    with open(input_file, 'r', encoding='utf-8') as f:
-        products = json.load(f)
-    
-    # Verified Unsplash ID Mapping
-    # Logic: More specific keywords first
-    KEYWORD_MAPPING = [
-        ('jeans', ['photo-1541099649105-f69ad21f3246', 'photo-1542272604-787c3835535d']),
-        ('hoodie', ['photo-1556821840-3a63f95609a7', 'photo-1620799140408-edc6dcb6d633']),
-        ('sweatshirt', ['photo-1556821840-3a63f95609a7']),
-        ('sneakers', ['photo-1542291026-7eec264c27ff', 'photo-1606107557195-0e29a4b5b4aa']),
-        ('shoes', ['photo-1542291026-7eec264c27ff', 'photo-1491553895911-0055eca6402d']),
-        ('watch', ['photo-1524592094714-0f0654e20314', 'photo-1523275335684-37898b6baf30']),
-        ('smartphone', ['photo-1511707171634-5f897ff02aa9', 'photo-1580910051074-3eb6948865c5']),
-        ('phone', ['photo-1511707171634-5f897ff02aa9']),
-        ('laptop', ['photo-1496181133206-80ce9b88a853', 'photo-1498050108023-c5249f4df085']),
-        ('camera', ['photo-1516035069371-29a1b244cc32', 'photo-1526170375885-4d8ecf77b99f']),
-        ('headphones', ['photo-15057404209c8-817ad96de55e', 'photo-1484704849700-f032a568e944']),
-        ('book', ['photo-1544947950-fa07a98d237f', 'photo-1512820790803-83ca734da794', 'photo-1495446815901-a7297e633e8d']),
-        ('lamp', ['photo-1534073828943-f801091bb18c', 'photo-1513506003901-1e6a229e2d15']),
-        ('plant', ['photo-1485955900006-10f4d324d411', 'photo-1611854779393-1b2da9d400fe']),
-        ('clock', ['photo-1509114397022-ed747cca3f65']),
-        ('dumbbell', ['photo-1517836357463-d25dfeac00ad', 'photo-1526506118085-60ce371444d1']),
-        ('rope', ['photo-1511886929837-354d827aae26']),
-        ('vase', ['photo-1513694203232-719a280e022f']),
-        ('cushion', ['photo-1586023492125-27b2c045efd7']),
-        ('rug', ['photo-1513161455079-7dc1de15ef3e'])
-    ]
-    
-    # Generic category fallbacks
-    CATEGORY_MAPPING = {
-        'Sports': ['photo-1517836357463-d25dfeac00ad', 'photo-1541534741688-6078c6bfb5c5', 'photo-1511886929837-354d827aae26'],
-        'Books': ['photo-1495446815901-a7297e633e8d', 'photo-1524995997946-a1c2e315a42f', 'photo-1512820790803-83ca734da794'],
-        'Home': ['photo-1513694203232-719a280e022f', 'photo-1505691723518-36a5ac3be353', 'photo-1586023492125-27b2c045efd7'],
-        'Fashion': ['photo-1483985988355-763728e1935b', 'photo-1539109132384-3615557de1ae', 'photo-1491553895911-0055eca6402d'],
-        'Electronics': ['photo-1498049794561-7780e7231661', 'photo-1550009158-9ebf69173e03', 'photo-1519389950473-47ba0277781c']
-    }
-
-    fixed_count = 0
-    for p in products:
-        img_url = p.get('image', '')
-        title = p.get('title', '').lower()
-        cat = p.get('category', 'Fashion')
-        
-        if 'via.placeholder.com' in img_url:
-            photo_id = None
-            
-            # 1. Keyword Matching (more specific)
-            for kw, ids in KEYWORD_MAPPING:
-                if kw in title:
-                    photo_id = random.choice(ids)
-                    break 
-            
-            # 2. Category Matching
-            if not photo_id:
-                if cat in CATEGORY_MAPPING:
-                    photo_id = random.choice(CATEGORY_MAPPING[cat])
-            
-            # 3. Final Fallback
-            if not photo_id:
-                photo_id = 'photo-1483985988355-763728e1935b' # Generic Fashion
-            
-            new_url = f"https://images.unsplash.com/{photo_id}?auto=format&fit=crop&w=800&q=80"
-            p['image'] = new_url
-            fixed_count += 1
-            
-    print(f"Refined {fixed_count} image links with high-accuracy verified IDs.")
-    
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(products, f, indent=2, ensure_ascii=False)
-    
-    print(f"Successfully saved {len(products)} products to {output_file}")
-
-if __name__ == "__main__":
-    fix_links()
+import json
+import random
+import os
+
+def fix_links():
+    """Replace broken via.placeholder links with real images based on verified keywords"""
+    input_file = '../data/products copy.json'
+    output_file = '../data/products.json'
+    
+    print(f"Reading from {input_file}...")
+    with open(input_file, 'r', encoding='utf-8') as f:
+        products = json.load(f)
+    
+    # Verified Unsplash ID Mapping
+    # Logic: More specific keywords first
+    KEYWORD_MAPPING = [
+        ('jeans', ['photo-1541099649105-f69ad21f3246', 'photo-1542272604-787c3835535d']),
+        ('hoodie', ['photo-1556821840-3a63f95609a7', 'photo-1620799140408-edc6dcb6d633']),
+        ('sweatshirt', ['photo-1556821840-3a63f95609a7']),
+        ('sneakers', ['photo-1542291026-7eec264c27ff', 'photo-1606107557195-0e29a4b5b4aa']),
+        ('shoes', ['photo-1542291026-7eec264c27ff', 'photo-1491553895911-0055eca6402d']),
+        ('watch', ['photo-1524592094714-0f0654e20314', 'photo-1523275335684-37898b6baf30']),
+        ('smartphone', ['photo-1511707171634-5f897ff02aa9', 'photo-1580910051074-3eb6948865c5']),
+        ('phone', ['photo-1511707171634-5f897ff02aa9']),
+        ('laptop', ['photo-1496181133206-80ce9b88a853', 'photo-1498050108023-c5249f4df085']),
+        ('camera', ['photo-1516035069371-29a1b244cc32', 'photo-1526170375885-4d8ecf77b99f']),
+        ('headphones', ['photo-15057404209c8-817ad96de55e', 'photo-1484704849700-f032a568e944']),
+        ('book', ['photo-1544947950-fa07a98d237f', 'photo-1512820790803-83ca734da794', 'photo-1495446815901-a7297e633e8d']),
+        ('lamp', ['photo-1534073828943-f801091bb18c', 'photo-1513506003901-1e6a229e2d15']),
+        ('plant', ['photo-1485955900006-10f4d324d411', 'photo-1611854779393-1b2da9d400fe']),
+        ('clock', ['photo-1509114397022-ed747cca3f65']),
+        ('dumbbell', ['photo-1517836357463-d25dfeac00ad', 'photo-1526506118085-60ce371444d1']),
+        ('rope', ['photo-1511886929837-354d827aae26']),
+        ('vase', ['photo-1513694203232-719a280e022f']),
+        ('cushion', ['photo-1586023492125-27b2c045efd7']),
+        ('rug', ['photo-1513161455079-7dc1de15ef3e'])
+    ]
+    
+    # Generic category fallbacks
+    CATEGORY_MAPPING = {
+        'Sports': ['photo-1517836357463-d25dfeac00ad', 'photo-1541534741688-6078c6bfb5c5', 'photo-1511886929837-354d827aae26'],
+        'Books': ['photo-1495446815901-a7297e633e8d', 'photo-1524995997946-a1c2e315a42f', 'photo-1512820790803-83ca734da794'],
+        'Home': ['photo-1513694203232-719a280e022f', 'photo-1505691723518-36a5ac3be353', 'photo-1586023492125-27b2c045efd7'],
+        'Fashion': ['photo-1483985988355-763728e1935b', 'photo-1539109132384-3615557de1ae', 'photo-1491553895911-0055eca6402d'],
+        'Electronics': ['photo-1498049794561-7780e7231661', 'photo-1550009158-9ebf69173e03', 'photo-1519389950473-47ba0277781c']
+    }
+
+    fixed_count = 0
+    for p in products:
+        img_url = p.get('image', '')
+        title = p.get('title', '').lower()
+        cat = p.get('category', 'Fashion')
+        
+        if 'via.placeholder.com' in img_url:
+            photo_id = None
+            
+            # 1. Keyword Matching (more specific)
+            for kw, ids in KEYWORD_MAPPING:
+                if kw in title:
+                    photo_id = random.choice(ids)
+                    break 
+            
+            # 2. Category Matching
+            if not photo_id:
+                if cat in CATEGORY_MAPPING:
+                    photo_id = random.choice(CATEGORY_MAPPING[cat])
+            
+            # 3. Final Fallback
+            if not photo_id:
+                photo_id = 'photo-1483985988355-763728e1935b' # Generic Fashion
+            
+            new_url = f"https://images.unsplash.com/{photo_id}?auto=format&fit=crop&w=800&q=80"
+            p['image'] = new_url
+            fixed_count += 1
+            
+    print(f"Refined {fixed_count} image links with high-accuracy verified IDs.")
+    
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(products, f, indent=2, ensure_ascii=False)
+    
+    print(f"Successfully saved {len(products)} products to {output_file}")
+
+if __name__ == "__main__":
+    fix_links()
@@ -0,0 +1,137 @@
+import math
+import re
+import unicodedata
+from collections import defaultdict, namedtuple
+
+import numpy as np
+
+# A search hit that may come from either index: score is the cosine similarity
+# (None if only the lexical index found it), lexical_score the BM25 score
+# relative to the best lexical match (None if it didn't match lexically)
+HybridHit = namedtuple('HybridHit', ['score', 'id', 'meta', 'filter', 'lexical_score'])
+
+TOKEN_PATTERN = re.compile(r"[^\W_]+")
+
+# Term frequency multiplier per field, so a title match outweighs a description match
+FIELD_WEIGHTS = (('title', 3.0), ('brand', 2.0), ('description', 1.0))
+
+
+def tokenize(text):
+    """Lowercased word and number tokens ("iPhone 9" -> ["iphone", "9"])"""
+    return TOKEN_PATTERN.findall(unicodedata.normalize('NFKC', text).casefold())
+
+
+def reciprocal_rank_fusion(vector_hits, lexical_hits, k, rrf_k=60):
+    """
+    Merge two rankings by reciprocal rank fusion and keep the top k.
+
+    Returns HybridHits carrying both scores, so cosine similarities and BM25
+    scores are never mixed up in one field.
+    """
+    fused = defaultdict(float)
+    for hits in (lexical_hits, vector_hits):
+        for rank, hit in enumerate(hits):
+            fused[hit.id] += 1.0 / (rrf_k + rank + 1)
+    vector_scores = {hit.id: hit.score for hit in vector_hits}
+    lexical_scores = {hit.id: hit.lexical_score for hit in lexical_hits}
+    ranked = sorted(fused, key=fused.get, reverse=True)[:k]
+    return [
+        HybridHit(vector_scores.get(product_id), product_id, None, None, lexical_scores.get(product_id))
+        for product_id in ranked
+    ]
+
+
+class LexicalIndex:
+    """
+    In-memory inverted index with BM25 scoring over the catalog's titles,
+    brands and descriptions.
+
+    Postings are per-term NumPy arrays of (row, weighted term frequency), so a
+    query is a few vectorized updates of one score array. A second index over
+    title and brand tokens only finds the products a query names exactly.
+    """
+
+    def __init__(self, catalog, k1=1.2, b=0.75):
+        self.catalog = catalog
+        postings = defaultdict(lambda: defaultdict(float))  # term -> row -> weighted tf
+        name_rows = defaultdict(set)  # term -> rows with the term in the title or brand
+        lengths = np.zeros(len(catalog), dtype=np.float32)
+
+        for row in range(len(catalog)):
+            fields = {
+                'title': tokenize(catalog.titles[row]),
+                'brand': tokenize(catalog.brands[catalog.brand_codes[row]]),
+                'description': tokenize(catalog.descriptions[row])
+            }
+            for field, weight in FIELD_WEIGHTS:
+                for token in fields[field]:
+                    postings[token][row] += weight
+                lengths[row] += weight * len(fields[field])
+            for token in fields['title'] + fields['brand']:
+                name_rows[token].add(row)
+
+        count = max(len(catalog), 1)
+        self.idf = {
+            term: math.log(1 + (count - len(rows) + 0.5) / (len(rows) + 0.5))
+            for term, rows in postings.items()
+        }
+        self.postings = {
+            term: (np.fromiter(rows.keys(), dtype=np.int64, count=len(rows)),
+                   np.fromiter(rows.values(), dtype=np.float32, count=len(rows)))
+            for term, rows in postings.items()
+        }
+        self.name_rows = {term: np.array(sorted(rows), dtype=np.int64) for term, rows in name_rows.items()}
+        self.k1 = k1
+        # Per-row BM25 length normalization, k1 * (1 - b + b * len / avg_len)
+        average = float(lengths.mean()) if len(lengths) and lengths.mean() > 0 else 1.0
+        self.length_norm = k1 * (1 - b + b * lengths / average)
+
+    def __len__(self):
+        return len(self.postings)
+
+    def scores(self, tokens):
+        """BM25 score of every catalog row for the given query tokens"""
+        scores = np.zeros(len(self.catalog), dtype=np.float32)
+        for token in set(tokens):
+            if token not in self.postings:
+                continue
+            rows, tf = self.postings[token]
+            scores[rows] += self.idf[token] * tf * (self.k1 + 1) / (tf + self.length_norm[rows])
+        return scores
+
+    def name_matches(self, query):
+        """Rows whose title or brand contains every query token (empty if a token is unknown)"""
+        tokens = set(tokenize(query))
+        if not tokens:
+            return np.zeros(0, dtype=np.int64)
+        rows = None
+        for token in tokens:
+            matches = self.name_rows.get(token)
+            if matches is None:
+                return np.zeros(0, dtype=np.int64)
+            rows = matches if rows is None else np.intersect1d(rows, matches, assume_unique=True)
+        return rows
+
+    def search(self, query, k, filters=None, rows=None):
+        """
+        Top-k HybridHits by BM25 among rows passing the filters (and among
+        `rows`, if given).
+
+        They have no cosine score; lexical_score is divided by the best score,
+        so the top hit scores 1.0.
+        """
+        scores = self.scores(tokenize(query))
+        # Always masked, even without filters: the mask's default price bounds
+        # are what the vector path applies too
+        scores[~self.catalog.mask(filters or {})] = 0
+        if rows is not None:
+            scores[np.setdiff1d(np.arange(len(scores)), rows, assume_unique=True)] = 0
+        rows = np.flatnonzero(scores > 0)
+        if k <= 0 or len(rows) == 0:
+            return []
+
+        if k < len(rows):
+            rows = rows[np.argpartition(-scores[rows], k - 1)[:k]]
+        rows = rows[np.argsort(-scores[rows], kind='stable')]
+        best = float(scores[rows[0]])
+        return [HybridHit(None, self.catalog.ids[row], None, None, float(scores[row]) / best) for row in rows]
@@ -0,0 +1,71 @@
+import os
+
+import numpy as np
+
+from embedding_store import load_embeddings
+from endee_client import SearchHit
+
+
+class LocalVectorIndex:
+    """
+    Exact cosine search over the embedding store written by create_embeddings.py.
+
+    The matrix is memory-mapped (except on Windows) and already L2-normalized
+    by the indexer, so a query costs one matrix-vector product plus an
+    argpartition. Category, price and rating filters are boolean masks
+    applied before ranking.
+    """
+
+    def __init__(self, ids, matrix, catalog):
+        self.ids = list(ids)
+        self.matrix = matrix
+        self.dim = matrix.shape[1]
+        self.catalog = catalog
+
+        # Catalog row of each matrix row, so filters reuse the catalog's columns
+        self.catalog_rows = catalog.rows(self.ids)
+        self.valid = self.catalog_rows >= 0  # has product data and a stored embedding
+        self.valid &= np.asarray(np.abs(matrix).sum(axis=1) > 0)
+
+    @classmethod
+    def load(cls, catalog):
+        """
+        Memory-map the embedding store, or return None if the indexer hasn't
+        written one.
+
+        On Windows the store is read into memory instead: a mapped file can't
+        be replaced, so the indexer's commit would fail while the API runs.
+        """
+        ids, matrix = load_embeddings(mmap=os.name != 'nt')
+        if ids is None:
+            return None
+        return cls(ids, matrix, catalog)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def mask(self, filters):
+        """Boolean mask of rows passing the category/price/rating filters"""
+        return self.valid & self.catalog.filter_rows(self.catalog_rows, filters)
+
+    def search(self, query_vector, k, filters=None):
+        """Top-k SearchHits by cosine similarity among rows passing the filters"""
+        query = np.asarray(query_vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm > 0:
+            query = query / norm
+
+        rows = np.flatnonzero(self.mask(filters or {}))
+        if k <= 0 or len(rows) == 0:
+            return []
+
+        # Only score the rows that survived the filters
+        scores = self.matrix[rows] @ query if len(rows) < len(self.ids) else self.matrix @ query
+
+        if k < len(rows):
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(rows))
+        top = top[np.argsort(-scores[top])]
+
+        return [SearchHit(float(scores[i]), self.ids[rows[i]], None, None) for i in top]
@@ -0,0 +1,38 @@
+import json
+
+
+class RawJSON(bytes):
+    """Already-serialized JSON that render_json() embeds as-is"""
+
+
+def dumps(value):
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def raw_list(items):
+    """Join pre-serialized JSON values into a JSON array"""
+    return RawJSON(b'[' + b','.join(items) + b']')
+
+
+def render_json(fields):
+    """
+    Serialize a dict into a JSON object, copying RawJSON values verbatim.
+
+    This lets responses be assembled from product payloads that were
+    serialized once at load time instead of re-encoding them per request.
+    """
+    return RawJSON(b'{' + b','.join(
+        dumps(key) + b':' + (value if isinstance(value, RawJSON) else dumps(value))
+        for key, value in fields.items()
+    ) + b'}')
+
+
+def with_score(score, payload, lexical_score=None):
+    """Prefix a pre-serialized product object with its similarity and BM25 scores, when known"""
+    # payload is b'{"id":...}', so splice the scores in after the opening brace
+    prefix = b'{'
+    if score is not None:
+        prefix += b'"score":' + dumps(score) + b','
+    if lexical_score is not None:
+        prefix += b'"lexical_score":' + dumps(lexical_score) + b','
+    return RawJSON(prefix + payload[1:])
@@ -0,0 +1,327 @@
+"""
+Cache of whole /api/search responses.
+
+Entries are keyed by the normalized query, k, canonicalized filters and the
+facets flag, and tagged with the version of the data they were computed
+from: a lookup with a different version is a miss, so a catalog reload or a
+re-index invalidates everything cached before it.
+
+ResultCache lives in one process. Run `python result_cache.py` and
+set RESULT_CACHE_ADDRESS in every API worker to share one cache between all
+workers of a node over a local socket (SharedResultCache). The same server
+keeps the sessions of paginated searches (SharedCursorStore), so a cursor
+works whichever worker the load balancer sends it to. Both sides must
+share a secret RESULT_CACHE_AUTHKEY: the manager protocol unpickles what the
+other side sends, so anyone holding the key can run code in the cache server
+and the workers.
+"""
+import argparse
+import json
+import logging
+import os
+import stat
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from multiprocessing.managers import BaseManager, RemoteError
+
+from catalog import canonical_category
+from cursor_store import CursorStore, new_session
+from embedding_cache import normalize_query
+
+logger = logging.getLogger('api.result_cache')
+
+# Deliberately no default: a key checked into the repo would authenticate anyone
+RESULT_CACHE_AUTHKEY = os.getenv('RESULT_CACHE_AUTHKEY', '')
+MIN_AUTHKEY_LENGTH = 16
+
+# Only reachable from this machine: a Unix socket, or a named pipe on Windows
+DEFAULT_RESULT_CACHE_ADDRESS = (
+    r'\\.\pipe\ecommerce-endee-result-cache' if os.name == 'nt'
+    else os.path.join(tempfile.gettempdir(), 'ecommerce-endee-result-cache.sock')
+)
+
+# Filter fields that compare as numbers, so 100 and 100.0 share an entry
+NUMERIC_FILTERS = ('min_price', 'max_price', 'min_rating')
+
+
+def canonical_filters(filters):
+    """Filters with defaults dropped and numbers normalized, as a stable JSON string"""
+    canonical = {}
+    for name, value in (filters or {}).items():
+        if value is None or value == '':
+            continue
+        if name == 'category' and value == 'All':
+            continue
+        if name in NUMERIC_FILTERS:
+            value = float(value)
+        elif name == 'category':
+            value = canonical_category(value)
+        canonical[name] = value
+    return json.dumps(canonical, sort_keys=True, separators=(',', ':'))
+
+
+def search_context(k, filters, facets=False):
+    """Everything besides the query text that determines a search response"""
+    return f"{k}\x1f{canonical_filters(filters)}\x1f{int(bool(facets))}"
+
+
+def result_cache_key(query, k, filters, facets=False):
+    return f"{normalize_query(query)}\x1f{search_context(k, filters, facets)}"
+
+
+def entry_size(fields):
+    """Approximate bytes held by a cached response (its pre-serialized results)"""
+    return sum(len(value) for value in fields.values() if isinstance(value, bytes)) + 256
+
+
+class ResultCache:
+    """
+    Bounded LRU cache of search responses with a TTL and a data version.
+
+    Values are the response fields other than "query" (results as RawJSON,
+    count, facets). The cache holds at most `max_size` entries and about
+    `max_bytes` of results; least recently used entries are evicted first.
+    """
+
+    def __init__(self, max_size=1000, max_bytes=64 * 1024 * 1024, ttl=300):
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (created_at, version, size, fields)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def _drop(self, key):
+        self._bytes -= self._entries.pop(key)[2]
+
+    def get(self, key, version):
+        """Return the cached fields for `key` at `version`, or None on a miss"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            created_at, entry_version, _, fields = entry
+            if entry_version != version:
+                self._drop(key)
+                self.invalidations += 1
+                self.misses += 1
+                return None
+            if self.ttl is not None and now - created_at > self.ttl:
+                self._drop(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return fields
+
+    def put(self, key, version, fields):
+        """Store a response, evicting least recently used entries to stay in bounds"""
+        size = entry_size(fields)
+        if self.max_size <= 0 or size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.time(), version, size, fields)
+            self._bytes += size
+            while len(self._entries) > self.max_size or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """Hit/miss/eviction counters for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+class CacheManager(BaseManager):
+    pass
+
+
+CacheManager.register('result_cache')
+CacheManager.register('cursor_store')
+
+
+def require_authkey(authkey):
+    """The shared cache's authkey as bytes; raises ValueError if it is unset or too short"""
+    if len(authkey) < MIN_AUTHKEY_LENGTH:
+        raise ValueError(f"RESULT_CACHE_AUTHKEY must be set to a secret of at least "
+                         f"{MIN_AUTHKEY_LENGTH} characters to use the shared result cache")
+    return authkey.encode('utf-8')
+
+
+def parse_address(address):
+    """'host:port' for TCP, anything else is a Unix socket path"""
+    host, sep, port = address.rpartition(':')
+    if sep and port.isdigit():
+        return (host or '127.0.0.1', int(port))
+    return address
+
+
+class SharedObject:
+    """
+    An object served by `python result_cache.py` under `name`, shared by
+    every worker that connects to the same address.
+
+    Falls back to the process-local `local` while the cache server can't be
+    reached, and reconnects on a later call.
+    """
+
+    RETRY_SECONDS = 5
+    name = None
+
+    def __init__(self, address, local, authkey=RESULT_CACHE_AUTHKEY):
+        self.address = parse_address(address)
+        self.authkey = require_authkey(authkey)
+        self.local = local
+        self._remote = None
+        self._next_attempt = 0.0
+        self._lock = threading.Lock()
+        self.label = self.name.replace('_', ' ')
+
+    def _cache(self):
+        if self._remote is not None:
+            return self._remote
+        now = time.monotonic()
+        with self._lock:
+            if self._remote is None and now >= self._next_attempt:
+                try:
+                    manager = CacheManager(address=self.address, authkey=self.authkey)
+                    manager.connect()
+                    self._remote = getattr(manager, self.name)()
+                    logger.info("Connected to the shared %s at %s", self.label, self.address)
+                except (OSError, EOFError, RemoteError) as e:
+                    # RemoteError: a cache server too old to serve `name`
+                    logger.warning("Shared %s unavailable (%s), using a local one", self.label, e)
+                    self._next_attempt = now + self.RETRY_SECONDS
+        return self._remote if self._remote is not None else self.local
+
+    def _call(self, method, *args):
+        cache = self._cache()
+        try:
+            return getattr(cache, method)(*args)
+        except (OSError, EOFError) as e:
+            if cache is self.local:
+                raise
+            logger.warning("Lost the shared %s (%s), using a local one", self.label, e)
+            self._remote = None
+            self._next_attempt = time.monotonic() + self.RETRY_SECONDS
+            return getattr(self.local, method)(*args)
+
+    def stats(self):
+        stats = self._call('stats')
+        stats["shared"] = self._remote is not None
+        return stats
+
+
+class SharedResultCache(SharedObject):
+    """ResultCache shared by the workers of a node"""
+
+    name = 'result_cache'
+
+    def get(self, key, version):
+        return self._call('get', key, version)
+
+    def put(self, key, version, fields):
+        self._call('put', key, version, fields)
+
+    def clear(self):
+        self._call('clear')
+
+
+class SharedCursorStore(SharedObject):
+    """
+    CursorStore shared by the workers of a node, so the next page of a
+    paginated search can be served by any of them.
+
+    Sessions are built in the worker and only their ids and scores cross the
+    socket. Sessions stored while the server was unreachable are only known
+    to that worker.
+    """
+
+    name = 'cursor_store'
+
+    def create(self, query, page_size, hits):
+        session = new_session(query, page_size, hits)
+        return self._call('add', session), session
+
+    def get(self, session_id):
+        return self._call('get', session_id)
+
+    def page(self, session, offset):
+        return self.local.page(session, offset)
+
+
+def serve(address, max_size, max_bytes, ttl, cursor_sessions=2000, cursor_ttl=600,
+          authkey=RESULT_CACHE_AUTHKEY):
+    """Serve one ResultCache and one CursorStore to API workers until interrupted"""
+    authkey = require_authkey(authkey)
+    address = parse_address(address)
+    socket_path = isinstance(address, str) and os.name != 'nt'
+    if socket_path and os.path.exists(address) and stat.S_ISSOCK(os.stat(address).st_mode):
+        os.remove(address)  # left behind by a previous server
+    if isinstance(address, tuple) and address[0] not in ('127.0.0.1', 'localhost', '::1'):
+        logger.warning("Serving the result cache on %s, which is reachable from other machines", address[0])
+
+    cache = ResultCache(max_size=max_size, max_bytes=max_bytes, ttl=ttl)
+    cursors = CursorStore(max_size=cursor_sessions, ttl=cursor_ttl)
+    CacheManager.register('result_cache', callable=lambda: cache)
+    CacheManager.register('cursor_store', callable=lambda: cursors)
+    manager = CacheManager(address=address, authkey=authkey)
+    server = manager.get_server()
+    if socket_path:
+        os.chmod(address, 0o600)  # only the user running the API workers
+    print(f"🗄️  Shared result cache listening on {address}")
+    server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared /api/search result cache and search cursors for the API workers of a node")
+    parser.add_argument('--address', default=os.getenv('RESULT_CACHE_ADDRESS') or DEFAULT_RESULT_CACHE_ADDRESS,
+                        help="a Unix socket path (named pipe on Windows), or host:port")
+    parser.add_argument('--size', type=int, default=int(os.getenv('RESULT_CACHE_SIZE', 1000)))
+    parser.add_argument('--max-mb', type=float, default=float(os.getenv('RESULT_CACHE_MAX_MB', 64)))
+    parser.add_argument('--ttl', type=float, default=float(os.getenv('RESULT_CACHE_TTL', 300)))
+    parser.add_argument('--cursor-sessions', type=int, default=int(os.getenv('SEARCH_CURSOR_SESSIONS', 2000)))
+    parser.add_argument('--cursor-ttl', type=float, default=float(os.getenv('SEARCH_CURSOR_TTL', 600)))
+    args = parser.parse_args()
+    try:
+        serve(args.address, args.size, int(args.max_mb * 1024 * 1024), args.ttl or None,
+              args.cursor_sessions, args.cursor_ttl or None)
+    except ValueError as e:
+        parser.exit(1, f"❌ {e}\n")
+
+
+if __name__ == "__main__":
+    main()
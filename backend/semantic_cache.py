@@ -0,0 +1,137 @@
+import threading
+import time
+
+import numpy as np
+
+# Best-match similarities are counted in these buckets, and the hit rate is
+# estimated at these thresholds, to help pick SEMANTIC_CACHE_THRESHOLD
+SIMILARITY_BUCKETS = [0.8, 0.85, 0.9, 0.92, 0.94, 0.96, 0.98, 0.99]
+
+
+class SemanticCache:
+    """
+    Search responses of recently answered queries, matched by embedding.
+
+    Query embeddings are kept L2-normalized in a fixed-size matrix used as a
+    ring buffer, so a lookup is one matrix-vector product. A new query is a
+    hit when a cached query with the same context (k, filters, facets) and
+    data version is within `threshold` cosine similarity and not older than
+    `ttl` seconds.
+
+    Rows are indexed by (context, version), so a lookup only scores the
+    entries it could hit, and it does so outside the lock.
+    """
+
+    def __init__(self, max_size=512, threshold=0.95, ttl=300):
+        self.max_size = max_size
+        self.threshold = threshold
+        self.ttl = ttl
+        self._matrix = None  # allocated on the first put, once the dimension is known
+        self._contexts = [None] * max_size
+        self._versions = [None] * max_size
+        self._created_at = np.zeros(max_size, dtype=np.float64)
+        self._fields = [None] * max_size
+        self._groups = {}  # (context, version) -> set of rows
+        self._next = 0
+        self._count = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.best_similarities = np.zeros(len(SIMILARITY_BUCKETS) + 1, dtype=np.int64)
+
+    @staticmethod
+    def _normalize(embedding):
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def get(self, embedding, context, version):
+        """Return (fields, similarity) of the closest cached query, or None on a miss"""
+        if self.max_size <= 0:
+            return None
+        query = self._normalize(embedding)
+        now = time.time()
+        with self._lock:
+            rows = self._groups.get((context, version))
+            candidates = np.fromiter(rows, dtype=np.int64, count=len(rows)) if rows else None
+            matrix = self._matrix
+
+        best = None
+        if candidates is not None:
+            if self.ttl is not None:
+                candidates = candidates[now - self._created_at[candidates] <= self.ttl]
+            if len(candidates):
+                scores = matrix[candidates] @ query
+                top = int(np.argmax(scores))
+                best = int(candidates[top])
+
+        with self._lock:
+            # The row may have been overwritten by a put since the snapshot
+            if best is None or self._contexts[best] != context or self._versions[best] != version:
+                self.misses += 1
+                return None
+            similarity = float(self._matrix[best] @ query)
+            self.best_similarities[np.searchsorted(SIMILARITY_BUCKETS, similarity, side='right')] += 1
+            if similarity < self.threshold:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return self._fields[best], similarity
+
+    def put(self, embedding, context, version, fields):
+        """Remember a query's response, overwriting the oldest entry when full"""
+        if self.max_size <= 0:
+            return
+        query = self._normalize(embedding)
+        with self._lock:
+            if self._matrix is None:
+                self._matrix = np.zeros((self.max_size, len(query)), dtype=np.float32)
+            row = self._next
+            if self._fields[row] is not None:
+                group = (self._contexts[row], self._versions[row])
+                self._groups[group].discard(row)
+                if not self._groups[group]:
+                    del self._groups[group]
+            self._groups.setdefault((context, version), set()).add(row)
+            self._matrix[row] = query
+            self._contexts[row] = context
+            self._versions[row] = version
+            self._created_at[row] = time.time()
+            self._fields[row] = fields
+            self._next = (row + 1) % self.max_size
+            self._count = min(self._count + 1, self.max_size)
+
+    def clear(self):
+        with self._lock:
+            self._fields = [None] * self.max_size
+            self._contexts = [None] * self.max_size
+            self._versions = [None] * self.max_size
+            self._groups = {}
+            self._next = 0
+            self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def stats(self):
+        """
+        Hit/miss counters, plus how often the best cached match reached each
+        similarity level, so the threshold can be tuned from live traffic.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            # Lookups whose best match was at least SIMILARITY_BUCKETS[i]
+            at_least = np.cumsum(self.best_similarities[::-1])[::-1][1:]
+            return {
+                "size": self._count,
+                "max_size": self.max_size,
+                "threshold": self.threshold,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "hit_rate_at_threshold": {
+                    str(edge): round(int(count) / lookups, 4) if lookups else 0.0
+                    for edge, count in zip(SIMILARITY_BUCKETS, at_least)
+                }
+            }
@@ -0,0 +1,89 @@
+import os
+
+import numpy as np
+
+# Written by create_embeddings.py, served by /api/similar/<id>
+SIMILAR_PRODUCTS_PATH = '../data/similar_products.npz'
+
+
+def compute_neighbors(matrix, top_n=20, block_size=1024):
+    """
+    Exact top-N cosine neighbours of every row of an L2-normalized matrix.
+
+    Returns (neighbors, scores) of shape (rows, top_n). Rows are processed in
+    blocks so the similarity matrix never exceeds block_size x rows. Missing
+    neighbours (tiny catalogs, all-zero rows) are marked with index -1.
+    """
+    matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+    n = matrix.shape[0]
+    top_n = min(top_n, max(n - 1, 0))
+    neighbors = np.full((n, top_n), -1, dtype=np.int32)
+    scores = np.zeros((n, top_n), dtype=np.float16)
+    if top_n == 0:
+        return neighbors, scores
+
+    # All-zero rows are products whose embedding failed; never return them
+    valid = np.linalg.norm(matrix, axis=1) > 0
+
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        sims = matrix[start:stop] @ matrix.T
+        sims[:, ~valid] = -np.inf
+        sims[np.arange(stop - start), np.arange(start, stop)] = -np.inf  # exclude self
+
+        top = np.argpartition(-sims, top_n - 1, axis=1)[:, :top_n]
+        top_sims = np.take_along_axis(sims, top, axis=1)
+        order = np.argsort(-top_sims, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        top_sims = np.take_along_axis(top_sims, order, axis=1)
+
+        found = np.isfinite(top_sims) & valid[start:stop, None]
+        neighbors[start:stop] = np.where(found, top, -1)
+        scores[start:stop] = np.where(found, top_sims, 0)
+
+    return neighbors, scores
+
+
+def save_neighbors(ids, neighbors, scores, path=SIMILAR_PRODUCTS_PATH):
+    tmp_path = f"{path}.tmp.npz"
+    np.savez(tmp_path, ids=np.array(ids), neighbors=neighbors, scores=scores)
+    os.replace(tmp_path, path)
+
+
+class NeighborTable:
+    """In-memory lookup of precomputed similar products"""
+
+    def __init__(self, ids, neighbors, scores):
+        self.ids = [str(product_id) for product_id in ids]
+        self.row_of = {product_id: row for row, product_id in enumerate(self.ids)}
+        self.neighbors = neighbors
+        self.scores = scores
+
+    @classmethod
+    def load(cls, path=SIMILAR_PRODUCTS_PATH):
+        """Load a table written by save_neighbors(), or None if there isn't one"""
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            return cls(data['ids'], data['neighbors'], data['scores'])
+
+    @property
+    def top_n(self):
+        return self.neighbors.shape[1]
+
+    def __len__(self):
+        return len(self.ids)
+
+    def get(self, product_id, k):
+        """
+        Return up to k (score, neighbour id) pairs, or None if the table can't
+        answer (unknown id or k larger than what was precomputed).
+        """
+        row = self.row_of.get(product_id)
+        if row is None or k > self.top_n:
+            return None
+        return [
+            (float(score), self.ids[neighbor])
+            for neighbor, score in zip(self.neighbors[row, :k], self.scores[row, :k])
+            if neighbor >= 0
+        ]
@@ -0,0 +1,138 @@
+import heapq
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+
+from embedding_cache import normalize_query
+
+# Prefixes up to this length match too many phrases to rank per request, so
+# their suggestions are precomputed
+PRECOMPUTED_PREFIX_LENGTH = 2
+
+
+class PrefixIndex:
+    """
+    Typeahead over a fixed set of phrases, ranked by popularity.
+
+    Every word start of every phrase is a key in one sorted array, so a prefix
+    lookup is two binary searches ("mascara" finds "Essence Mascara Lash
+    Princess"). Suggestions for short prefixes, which match most of the
+    array, are computed once at build time.
+    """
+
+    def __init__(self, phrases, limit=10):
+        """phrases: iterable of (text, type, popularity); the best of duplicate texts is kept"""
+        best = {}
+        for text, kind, popularity in phrases:
+            key = normalize_query(text)
+            if key and (key not in best or popularity > best[key][2]):
+                best[key] = (text, kind, popularity)
+        self.phrases = list(best.values())
+        self.limit = limit
+
+        keys = []
+        for number, (text, _, _) in enumerate(self.phrases):
+            words = normalize_query(text).split(' ')
+            for start in range(len(words)):
+                keys.append((' '.join(words[start:]), number))
+        keys.sort()
+        self.keys = [key for key, _ in keys]
+        self.numbers = [number for _, number in keys]
+
+        self.precomputed = {}
+        prefixes = {key[:length] for key in self.keys for length in range(1, PRECOMPUTED_PREFIX_LENGTH + 1)}
+        for prefix in prefixes:
+            self.precomputed[prefix] = self._rank(prefix, self.limit)
+
+    def __len__(self):
+        return len(self.phrases)
+
+    def _rank(self, prefix, limit):
+        lo = bisect_left(self.keys, prefix)
+        hi = bisect_left(self.keys, prefix + '\uffff', lo)
+        numbers = set(self.numbers[lo:hi])
+        return heapq.nlargest(limit, numbers, key=lambda number: (self.phrases[number][2], -number))
+
+    def suggest(self, prefix, limit=None):
+        """[(text, type, popularity)] of the most popular phrases with a word starting with prefix"""
+        prefix = normalize_query(prefix)
+        limit = self.limit if limit is None else min(limit, self.limit)
+        if not prefix:
+            return []
+        numbers = self.precomputed.get(prefix)
+        if numbers is None:
+            numbers = [] if len(prefix) <= PRECOMPUTED_PREFIX_LENGTH else self._rank(prefix, limit)
+        return [self.phrases[number] for number in numbers[:limit]]
+
+
+def catalog_phrases(catalog):
+    """Product titles ranked by rating, brands and categories by product count"""
+    for row in range(len(catalog)):
+        yield catalog.titles[row], 'product', float(catalog.rating[row])
+    brand_counts = Counter(int(code) for code in catalog.brand_codes)
+    for code, count in brand_counts.items():
+        if catalog.brands[code]:
+            yield catalog.brands[code], 'brand', float(count)
+    for category, count in zip(catalog.categories, catalog.category_counts):
+        yield category, 'category', float(count)
+
+
+class QueryLog:
+    """
+    Search queries that returned results, offered as suggestions once
+    `min_count` distinct clients have searched them.
+
+    Queries come straight from users, so popularity is the number of clients
+    rather than of searches: one client repeating a phrase can't push it into
+    everyone's typeahead. At most `max_clients` clients are remembered per
+    query, which is all the ranking needs.
+
+    The PrefixIndex over the popular queries is rebuilt lazily, at most every
+    `rebuild_interval` seconds, so lookups never pay for it.
+    """
+
+    def __init__(self, max_queries=5000, min_count=5, rebuild_interval=60, max_clients=100):
+        self.max_queries = max_queries
+        self.min_count = min_count
+        self.rebuild_interval = rebuild_interval
+        self.max_clients = max_clients
+        self.clients = {}  # normalized query -> set of client hashes
+        self._index = None
+        self._built_at = 0.0
+        self._rebuilding = False
+        self._lock = threading.Lock()
+
+    def record(self, query, client, results):
+        """Count `client` (e.g. its address) as a searcher of `query` if it returned any results"""
+        key = normalize_query(query)
+        if not key or not results or self.max_queries <= 0:
+            return
+        with self._lock:
+            clients = self.clients.setdefault(key, set())
+            if len(clients) < self.max_clients:
+                clients.add(hash(client))
+            # Keep memory bounded: drop the long tail once the log doubles
+            if len(self.clients) > 2 * self.max_queries:
+                self.clients = dict(self._most_popular())
+
+    def _most_popular(self):
+        return heapq.nlargest(self.max_queries, self.clients.items(), key=lambda item: len(item[1]))
+
+    def index(self):
+        """The current PrefixIndex of popular queries, starting a rebuild if it's stale"""
+        now = time.monotonic()
+        if now - self._built_at >= self.rebuild_interval and not self._rebuilding:
+            self._rebuilding = True
+            self._built_at = now
+            threading.Thread(target=self._rebuild, name='suggest-rebuild', daemon=True).start()
+        return self._index
+
+    def _rebuild(self):
+        try:
+            with self._lock:
+                popular = [(query, len(clients)) for query, clients in self._most_popular()
+                           if len(clients) >= self.min_count]
+            self._index = PrefixIndex((query, 'query', float(count)) for query, count in popular)
+        finally:
+            self._rebuilding = False
@@ -0,0 +1,86 @@
+import hashlib
+import importlib
+import os
+import sys
+import threading
+from http.server import ThreadingHTTPServer
+
+import numpy as np
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# The API and the indexer resolve ../data paths relative to backend/, where they are run from
+os.chdir(BACKEND_DIR)
+
+import encoders  # noqa: E402
+from mock_endee import DATA_DIR, MockIndex, make_handler, seed_index  # noqa: E402
+
+# Scripts that talk to a running Endee or API server as soon as they are
+# imported; run them by hand instead
+collect_ignore = [
+    'loadtest.py',
+    'test_backend.py',
+    'test_endee.py',
+    'test_endee2.py',
+    'test_fields.py',
+    'test_info.py',
+    'test_insert.py',
+    'test_metadata.py',
+    'test_msgpack.py',
+    'test_structure.py',
+    'test_vector_get.py',
+]
+
+DIM = 384
+INDEX_NAME = 'ecommerce_products'
+
+
+class StubEncoder:
+    """Deterministic pseudo-embeddings seeded by a hash of the text"""
+
+    def encode(self, sentences, batch_size=32, **kwargs):
+        texts = [sentences] if isinstance(sentences, str) else list(sentences)
+        vectors = np.stack([self._vector(text) for text in texts])
+        return vectors[0] if isinstance(sentences, str) else vectors
+
+    @staticmethod
+    def _vector(text):
+        seed = int(hashlib.md5(text.encode('utf-8')).hexdigest()[:8], 16)
+        vector = np.random.default_rng(seed).standard_normal(DIM).astype(np.float32)
+        return vector / np.linalg.norm(vector)
+
+
+def assert_product(result):
+    assert set(result) >= {'id', 'meta', 'filter'}
+    assert set(result['meta']) >= {'title', 'description', 'image', 'brand', 'category'}
+    assert set(result['filter']) >= {'price', 'rating', 'stock', 'category'}
+
+
+@pytest.fixture(scope='session')
+def api():
+    """The app module, talking to an in-process mock_endee.py and encoding with StubEncoder"""
+    index = MockIndex(DIM)
+    seed_index(index, f"{DATA_DIR}/products.json", seed_vectors=False)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler({INDEX_NAME: index}, DIM, 0, 0))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setenv('ENDEE_BASE_URL', f"http://127.0.0.1:{server.server_address[1]}/api/v1")
+        patch.setenv('CATALOG_WATCH_INTERVAL', '0')
+        patch.setenv('EMBEDDING_CACHE_PATH', '')
+        patch.setenv('RESULT_CACHE_ADDRESS', '')
+        patch.setattr(encoders, 'load_encoder', lambda *args, **kwargs: StubEncoder())
+        module = importlib.import_module('app')
+    yield module
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(api):
+    api.result_cache.clear()
+    api.semantic_cache.clear()
+    return api.app.test_client()
@@ -0,0 +1,240 @@
+"""
+Load test for the Discovery API.
+
+Drives /api/search, /api/similar/<id> and /api/product/<id> with a weighted
+mix of requests at a fixed concurrency, optionally capped at a target QPS,
+and reports throughput and p50/p95/p99 latency per endpoint. Pair it with
+mock_endee.py to run without a real Endee:
+
+    python mock_endee.py --latency-ms 2
+    python ../app.py
+    python loadtest.py --concurrency 32 --duration 30 --qps 200
+
+Exits non-zero when --max-p95-ms or --max-error-rate is exceeded, so it can
+gate a deploy.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+
+import numpy as np
+import requests
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'data')
+
+DEFAULT_QUERIES = [
+    "cozy winter sweater",
+    "wireless headphones",
+    "running shoes",
+    "gift for a coffee lover",
+    "waterproof hiking backpack",
+    "red lipstick",
+    "minimalist desk lamp",
+    "smartphone with a good camera",
+    "leather wallet for men",
+    "summer dress",
+    "kitchen knife set",
+    "smart watch"
+]
+CATEGORIES = ["All", "Electronics", "Fashion", "Home", "Sports", "Books", "beauty"]
+
+
+class Scheduler:
+    """Hands out request start times: as fast as possible, or evenly spaced at a target QPS"""
+
+    def __init__(self, qps, deadline):
+        self.interval = 1.0 / qps if qps > 0 else 0.0
+        self.deadline = deadline
+        self.next_at = time.perf_counter()
+        self.lock = threading.Lock()
+
+    def wait_turn(self):
+        """Sleep until this worker's next slot; False once the test is over"""
+        if not self.interval:
+            return time.perf_counter() < self.deadline
+        with self.lock:
+            slot = self.next_at
+            self.next_at += self.interval
+        if slot >= self.deadline:
+            return False
+        delay = slot - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        return True
+
+
+class Results:
+    def __init__(self):
+        self.latencies = defaultdict(list)  # endpoint -> seconds
+        self.errors = defaultdict(int)
+        self.statuses = defaultdict(int)
+        self.lock = threading.Lock()
+
+    def record(self, endpoint, seconds, status, ok):
+        with self.lock:
+            self.latencies[endpoint].append(seconds)
+            self.statuses[f"{endpoint} {status}"] += 1
+            if not ok:
+                self.errors[endpoint] += 1
+
+
+def make_request(session, base_url, endpoint, args, product_ids):
+    if endpoint == 'search':
+        body = {"query": random.choice(args.queries), "k": args.k}
+        if random.random() < args.filter_ratio:
+            body["filters"] = {
+                "category": random.choice(CATEGORIES),
+                "min_price": 0,
+                "max_price": random.choice([50, 200, 1000]),
+                "min_rating": random.choice([0, 3, 4])
+            }
+        if args.facets:
+            body["facets"] = True
+        return session.post(f"{base_url}/search", json=body, timeout=args.timeout)
+    if endpoint == 'similar':
+        return session.get(f"{base_url}/similar/{random.choice(product_ids)}",
+                           params={"k": 5}, timeout=args.timeout)
+    return session.get(f"{base_url}/product/{random.choice(product_ids)}", timeout=args.timeout)
+
+
+def worker(base_url, mix, args, product_ids, scheduler, results):
+    session = requests.Session()  # keep-alive per worker, like a real client pool
+    endpoints, weights = zip(*mix.items())
+    while scheduler.wait_turn():
+        endpoint = random.choices(endpoints, weights)[0]
+        started = time.perf_counter()
+        try:
+            response = make_request(session, base_url, endpoint, args, product_ids)
+            # 404 is a valid answer for /similar of a product without a vector
+            ok = response.status_code == 200 or (endpoint == 'similar' and response.status_code == 404)
+            status = response.status_code
+        except requests.RequestException as e:
+            ok, status = False, type(e).__name__
+        results.record(endpoint, time.perf_counter() - started, status, ok)
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        if name not in ('search', 'similar', 'product'):
+            raise argparse.ArgumentTypeError(f"Unknown endpoint in mix: {name}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def wait_until_ready(base_url, timeout):
+    """Wait for /api/health to report ready (it returns 503 while the model warms up)"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if requests.get(f"{base_url}/health", timeout=2).status_code == 200:
+                return True
+        except requests.RequestException:
+            pass
+        time.sleep(1)
+    return False
+
+
+def summarize(results, elapsed):
+    rows = {}
+    everything = []
+    for endpoint, latencies in sorted(results.latencies.items()):
+        everything.extend(latencies)
+        rows[endpoint] = latencies
+    rows['total'] = everything
+
+    summary = {}
+    for name, latencies in rows.items():
+        ms = np.array(latencies) * 1000 if latencies else np.zeros(1)
+        errors = sum(results.errors.values()) if name == 'total' else results.errors[name]
+        summary[name] = {
+            "requests": len(latencies),
+            "errors": errors,
+            "error_rate": errors / len(latencies) if latencies else 0.0,
+            "rps": len(latencies) / elapsed if elapsed else 0.0,
+            "p50_ms": float(np.percentile(ms, 50)),
+            "p95_ms": float(np.percentile(ms, 95)),
+            "p99_ms": float(np.percentile(ms, 99)),
+            "max_ms": float(ms.max())
+        }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the Discovery API")
+    parser.add_argument('--base-url', default='http://localhost:5000/api')
+    parser.add_argument('--concurrency', type=int, default=16, help="concurrent client threads")
+    parser.add_argument('--duration', type=float, default=30, help="seconds to run")
+    parser.add_argument('--qps', type=float, default=0, help="target requests/second (0 = as fast as possible)")
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix('search=70,similar=20,product=10'),
+                        help="endpoint weights, e.g. search=70,similar=20,product=10")
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--filter-ratio', type=float, default=0.3, help="share of searches with filters")
+    parser.add_argument('--facets', action='store_true', help="request facets with every search")
+    parser.add_argument('--queries-file', help="one query per line (default: a built-in list)")
+    parser.add_argument('--products', default=os.path.join(DATA_DIR, 'products.json'))
+    parser.add_argument('--timeout', type=float, default=10)
+    parser.add_argument('--output', help="also write the summary as JSON to this file")
+    parser.add_argument('--max-p95-ms', type=float, help="fail if the overall p95 is above this")
+    parser.add_argument('--max-error-rate', type=float, default=0.01, help="fail if more requests fail")
+    args = parser.parse_args()
+
+    args.queries = DEFAULT_QUERIES
+    if args.queries_file:
+        with open(args.queries_file, 'r', encoding='utf-8') as f:
+            args.queries = [line.strip() for line in f if line.strip()]
+    with open(args.products, 'r', encoding='utf-8') as f:
+        product_ids = [p['id'] for p in json.load(f)]
+
+    print(f"Waiting for {args.base_url} to be ready...")
+    if not wait_until_ready(args.base_url, timeout=120):
+        print("❌ API did not become ready")
+        sys.exit(1)
+
+    qps = f"{args.qps:g} QPS" if args.qps else "max QPS"
+    print(f"🚀 {args.concurrency} workers, {args.duration:g}s, {qps}, mix {args.mix}\n")
+
+    results = Results()
+    started = time.perf_counter()
+    scheduler = Scheduler(args.qps, started + args.duration)
+    threads = [
+        threading.Thread(target=worker, args=(args.base_url, args.mix, args, product_ids, scheduler, results))
+        for _ in range(args.concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    summary = summarize(results, elapsed)
+    print(f"{'endpoint':<10}{'requests':>10}{'errors':>8}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for name, row in summary.items():
+        print(f"{name:<10}{row['requests']:>10}{row['errors']:>8}{row['rps']:>9.1f}"
+              f"{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}{row['p99_ms']:>9.1f}{row['max_ms']:>9.1f}")
+    print(f"\nStatus codes: {dict(sorted(results.statuses.items()))}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({"args": {k: v for k, v in vars(args).items() if k != 'queries'},
+                       "elapsed_s": elapsed, "summary": summary}, f, indent=2)
+
+    total = summary['total']
+    failed = False
+    if total['error_rate'] > args.max_error_rate:
+        print(f"❌ Error rate {total['error_rate']:.2%} is above {args.max_error_rate:.2%}")
+        failed = True
+    if args.max_p95_ms is not None and total['p95_ms'] > args.max_p95_ms:
+        print(f"❌ p95 {total['p95_ms']:.1f} ms is above {args.max_p95_ms:g} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,273 @@
+"""
+Local stand-in for the Endee server, for load tests and offline development.
+
+Speaks the same HTTP API and MessagePack response shapes as Endee:
+search returns [score, id, meta, filter, norm] rows and vector/get returns
+[id, meta, filter, vector]. Search is exact cosine over an in-memory NumPy
+matrix with $eq / $range filters.
+
+The index starts out seeded from the embedding store written by
+create_embeddings.py (data/product_embeddings.npy), or with deterministic
+random vectors for every product in products.json if there is none. Inserts,
+filter updates and deletes work too, so the indexer can be pointed at it.
+
+    python mock_endee.py --port 8080 --latency-ms 2
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import msgpack
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(os.path.dirname(BACKEND_DIR), 'data')
+sys.path.insert(0, BACKEND_DIR)
+
+from create_embeddings import product_filter, product_meta  # noqa: E402
+
+
+class MockIndex:
+    """Vectors, meta and filters of one index, searchable with NumPy"""
+
+    def __init__(self, dim):
+        self.dim = dim
+        self.records = {}  # id -> (meta, filter json, vector)
+        self.lock = threading.Lock()
+        self._snapshot = None  # (ids, matrix, filters) rebuilt after writes
+
+    def upsert(self, vector_id, meta, filter_json, vector):
+        with self.lock:
+            self.records[vector_id] = (meta, filter_json, np.asarray(vector, dtype=np.float32))
+            self._snapshot = None
+
+    def update_filter(self, vector_id, filter_json):
+        with self.lock:
+            if vector_id not in self.records:
+                return False
+            meta, _, vector = self.records[vector_id]
+            self.records[vector_id] = (meta, filter_json, vector)
+            self._snapshot = None
+            return True
+
+    def delete(self, vector_id):
+        with self.lock:
+            self._snapshot = None
+            return self.records.pop(vector_id, None) is not None
+
+    def get(self, vector_id):
+        with self.lock:
+            return self.records.get(vector_id)
+
+    def snapshot(self):
+        with self.lock:
+            if self._snapshot is None:
+                ids = list(self.records)
+                matrix = np.zeros((len(ids), self.dim), dtype=np.float32)
+                filters = []
+                for row, vector_id in enumerate(ids):
+                    _, filter_json, vector = self.records[vector_id]
+                    norm = np.linalg.norm(vector)
+                    matrix[row] = vector / norm if norm > 0 else vector
+                    filters.append(json.loads(filter_json) if filter_json else {})
+
+                # One column per filter field: raw values for $eq, floats (NaN if missing) for $range
+                fields = {field for f in filters for field in f}
+                columns = {}
+                for field in fields:
+                    values = np.empty(len(ids), dtype=object)
+                    values[:] = [f.get(field) for f in filters]
+                    numbers = np.array([v if isinstance(v, (int, float)) else np.nan for v in values], dtype=np.float64)
+                    columns[field] = (values, numbers)
+                self._snapshot = (ids, matrix, columns)
+            return self._snapshot
+
+    def search(self, vector, k, conditions):
+        ids, matrix, columns = self.snapshot()
+        if not ids:
+            return []
+        query = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm > 0:
+            query = query / norm
+
+        mask = np.ones(len(ids), dtype=bool)
+        for condition in conditions or []:
+            for field, ops in condition.items():
+                if field not in columns:
+                    return []
+                values, numbers = columns[field]
+                for op, value in ops.items():
+                    if op == '$eq':
+                        mask &= values == value
+                    elif op == '$range':
+                        lo, hi = value
+                        mask &= (numbers >= lo) & (numbers <= hi)
+                    else:
+                        raise ValueError(f"Unsupported filter operator {op}")
+
+        rows = np.flatnonzero(mask)
+        scores = matrix[rows] @ query
+        top = np.argpartition(-scores, k - 1)[:k] if 0 < k < len(rows) else np.arange(len(rows))
+        top = top[np.argsort(-scores[top])][:k]
+        return [(float(scores[i]), ids[rows[i]]) for i in top]
+
+
+def seed_index(index, products_path, seed_vectors):
+    """Fill the index with the catalog, using stored embeddings when available"""
+    with open(products_path, 'r', encoding='utf-8') as f:
+        products = json.load(f)
+
+    vectors = {}
+    ids_path = os.path.join(DATA_DIR, 'product_embedding_ids.json')
+    matrix_path = os.path.join(DATA_DIR, 'product_embeddings.npy')
+    if seed_vectors and os.path.exists(ids_path) and os.path.exists(matrix_path):
+        with open(ids_path, 'r', encoding='utf-8') as f:
+            ids = json.load(f)
+        matrix = np.load(matrix_path)
+        vectors = dict(zip(ids, matrix))
+
+    for product in products:
+        vector = vectors.get(product['id'])
+        if vector is None:
+            seed = int(hashlib.md5(product['id'].encode('utf-8')).hexdigest()[:8], 16)
+            vector = np.random.default_rng(seed).standard_normal(index.dim)
+        index.upsert(product['id'], json.dumps(product_meta(product)), json.dumps(product_filter(product)), vector)
+    return len(products), len(vectors)
+
+
+def make_handler(indexes, dim, latency_ms, jitter_ms):
+    index_path = re.compile(r'^/api/v1/index/([^/]+)/(.+)$')
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # keep-alive, like the real server
+
+        def log_message(self, *args):
+            pass
+
+        def send(self, status, body, content_type='application/msgpack'):
+            if latency_ms or jitter_ms:
+                time.sleep((latency_ms + np.random.random() * jitter_ms) / 1000)
+            if content_type == 'application/msgpack':
+                body = msgpack.packb(body, use_bin_type=True)
+            else:
+                body = body.encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def read_json(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            return json.loads(self.rfile.read(length) or b'{}')
+
+        def route(self):
+            match = index_path.match(self.path)
+            if not match:
+                return None, None
+            return indexes.get(match.group(1)), match.group(2)
+
+        def do_GET(self):
+            index, action = self.route()
+            if index is None:
+                return self.send(404, "Index not found", 'text/plain')
+            if action == 'info':
+                return self.send(200, json.dumps({
+                    "vector_count": len(index.records), "dim": index.dim, "space_type": "cosine"
+                }), 'application/json')
+            self.send(404, "Not found", 'text/plain')
+
+        def do_POST(self):
+            body = self.read_json()
+            if self.path == '/api/v1/index/create':
+                name = body.get('index_name')
+                if name in indexes:
+                    return self.send(409, f"Index {name} already exists", 'text/plain')
+                indexes[name] = MockIndex(int(body.get('dim', dim)))
+                return self.send(200, "Index created", 'text/plain')
+
+            index, action = self.route()
+            if index is None:
+                return self.send(404, "Index not found", 'text/plain')
+
+            if action == 'search':
+                try:
+                    hits = index.search(body['vector'], int(body.get('k', 10)), body.get('filter'))
+                except (KeyError, ValueError) as e:
+                    return self.send(400, f"Bad search request: {e}", 'text/plain')
+                rows = []
+                for score, vector_id in hits:
+                    meta, filter_json, vector = index.get(vector_id) or ('', '', None)
+                    row = [score, vector_id, meta.encode('utf-8'), filter_json, 0.0]
+                    if body.get('include_vectors') and vector is not None:
+                        row.append(vector.tolist())
+                    rows.append(row)
+                return self.send(200, rows)
+
+            if action == 'vector/get':
+                record = index.get(body.get('id'))
+                if record is None:
+                    return self.send(404, "Vector not found", 'text/plain')
+                meta, filter_json, vector = record
+                return self.send(200, [body['id'], meta.encode('utf-8'), filter_json, vector.tolist()])
+
+            if action == 'vector/insert':
+                for item in body if isinstance(body, list) else [body]:
+                    index.upsert(item['id'], item.get('meta', ''), item.get('filter', ''), item['vector'])
+                return self.send(200, "Inserted", 'text/plain')
+
+            if action == 'filters/update':
+                for update in body.get('updates', []):
+                    index.update_filter(update['id'], update.get('filter', ''))
+                return self.send(200, "Updated", 'text/plain')
+
+            self.send(404, "Not found", 'text/plain')
+
+        def do_DELETE(self):
+            index, action = self.route()
+            match = re.match(r'^vector/(.+)/delete$', action or '')
+            if index is None or not match:
+                return self.send(404, "Not found", 'text/plain')
+            if not index.delete(match.group(1)):
+                return self.send(404, "Vector not found", 'text/plain')
+            self.send(200, "Deleted", 'text/plain')
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Endee stand-in")
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--index', default='ecommerce_products')
+    parser.add_argument('--dim', type=int, default=384)
+    parser.add_argument('--products', default=os.path.join(DATA_DIR, 'products.json'))
+    parser.add_argument('--empty', action='store_true', help="start without seeding the catalog")
+    parser.add_argument('--random-vectors', action='store_true',
+                        help="ignore data/product_embeddings.npy and seed random vectors")
+    parser.add_argument('--latency-ms', type=float, default=0, help="added to every response")
+    parser.add_argument('--jitter-ms', type=float, default=0, help="random extra latency, 0..jitter")
+    args = parser.parse_args()
+
+    indexes = {args.index: MockIndex(args.dim)}
+    if not args.empty:
+        count, stored = seed_index(indexes[args.index], args.products, not args.random_vectors)
+        print(f"✅ Seeded {count} products ({stored} with stored embeddings) into {args.index}")
+
+    server = ThreadingHTTPServer(('127.0.0.1', args.port), make_handler(indexes, args.dim, args.latency_ms, args.jitter_ms))
+    server.daemon_threads = True
+    print(f"🌐 Mock Endee running on http://localhost:{args.port}/api/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,17 @@
+"""
+Response shapes of the Flask API, served against mock_endee.py with a stub
+encoder (see conftest.py), so neither Endee nor the embedding model is needed.
+"""
+from conftest import assert_product
+
+
+def test_search(client):
+    response = client.post('/api/search', json={"query": "wireless headphones", "k": 5})
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['query'] == "wireless headphones"
+    assert data['count'] == len(data['results'])
+    assert 0 < data['count'] <= 5
+    for result in data['results']:
+        assert_product(result)
+        assert 'score' in result or 'lexical_score' in result
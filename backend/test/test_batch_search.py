@@ -0,0 +1,40 @@
+from endee_client import EndeeError
+
+from conftest import assert_product
+
+
+def test_batch_search(client):
+    response = client.post('/api/search/batch', json={"queries": [
+        {"query": "wireless headphones", "k": 3},
+        {"query": "running shoes", "k": 5, "filters": {"max_price": 200}},
+    ]})
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['count'] == 2
+    assert [entry['query'] for entry in data['results']] == ["wireless headphones", "running shoes"]
+    for entry, k in zip(data['results'], (3, 5)):
+        assert entry['count'] == len(entry['results'])
+        assert 0 < entry['count'] <= k
+        for result in entry['results']:
+            assert_product(result)
+
+
+def test_batch_search_reports_failures_per_query(api, client, monkeypatch):
+    search_products = api.search_products
+
+    def failing_search(query_embedding, k, filters):
+        if filters.get('category') == 'Books':
+            raise EndeeError("Endee is down")
+        return search_products(query_embedding, k, filters)
+
+    monkeypatch.setattr(api, 'search_products', failing_search)
+    response = client.post('/api/search/batch', json={"queries": [
+        {"query": "novel", "k": 3, "filters": {"category": "Books"}},
+        {"query": "wireless headphones", "k": 3},
+        {"query": "lamp", "k": 3, "filters": {"max_price": "cheap"}},
+    ]})
+    assert response.status_code == 200
+    first, second, third = response.get_json()['results']
+    assert first == {"query": "novel", "error": "Endee is down"}
+    assert second['count'] == len(second['results']) > 0
+    assert third['query'] == "lamp" and 'error' in third
@@ -0,0 +1,44 @@
+import json
+
+from catalog import ProductCatalog, StringColumn, product_details
+from payloads import dumps
+
+PRODUCTS = [
+    {"id": "p1", "title": "Trail Running Shoes", "brand": "Acme", "category": "Sports", "price": 80, "rating": 4.5},
+    {"id": "p2", "title": "Leather Boots", "brand": "Acme", "category": "Fashion", "price": 150, "rating": 3.9},
+    {"id": "p3", "title": "Yoga Mat", "brand": "Zen", "category": "Sports", "price": 25, "rating": 4.8},
+    {"id": "p4", "title": "Running Socks", "brand": "", "category": "Sports", "price": 9.5, "rating": 2.1},
+]
+
+
+def test_filter_rows():
+    catalog = ProductCatalog(PRODUCTS)
+    rows = catalog.rows(["p1", "p2", "missing", "p3", "p4"])
+    assert list(rows) == [0, 1, -1, 2, 3]
+    assert list(catalog.filter_rows(rows, {})) == [True, True, False, True, True]
+    assert list(catalog.filter_rows(rows, {"category": "Sports", "min_rating": 4})) == [True, False, False, True, False]
+    assert list(catalog.filter_rows(rows, {"min_price": 20, "max_price": 100})) == [True, False, False, True, False]
+    assert not catalog.filter_rows(rows, {"category": "Unknown"}).any()
+    assert list(catalog.mask({"category": "All", "max_price": 50})) == [False, False, True, True]
+
+
+def test_payloads_are_packed_into_one_buffer():
+    catalog = ProductCatalog(PRODUCTS)
+    assert isinstance(catalog.payloads, StringColumn)
+    assert len(catalog.payloads) == len(PRODUCTS)
+    for product in PRODUCTS:
+        assert catalog.payload(product["id"]) == dumps(product_details(product["id"], product))
+    assert json.loads(catalog.payload("p3"))["meta"]["title"] == "Yoga Mat"
+    assert catalog.payload("missing") is None
+
+
+def test_snapshot_round_trip(tmp_path):
+    catalog = ProductCatalog(PRODUCTS)
+    path = str(tmp_path / "catalog.npz")
+    catalog.save(path)
+    loaded = ProductCatalog.load_snapshot(path)
+    assert loaded.ids == catalog.ids
+    assert isinstance(loaded.payloads, StringColumn)
+    assert [loaded.payload(product_id) for product_id in loaded.ids] == \
+        [catalog.payload(product_id) for product_id in catalog.ids]
+    assert list(loaded.mask({"category": "Sports"})) == list(catalog.mask({"category": "Sports"}))
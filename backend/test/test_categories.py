@@ -0,0 +1,49 @@
+from catalog import ProductCatalog, canonical_category
+from endee_client import build_filter_conditions
+from result_cache import canonical_filters
+
+
+def test_canonical_category():
+    assert canonical_category("electronics") == canonical_category("Electronics") == "Electronics"
+    assert canonical_category("kitchen-accessories") == "Kitchen Accessories"
+    assert canonical_category("men's  clothing") == "Men's Clothing"
+    assert canonical_category("") == canonical_category(None) == "Product"
+
+
+def test_catalog_merges_category_spellings():
+    catalog = ProductCatalog([
+        {"id": "a", "title": "Phone", "category": "Electronics", "price": 100},
+        {"id": "b", "title": "Laptop", "category": "electronics", "price": 900},
+        {"id": "c", "title": "Pan", "category": "kitchen-accessories", "price": 20},
+    ])
+    assert catalog.categories == ["Electronics", "Kitchen Accessories"]
+    assert list(catalog.category_counts) == [2, 1]
+    assert list(catalog.mask({"category": "electronics"})) == [True, True, False]
+    assert catalog.get("b")["category"] == "Electronics"
+
+
+def test_category_filters_are_canonical():
+    assert build_filter_conditions({"category": "electronics"}) == [{"category": {"$eq": "Electronics"}}]
+    assert canonical_filters({"category": "electronics"}) == canonical_filters({"category": "Electronics"})
+
+
+def test_categories(client):
+    response = client.get('/api/categories')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['categories'][0] == 'All'
+    assert data['total'] == sum(data['counts'].values())
+    assert response.headers['ETag']
+
+    cached = client.get('/api/categories', headers={'If-None-Match': response.headers['ETag']})
+    assert cached.status_code == 304
+    assert not cached.data
+
+
+def test_categories_have_one_spelling_each(client):
+    categories = client.get('/api/categories').get_json()['categories']
+    assert len({category.casefold() for category in categories}) == len(categories)
+
+    response = client.post('/api/search', json={"query": "laptop", "k": 20, "filters": {"category": "electronics"}})
+    results = response.get_json()['results']
+    assert results and {result['filter']['category'] for result in results} == {"Electronics"}
@@ -0,0 +1,81 @@
+import threading
+
+import pytest
+
+from cursor_store import CursorStore, make_cursor, parse_cursor
+from lexical_index import HybridHit
+from result_cache import CacheManager, SharedCursorStore
+
+AUTHKEY = 'cursor-store-test-secret'
+
+
+@pytest.fixture
+def cache_server():
+    """Address of an in-process result_cache.py server holding one CursorStore"""
+    class Manager(CacheManager):
+        pass
+
+    store = CursorStore(max_size=10, ttl=None)
+    Manager.register('cursor_store', callable=lambda: store)
+    server = Manager(address=('127.0.0.1', 0), authkey=AUTHKEY.encode()).get_server()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.address
+    return f"{host}:{port}"
+
+
+def test_parse_cursor():
+    assert parse_cursor(make_cursor("abc.def", 20)) == ("abc.def", 20)
+    assert parse_cursor("session.0") == ("session", 0)
+    for cursor in ("", "session", ".20", "session.-1", "session.x", None):
+        assert parse_cursor(cursor) is None
+
+
+def test_cursor_store_pages():
+    store = CursorStore(max_size=2, ttl=None)
+    hits = [HybridHit(1.0 - i / 10, f"p{i}", None, None, None if i % 2 else 2.0) for i in range(5)]
+    session_id, session = store.create("shoes", 2, hits)
+    assert store.get(session_id) is session
+    page, next_offset = store.page(session, 4)
+    assert [(hit.id, hit.lexical_score) for hit in page] == [("p4", 2.0)] and next_offset is None
+    page, next_offset = store.page(session, 0)
+    assert [hit.id for hit in page] == ["p0", "p1"] and next_offset == 2
+    assert page[1].lexical_score is None
+
+    store.create("a", 2, hits)
+    store.create("b", 2, hits)
+    assert store.get(session_id) is None  # least recently used
+
+
+def test_shared_cursor_store_serves_every_worker(cache_server):
+    hits = [HybridHit(0.5, f"p{i}", None, None, None) for i in range(3)]
+    first_worker = SharedCursorStore(cache_server, local=CursorStore(), authkey=AUTHKEY)
+    second_worker = SharedCursorStore(cache_server, local=CursorStore(), authkey=AUTHKEY)
+    session_id, _ = first_worker.create("shoes", 2, hits)
+    session = second_worker.get(session_id)
+    assert session is not None and session.query == "shoes"
+    page, next_offset = second_worker.page(session, 2)
+    assert [hit.id for hit in page] == ["p2"] and next_offset is None
+    assert second_worker.stats()["shared"] and second_worker.stats()["created"] == 1
+    assert not len(first_worker.local)
+
+
+def test_shared_cursor_store_falls_back_to_the_worker():
+    store = SharedCursorStore('127.0.0.1:1', local=CursorStore(), authkey=AUTHKEY)
+    session_id, session = store.create("shoes", 2, [HybridHit(0.5, "p0", None, None, None)])
+    assert store.get(session_id) == session
+    assert not store.stats()["shared"] and len(store.local) == 1
+
+
+def test_search_pagination(client):
+    first = client.post('/api/search', json={"query": "kitchen", "page_size": 4}).get_json()
+    assert first['count'] == len(first['results']) == 4
+    assert first['total'] >= 8
+    assert first['next_cursor']
+
+    second = client.post('/api/search', json={"cursor": first['next_cursor']}).get_json()
+    assert second['count'] == 4
+    first_ids = {result['id'] for result in first['results']}
+    assert not first_ids & {result['id'] for result in second['results']}
+
+    response = client.post('/api/search', json={"cursor": "unknown.4"})
+    assert response.status_code == 410
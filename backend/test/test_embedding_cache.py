@@ -0,0 +1,56 @@
+import os
+import time
+
+import numpy as np
+
+from embedding_cache import EmbeddingCache, normalize_query
+
+
+def test_normalize_query():
+    assert normalize_query("  Wireless   HEADPHONES ") == "wireless headphones"
+    assert normalize_query("Ｗｉｆｉ") == "wifi"
+
+
+def test_embeddings_are_kept_as_float32_arrays():
+    cache = EmbeddingCache(max_size=2)
+    cache.put("shoes", [0.5, 0.25])
+    cache.put("boots", np.ones(2, dtype=np.float64))
+    embedding = cache.get("shoes")
+    assert isinstance(embedding, np.ndarray) and embedding.dtype == np.float32
+    assert embedding.tolist() == [0.5, 0.25]
+    assert cache.get("boots").dtype == np.float32
+
+    cache.put("socks", [0.0, 1.0])
+    assert cache.get("shoes") is None  # least recently used
+    assert cache.stats()["evictions"] == 1
+
+
+def test_save_and_load(tmp_path):
+    path = str(tmp_path / "embedding_cache")
+    cache = EmbeddingCache(max_size=10, ttl=60)
+    cache.put("old", [1.0, 0.0], created_at=time.time() - 120)
+    cache.put("shoes", [0.5, 0.25])
+    cache.put("boots", [0.0, 1.0])
+    assert cache.save(path) == 2  # the expired entry isn't written
+    assert os.listdir(tmp_path) == ["embedding_cache"]  # saved to the exact path, no temp file left
+
+    loaded = EmbeddingCache(max_size=10, ttl=60)
+    assert loaded.load(path) == 2
+    assert loaded.get("shoes").tolist() == [0.5, 0.25]
+    assert loaded.get("boots").dtype == np.float32
+    assert loaded.get("old") is None
+
+
+def test_save_and_load_empty(tmp_path):
+    path = str(tmp_path / "embedding_cache")
+    assert EmbeddingCache().save(path) == 0
+    assert EmbeddingCache().load(path) == 0
+    assert EmbeddingCache().load(str(tmp_path / "missing")) == 0
+
+
+def test_search_reuses_the_cached_query_embedding(api, client):
+    client.post('/api/search', json={"query": "cozy winter sweater", "k": 5})
+    hits = api.embedding_cache.stats()["hits"]
+    response = client.post('/api/search', json={"query": "Cozy Winter  Sweater", "k": 6})
+    assert response.status_code == 200
+    assert api.embedding_cache.stats()["hits"] == hits + 1
@@ -0,0 +1,35 @@
+from catalog import ProductCatalog
+
+PRODUCTS = [
+    {"id": "p1", "title": "Trail Running Shoes", "brand": "Acme", "category": "Sports", "price": 80, "rating": 4.5},
+    {"id": "p2", "title": "Leather Boots", "brand": "Acme", "category": "Fashion", "price": 150, "rating": 3.9},
+    {"id": "p3", "title": "Yoga Mat", "brand": "Zen", "category": "Sports", "price": 25, "rating": 4.8},
+    {"id": "p4", "title": "Running Socks", "brand": "", "category": "Sports", "price": 9.5, "rating": 2.1},
+]
+
+
+def test_facets():
+    catalog = ProductCatalog(PRODUCTS)
+    facets = catalog.facets(catalog.rows(["p1", "p3", "p4", "missing"]))
+    assert facets["candidates"] == 3
+    assert facets["category"] == {"Sports": 3}
+    assert facets["brand"] == {"Acme": 1, "Zen": 1}  # products without a brand aren't a facet
+    assert sum(bucket["count"] for bucket in facets["price"]) == 3
+    assert sum(bucket["count"] for bucket in facets["rating"]) == 3
+
+
+def test_search_facets(client):
+    response = client.post('/api/search', json={"query": "gadget", "k": 5, "facets": True})
+    assert response.status_code == 200
+    facets = response.get_json()['facets']
+    assert set(facets) == {'candidates', 'category', 'brand', 'price', 'rating'}
+    assert sum(facets['category'].values()) == facets['candidates']
+    assert sum(bucket['count'] for bucket in facets['price']) == facets['candidates']
+
+
+def test_search_facets_ignore_the_filters(client):
+    query = {"query": "gadget", "k": 5, "facets": True}
+    unfiltered = client.post('/api/search', json=query).get_json()
+    filtered = client.post('/api/search', json={**query, "filters": {"category": "Books"}}).get_json()
+    assert filtered['facets'] == unfiltered['facets']
+    assert all(result['filter']['category'] == "Books" for result in filtered['results'])
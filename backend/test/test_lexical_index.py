@@ -0,0 +1,54 @@
+from catalog import ProductCatalog
+from endee_client import SearchHit
+from lexical_index import HybridHit, LexicalIndex, reciprocal_rank_fusion
+
+PRODUCTS = [
+    {"id": "w1", "title": "Rolex Submariner Watch", "brand": "Rolex", "category": "Watches", "price": 13999.99},
+    {"id": "w2", "title": "Casio Digital Watch", "brand": "Casio", "category": "Watches", "price": 49.99},
+    {"id": "w3", "title": "Watch Winder", "brand": "Acme", "category": "Watches", "price": 120},
+]
+
+
+def test_search_applies_the_default_price_bounds_without_filters():
+    index = LexicalIndex(ProductCatalog(PRODUCTS))
+    # Above the default max_price, so the vector path never returns it either
+    assert [hit.id for hit in index.search("watch", 5)] == [hit.id for hit in index.search("watch", 5, {})]
+    assert "w1" not in {hit.id for hit in index.search("watch", 5)}
+    assert [hit.id for hit in index.search("rolex watch", 5, {"max_price": 20000})][0] == "w1"
+
+
+def test_reciprocal_rank_fusion():
+    vector_hits = [SearchHit(0.9, "a", None, None), SearchHit(0.8, "b", None, None)]
+    lexical_hits = [HybridHit(None, "b", None, None, 1.0), HybridHit(None, "c", None, None, 0.5)]
+    fused = reciprocal_rank_fusion(vector_hits, lexical_hits, k=3)
+    # "b" is in both rankings, then "a" and "c" by their rank in their own one
+    assert [hit.id for hit in fused] == ["b", "a", "c"]
+    assert fused[0] == HybridHit(0.8, "b", None, None, 1.0)
+    assert (fused[1].score, fused[1].lexical_score) == (0.9, None)
+    assert (fused[2].score, fused[2].lexical_score) == (None, 0.5)
+    assert len(reciprocal_rank_fusion(vector_hits, lexical_hits, k=1)) == 1
+
+
+def test_fast_path_answers_named_products_at_any_k(api, client, monkeypatch):
+    def encode_query(query):
+        raise AssertionError(f"{query!r} should not be encoded")
+
+    monkeypatch.setattr(api, 'encode_query', encode_query)
+    response = client.post('/api/search', json={"query": "Essence Mascara Lash Princess", "k": 10})
+    assert response.status_code == 200
+    results = response.get_json()['results']
+    assert 1 < len(results) <= 10
+    assert results[0]['id'] == 'dj_1'
+    assert results[0]['lexical_score'] == 1.0
+    assert all('score' not in result for result in results)
+
+
+def test_fast_path_falls_through_when_the_filters_exclude_the_named_products(api, client, monkeypatch):
+    encoded = []
+    encode_query = api.encode_query
+    monkeypatch.setattr(api, 'encode_query', lambda query: encoded.append(query) or encode_query(query))
+    response = client.post('/api/search', json={
+        "query": "Essence Mascara Lash Princess", "k": 10, "filters": {"category": "Electronics"}})
+    assert response.status_code == 200
+    assert encoded == ["Essence Mascara Lash Princess"]
+    assert all(result['filter']['category'] == "Electronics" for result in response.get_json()['results'])
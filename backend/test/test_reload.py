@@ -0,0 +1,61 @@
+import pytest
+
+
+@pytest.fixture
+def data_files(api, monkeypatch):
+    """Fake modification times of the watched data files, and a count of reload attempts"""
+    state = {"mtimes": api.catalog_state["mtimes"], "loads": 0, "fail": False}
+    load_catalog = api.load_catalog
+
+    def counting_load_catalog():
+        state["loads"] += 1
+        if state["fail"]:
+            raise ValueError("products.json is truncated")
+        return load_catalog()
+
+    monkeypatch.setattr(api, 'data_mtimes', lambda: state["mtimes"])
+    monkeypatch.setattr(api, 'load_catalog', counting_load_catalog)
+    return state
+
+
+def test_watcher_reloads_once_the_files_settle(api, data_files):
+    version = api.catalog_state["version"]
+    previous, failed = api.catalog_state["mtimes"], None
+    data_files["mtimes"] = ('changed',)
+    previous, failed = api.check_data_files(previous, failed)
+    assert data_files["loads"] == 0  # still changing
+    previous, failed = api.check_data_files(previous, failed)
+    assert data_files["loads"] == 1
+    assert api.catalog_state["version"] == version + 1
+    assert api.catalog_state["mtimes"] == ('changed',)
+
+
+def test_failed_reload_keeps_the_data_version(api, data_files):
+    served = api.catalog_state["mtimes"]
+    version = api.data_version(served)
+    data_files.update(mtimes=('broken',), fail=True)
+    previous, failed = api.check_data_files(served, None)
+    previous, failed = api.check_data_files(previous, failed)
+    assert data_files["loads"] == 1
+    assert api.catalog_state["mtimes"] == served
+    assert api.data_version(api.catalog_state["mtimes"]) == version
+    assert api.catalog_state["last_error"] == "products.json is truncated"
+
+    # Not retried until the files change again
+    previous, failed = api.check_data_files(previous, failed)
+    assert data_files["loads"] == 1
+    data_files.update(mtimes=('fixed',), fail=False)
+    previous, failed = api.check_data_files(previous, failed)
+    previous, failed = api.check_data_files(previous, failed)
+    assert data_files["loads"] == 2
+    assert api.catalog_state["mtimes"] == ('fixed',)
+
+
+def test_admin_reload_requires_the_token(api, client, monkeypatch):
+    monkeypatch.setattr(api, 'ADMIN_TOKEN', '')
+    assert client.post('/api/admin/reload').status_code == 403
+    monkeypatch.setattr(api, 'ADMIN_TOKEN', 'secret-token')
+    assert client.post('/api/admin/reload', headers={'X-Admin-Token': 'wrong'}).status_code == 403
+    assert client.post('/api/admin/reload', headers={'X-Admin-Token': 'sécret'}).status_code == 403
+    response = client.post('/api/admin/reload', headers={'X-Admin-Token': 'secret-token'})
+    assert response.status_code == 200
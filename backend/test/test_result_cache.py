@@ -0,0 +1,48 @@
+import pytest
+
+from payloads import RawJSON
+from result_cache import ResultCache, SharedResultCache, canonical_filters, result_cache_key
+
+
+def test_canonical_filters_drops_defaults_and_normalizes_numbers():
+    assert canonical_filters(None) == canonical_filters({}) == '{}'
+    assert canonical_filters({"category": "All", "min_price": "", "max_price": None}) == '{}'
+    assert (canonical_filters({"max_price": 100, "category": "Sports"})
+            == canonical_filters({"category": "Sports", "max_price": 100.0})
+            == '{"category":"Sports","max_price":100.0}')
+
+
+def test_result_cache_key_ignores_spelling_and_default_filters():
+    assert result_cache_key("Running  Shoes", 10, {"category": "All"}) == result_cache_key("running shoes", 10, {})
+    assert result_cache_key("shoes", 10, {}) != result_cache_key("shoes", 20, {})
+    assert result_cache_key("shoes", 10, {}, facets=True) != result_cache_key("shoes", 10, {})
+
+
+def test_result_cache_version_and_eviction():
+    cache = ResultCache(max_size=2, ttl=None)
+    fields = {"results": RawJSON(b'[]'), "count": 0}
+    cache.put("a", "v1", fields)
+    assert cache.get("a", "v1") is fields
+    assert cache.get("a", "v2") is None  # reloaded data invalidates the entry
+    assert cache.get("a", "v1") is None
+
+    for key in ("a", "b", "c"):
+        cache.put(key, "v1", fields)
+    assert cache.get("a", "v1") is None  # least recently used
+    assert cache.stats()["evictions"] == 1
+
+
+def test_shared_result_cache_requires_an_authkey():
+    with pytest.raises(ValueError):
+        SharedResultCache('127.0.0.1:0', ResultCache(), authkey='')
+    with pytest.raises(ValueError):
+        SharedResultCache('127.0.0.1:0', ResultCache(), authkey='too-short')
+
+
+def test_repeated_search_is_served_from_the_result_cache(api, client):
+    body = {"query": "wireless headphones", "k": 5}
+    first = client.post('/api/search', json=body).get_json()
+    hits = api.result_cache.stats()["hits"]
+    second = client.post('/api/search', json={**body, "query": "Wireless  Headphones"}).get_json()
+    assert api.result_cache.stats()["hits"] == hits + 1
+    assert second['results'] == first['results']
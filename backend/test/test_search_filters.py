@@ -0,0 +1,41 @@
+import pytest
+
+
+def test_search_filters(client):
+    filters = {"category": "Electronics", "max_price": 500, "min_rating": 3}
+    response = client.post('/api/search', json={"query": "gadget", "k": 10, "filters": filters})
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['count'] > 0
+    for result in data['results']:
+        assert result['filter']['category'] == "Electronics"
+        assert result['filter']['price'] <= 500
+        assert result['filter']['rating'] >= 3
+
+
+@pytest.mark.parametrize('body', [
+    {"query": "", "k": 10},
+    {"query": "shoes", "k": 0},
+    {"query": "shoes", "k": 10 ** 6},
+    {"query": "shoes", "k": "ten"},
+    {"query": "shoes", "k": 2.5},
+    {"query": "shoes", "k": None},
+    {"query": "shoes", "page_size": "20x"},
+])
+def test_search_rejects_bad_requests(client, body):
+    response = client.post('/api/search', json=body)
+    assert response.status_code == 400
+    assert response.get_json()['error'].split()[0] in ('Query', 'k', 'page_size')
+
+
+def test_search_accepts_integer_strings(client):
+    response = client.post('/api/search', json={"query": "shoes", "k": "3"})
+    assert response.status_code == 200
+    assert response.get_json()['count'] <= 3
+
+
+@pytest.mark.parametrize('k', [0, "ten"])
+def test_batch_search_rejects_bad_k(client, k):
+    response = client.post('/api/search/batch', json={"queries": [{"query": "shoes"}, {"query": "lamp", "k": k}]})
+    assert response.status_code == 400
+    assert response.get_json()['error'].startswith('k must')
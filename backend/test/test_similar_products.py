@@ -0,0 +1,48 @@
+import numpy as np
+
+from conftest import assert_product
+from similar_products import NeighborTable, compute_neighbors, save_neighbors
+
+
+def test_compute_neighbors():
+    matrix = np.array([[1, 0], [0.8, 0.6], [0, 1], [0, 0]], dtype=np.float32)
+    neighbors, scores = compute_neighbors(matrix, top_n=2, block_size=2)
+    assert neighbors.shape == scores.shape == (4, 2)
+    assert list(neighbors[0]) == [1, 2]
+    assert list(neighbors[2]) == [1, 0]
+    assert np.allclose(scores[0], [0.8, 0.0], atol=1e-3)
+    # The all-zero row never has, or is, a neighbour
+    assert list(neighbors[3]) == [-1, -1]
+    assert 3 not in neighbors
+
+
+def test_compute_neighbors_tiny_catalog():
+    neighbors, scores = compute_neighbors(np.ones((1, 4), dtype=np.float32), top_n=5)
+    assert neighbors.shape == scores.shape == (1, 0)
+
+
+def test_neighbor_table_round_trip(tmp_path):
+    matrix = np.array([[1, 0], [0.8, 0.6], [0, 1]], dtype=np.float32)
+    neighbors, scores = compute_neighbors(matrix, top_n=2)
+    path = str(tmp_path / "similar.npz")
+    save_neighbors(["a", "b", "c"], neighbors, scores, path)
+    table = NeighborTable.load(path)
+    assert [product_id for _, product_id in table.get("a", 2)] == ["b", "c"]
+    assert table.get("a", 3) is None  # more than was precomputed
+    assert table.get("missing", 1) is None
+    assert NeighborTable.load(str(tmp_path / "none.npz")) is None
+
+
+def test_similar(client):
+    response = client.get('/api/similar/dj_1?k=3')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['product_id'] == 'dj_1'
+    assert data['source'] in ('precomputed', 'endee')
+    assert data['count'] == len(data['similar_products'])
+    assert 0 < data['count'] <= 3
+    for result in data['similar_products']:
+        assert_product(result)
+        assert result['id'] != 'dj_1'
+
+    assert client.get('/api/similar/no-such-product').status_code == 404
@@ -0,0 +1,57 @@
+from suggest_index import PrefixIndex, QueryLog
+
+
+def test_prefix_index_suggest():
+    index = PrefixIndex([
+        ("Trail Running Shoes", "product", 4.5),
+        ("Running Socks", "product", 2.1),
+        ("running socks", "query", 9.0),
+        ("Sports", "category", 3.0),
+    ], limit=3)
+    assert len(index) == 3  # duplicate texts keep the most popular
+    # Any word start matches, ranked by popularity
+    assert [text for text, _, _ in index.suggest("run")] == ["running socks", "Trail Running Shoes"]
+    assert index.suggest("RUNNING SO") == [("running socks", "query", 9.0)]
+    # Precomputed short prefixes honour the limit too
+    assert [text for text, _, _ in index.suggest("s", limit=2)] == ["running socks", "Trail Running Shoes"]
+    assert index.suggest("") == []
+    assert index.suggest("xyz") == []
+
+
+def test_query_log_counts_distinct_clients():
+    log = QueryLog(min_count=2, rebuild_interval=0)
+    for _ in range(5):
+        log.record("Running Shoes", "10.0.0.1", 3)
+    log.record("no results", "10.0.0.1", 0)
+    log.record("no results", "10.0.0.2", 0)
+    log._rebuild()
+    assert log.index().suggest("run") == []  # one client, however often
+
+    log.record("running  shoes", "10.0.0.2", 3)
+    log._rebuild()
+    assert log.index().suggest("run") == [("running shoes", "query", 2.0)]
+
+
+def test_suggest(client):
+    data = client.get('/api/suggest?q=masc&limit=5').get_json()
+    assert data['query'] == 'masc'
+    assert 0 < len(data['suggestions']) <= 5
+    assert {'text': 'Essence Mascara Lash Princess', 'type': 'product'} in data['suggestions']
+
+
+def test_searchers_behind_a_proxy(api, client, monkeypatch):
+    monkeypatch.setattr(api, 'query_log', QueryLog())
+
+    def searchers(query, **headers):
+        client.post('/api/search', json={"query": query, "k": 3}, headers=headers)
+        return len(api.query_log.clients[query])
+
+    # Without SUGGEST_CLIENT_HEADER every request behind the proxy is one client
+    assert searchers("mascara", **{'X-Forwarded-For': '203.0.113.7'}) == 1
+    assert searchers("mascara", **{'X-Forwarded-For': '203.0.113.8'}) == 1
+
+    monkeypatch.setattr(api, 'SUGGEST_CLIENT_HEADER', 'X-Forwarded-For')
+    assert searchers("lipstick", **{'X-Forwarded-For': '203.0.113.7, 10.0.0.1'}) == 1
+    assert searchers("lipstick", **{'X-Forwarded-For': '203.0.113.8, 10.0.0.1'}) == 2
+    assert searchers("lipstick", **{'X-Forwarded-For': '203.0.113.8'}) == 2
+    assert searchers("lipstick") == 3  # falls back to the remote address
@@ -9,10 +9,12 @@ let currentFilters = {
     min_rating: 0
 };
 let currentResults = [];
+let facetsQuery = ''; // query the facet counts in the filter panel belong to
 
 // DOM Elements
 const searchInput = document.getElementById('searchInput');
 const searchBtn = document.getElementById('searchBtn');
+const searchSuggestions = document.getElementById('searchSuggestions');
 const quickChips = document.querySelectorAll('.quick-chip');
 const filtersSection = document.getElementById('filtersSection');
 const resultsSection = document.getElementById('resultsSection');
@@ -59,13 +61,17 @@ async function loadCategories() {
         if (response.ok) {
             const data = await response.json();
             const categories = data.categories || [];
+            const counts = data.counts || {};
 
             categoryFilter.innerHTML = '<option value="All">All Categories</option>';
             categories.forEach(cat => {
                 if (cat !== 'All') {
                     const option = document.createElement('option');
                     option.value = cat;
-                    option.textContent = cat.charAt(0).toUpperCase() + cat.slice(1);
+                    option.textContent = cat;  // already canonical ("Electronics", "Kitchen Accessories")
+                    if (counts[cat] !== undefined) {
+                        option.textContent += ` (${counts[cat]})`;
+                    }
                     categoryFilter.appendChild(option);
                 }
             });
@@ -81,6 +87,7 @@ function setupEventListeners() {
     searchInput.addEventListener('keypress', (e) => {
         if (e.key === 'Enter') handleSearch();
     });
+    searchInput.addEventListener('input', loadSuggestions);
 
     quickChips.forEach(chip => {
         chip.addEventListener('click', () => {
@@ -100,6 +107,32 @@ function setupEventListeners() {
     });
 }
 
+// Typeahead suggestions for the search box
+let suggestRequest = 0;
+async function loadSuggestions() {
+    const prefix = searchInput.value.trim();
+    const requestId = ++suggestRequest;
+    if (!prefix) {
+        searchSuggestions.innerHTML = '';
+        return;
+    }
+
+    try {
+        const response = await fetch(`${API_BASE_URL}/suggest?q=${encodeURIComponent(prefix)}&limit=8`);
+        // Ignore answers to prefixes the user has already typed past
+        if (!response.ok || requestId !== suggestRequest) return;
+        const data = await response.json();
+        searchSuggestions.innerHTML = '';
+        (data.suggestions || []).forEach(suggestion => {
+            const option = document.createElement('option');
+            option.value = suggestion.text;
+            searchSuggestions.appendChild(option);
+        });
+    } catch (error) {
+        console.error('Error loading suggestions:', error);
+    }
+}
+
 // Handle search
 async function handleSearch() {
     const query = searchInput.value.trim();
@@ -128,6 +161,10 @@ async function handleSearch() {
 
     const k = parseInt(resultsCount.value) || 10;
 
+    // Facets cost an extra search, and only change with the query (they
+    // ignore the filters), so filter changes reuse the counts on screen
+    const wantFacets = query !== facetsQuery;
+
     try {
         const response = await fetch(`${API_BASE_URL}/search`, {
             method: 'POST',
@@ -137,7 +174,8 @@ async function handleSearch() {
             body: JSON.stringify({
                 query: query,
                 k: k,
-                filters: currentFilters
+                filters: currentFilters,
+                facets: wantFacets
             })
         });
 
@@ -145,6 +183,10 @@ async function handleSearch() {
             const data = await response.json();
             currentResults = data.results || [];
             displayResults(currentResults, query);
+            if (wantFacets) {
+                updateFacetCounts(data.facets);
+                facetsQuery = query;
+            }
         } else {
             throw new Error('Search failed');
         }
@@ -156,6 +198,27 @@ async function handleSearch() {
     }
 }
 
+// Show how many of the query's top matches each category / rating option has
+function updateFacetCounts(facets) {
+    if (!facets) return;
+
+    Array.from(categoryFilter.options).forEach(option => {
+        if (option.value === 'All') return;
+        const label = option.value.charAt(0).toUpperCase() + option.value.slice(1);
+        const count = (facets.category || {})[option.value] || 0;
+        option.textContent = `${label} (${count})`;
+    });
+
+    Array.from(ratingFilter.options).forEach(option => {
+        if (!option.dataset.label) option.dataset.label = option.textContent;
+        const threshold = parseFloat(option.value) || 0;
+        const count = (facets.rating || [])
+            .filter(bucket => bucket.min >= threshold)
+            .reduce((sum, bucket) => sum + bucket.count, 0);
+        option.textContent = `${option.dataset.label} (${count})`;
+    });
+}
+
 // Apply filters
 function applyFilters() {
     if (currentQuery) {
@@ -190,6 +253,8 @@ function createProductCard(result, index) {
     const meta = result.meta || {};
     const filter = result.filter || {};
     const score = result.score || 0;
+    // Products found only by the keyword index have no similarity score
+    const keywordOnly = !result.score && result.lexical_score;
 
     // Filter out via.placeholder.com URLs
     let imageUrl = meta.image || fallbackImage;
@@ -206,6 +271,7 @@ function createProductCard(result, index) {
         />
         <div class="product-content">
             ${score > 0 ? `<div class="similarity-score">${(score * 100).toFixed(1)}% match</div>` : ''}
+            ${keywordOnly ? `<div class="similarity-score">Keyword match</div>` : ''}
             <div class="product-category">${filter.category || 'Product'}</div>
             <h3 class="product-title">${meta.title || 'Untitled Product'}</h3>
             <p class="product-description">${meta.description || 'No description available'}</p>
@@ -1,20 +1,20 @@
-import http.server
-import socketserver
-import os
-
-PORT = 3000
-DIRECTORY = os.path.dirname(os.path.abspath(__file__))
-
-class Handler(http.server.SimpleHTTPRequestHandler):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, directory=DIRECTORY, **kwargs)
-
-if __name__ == "__main__":
-    with socketserver.TCPServer(("", PORT), Handler) as httpd:
-        print(f"🌐 Frontend serving at http://localhost:{PORT}")
-        print(f"📂 Directory: {DIRECTORY}")
-        try:
-            httpd.serve_forever()
-        except KeyboardInterrupt:
-            print("\n🛑 Stopping server...")
-            httpd.shutdown()
+import http.server
+import socketserver
+import os
+
+PORT = 3000
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+class Handler(http.server.SimpleHTTPRequestHandler):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, directory=DIRECTORY, **kwargs)
+
+if __name__ == "__main__":
+    with socketserver.TCPServer(("", PORT), Handler) as httpd:
+        print(f"🌐 Frontend serving at http://localhost:{PORT}")
+        print(f"📂 Directory: {DIRECTORY}")
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            print("\n🛑 Stopping server...")
+            httpd.shutdown()